@@ -0,0 +1,80 @@
+"""
+Measures the throughput of `pdf4py._lexer.Lexer`, in lexemes per second.
+
+The corpus is built from the PDF files in `tests/pdfs`: every stream that can be decoded and
+tokenized from start to end (content streams and object streams, mainly) is collected once,
+then the whole corpus is tokenized `--repeat` times and the best run is reported.
+
+Usage::
+
+    python benchmarks/lexer_benchmark.py [--repeat N] [PDF ...]
+"""
+import argparse
+import os
+import sys
+import time
+
+BASE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_FOLDER)
+
+from pdf4py._lexer import Lexer
+from pdf4py.parser import Parser
+from pdf4py.types import PDFStream
+
+
+def collect_corpus(paths):
+    """
+    Returns the list of decoded streams contained in the files `paths` that the lexer is able
+    to tokenize without errors.
+    """
+    corpus = []
+    for path in paths:
+        with open(path, "rb") as fp:
+            parser = Parser(fp)
+            for entry in parser.xreftable:
+                try:
+                    obj = parser.parse_reference(entry)
+                    if not isinstance(obj, PDFStream) or "Subtype" in obj.dictionary:
+                        continue
+                    data = bytes(obj.stream())
+                    for _ in Lexer(data):
+                        pass
+                except Exception:
+                    continue
+                corpus.append(data)
+    return corpus
+
+
+def run(corpus):
+    count = 0
+    for data in corpus:
+        for _ in Lexer(data):
+            count += 1
+    return count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("pdfs", nargs="*")
+    args = arg_parser.parse_args()
+    paths = args.pdfs
+    if not paths:
+        pdfs_folder = os.path.join(BASE_FOLDER, "tests", "pdfs")
+        paths = [os.path.join(pdfs_folder, x) for x in sorted(os.listdir(pdfs_folder))]
+
+    corpus = collect_corpus(paths)
+    size = sum(len(x) for x in corpus)
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        count = run(corpus)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print("streams: {}, bytes: {}, lexemes: {}".format(len(corpus), size, count))
+    print("best of {}: {:.3f} s, {:,.0f} lexemes/s, {:.2f} MB/s".format(
+        args.repeat, best, count / best, size / best / 2**20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Measures how fast `pdf4py._lexer.Lexer` recognizes content stream operators, in operators per second.
+
+The operators found in the streams of the PDF files in `tests/pdfs` are joined, in their original
+order, into a single sequence made only of operators, so that the time spent on operands does not
+hide the cost of recognizing keywords and operators.
+
+Usage::
+
+    python benchmarks/operators_benchmark.py [--repeat N] [PDF ...]
+"""
+import argparse
+import os
+import time
+
+from lexer_benchmark import BASE_FOLDER, collect_corpus
+from pdf4py._lexer import Lexer
+from pdf4py.types import PDFOperator
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("pdfs", nargs="*")
+    args = arg_parser.parse_args()
+    paths = args.pdfs
+    if not paths:
+        pdfs_folder = os.path.join(BASE_FOLDER, "tests", "pdfs")
+        paths = [os.path.join(pdfs_folder, x) for x in sorted(os.listdir(pdfs_folder))]
+
+    operators = []
+    for data in collect_corpus(paths):
+        operators.extend(x.value for x in Lexer(data) if isinstance(x, PDFOperator))
+    data = " ".join(operators).encode("ascii")
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for _ in Lexer(data):
+            pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print("operators: {}, distinct: {}".format(len(operators), len(set(operators))))
+    print("best of {}: {:.3f} s, {:,.0f} operators/s".format(args.repeat, best, len(operators) / best))
+
+
+if __name__ == "__main__":
+    main()
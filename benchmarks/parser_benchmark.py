@@ -0,0 +1,67 @@
+"""
+Measures how fast `pdf4py.parser.SequentialParser` builds array-heavy objects, in objects per second.
+
+The input is made of synthetic objects shaped like the ones that dominate large documents:
+``/Widths`` arrays of numbers, ``/Kids`` arrays of references, tables of small nested arrays
+and dictionaries. Every PDF object built (containers included) counts as one.
+
+Usage::
+
+    python benchmarks/parser_benchmark.py [--repeat N] [--size N]
+"""
+import argparse
+import time
+
+from lexer_benchmark import BASE_FOLDER
+from pdf4py.parser import SequentialParser
+
+
+def build_input(size):
+    """
+    Returns a bytes sequence holding four indirect objects, each one with about `size` elements.
+    """
+    widths = " ".join(str(250 + i % 500) for i in range(size))
+    kids = " ".join("{} 0 R".format(i + 10) for i in range(size))
+    rectangles = " ".join("[{} {} {}.5 {}.25]".format(i, i + 1, i + 2, i + 3) for i in range(size // 4))
+    annotations = " ".join("<< /Type /Annot /Rect [0 0 {} {}] /P 3 0 R >>".format(i, i) for i in range(size // 8))
+    return "1 0 obj << /Widths [{}] >> endobj\n2 0 obj << /Kids [{}] /Count {} >> endobj\n" \
+        "3 0 obj [{}] endobj\n4 0 obj [{}] endobj\n".format(
+        widths, kids, size, rectangles, annotations).encode("ascii")
+
+
+def count_objects(obj):
+    count = 0
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        count += 1
+        if isinstance(x, list):
+            stack.extend(x)
+        elif isinstance(x, dict):
+            stack.extend(x.values())
+        elif hasattr(x, "object_number") and hasattr(x, "value"):
+            stack.append(x.value)
+    return count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--size", type=int, default=200000)
+    args = arg_parser.parse_args()
+
+    data = build_input(args.size)
+    count = sum(count_objects(x) for x in SequentialParser(data))
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        for _ in SequentialParser(data):
+            pass
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print("bytes: {}, objects: {}".format(len(data), count))
+    print("best of {}: {:.3f} s, {:,.0f} objects/s".format(args.repeat, best, count / best))
+
+
+if __name__ == "__main__":
+    main()
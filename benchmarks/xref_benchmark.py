@@ -0,0 +1,106 @@
+"""
+Measures how long `pdf4py.parser.Parser` takes to open a document with many objects, and how
+much memory its cross-reference table takes.
+
+A synthetic file with `--objects` objects is written to a temporary folder, with its
+cross-reference section stored in a classic table or in a cross-reference stream. Each table
+backend (`XRefTable` and `CompactXRefTable`) opens it in its own process; the best open time
+of `--repeat` runs is reported, with the growth of the resident set size (RSS, read from
+`/proc/self/statm`) while the parser opened by the first run is alive.
+
+Usage::
+
+    python benchmarks/xref_benchmark.py [--repeat N] [--objects N] [--kind table|stream]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+
+BASE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, BASE_FOLDER)
+
+from pdf4py.parser import Parser
+
+
+def build_file(path, count, kind):
+    """
+    Writes to `path` a PDF file with `count` objects, all but the catalog being small integers.
+    """
+    with open(path, "wb") as fp:
+        fp.write(b"%PDF-1.5\n")
+        offsets = [fp.tell()]
+        fp.write(b"1 0 obj\n<< /Type /Catalog >>\nendobj\n")
+        for i in range(2, count + 1):
+            offsets.append(fp.tell())
+            fp.write(b"%d 0 obj\n%d\nendobj\n" % (i, i))
+        xref = fp.tell()
+        if kind == "table":
+            fp.write(b"xref\n0 %d\n0000000000 65535 f \n" % (count + 1))
+            fp.write(b"".join(b"%010d 00000 n \n" % x for x in offsets))
+            fp.write(b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (count + 1))
+        else:
+            rows = b"\x00" + b"\x00" * 4 + b"\xff\xff"
+            rows += b"".join(b"\x01" + x.to_bytes(4, "big") + b"\x00\x00" for x in offsets)
+            rows += b"\x01" + xref.to_bytes(4, "big") + b"\x00\x00"
+            data = zlib.compress(rows)
+            fp.write(b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 4 2] /Root 1 0 R /Length %d "
+                b"/Filter /FlateDecode >>\nstream\n" % (count + 1, count + 2, len(data)))
+            fp.write(data + b"\nendstream\nendobj\n")
+        fp.write(b"startxref\n%d\n%%%%EOF\n" % xref)
+
+
+def resident_size():
+    """
+    Returns the resident set size of the process, in bytes.
+    """
+    with open("/proc/self/statm") as fp:
+        return int(fp.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def measure(path, compact, repeat):
+    """
+    Opens `path` `repeat` times and prints the best time and the growth of the RSS, in bytes.
+    """
+    before = resident_size()
+    best = rss = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser = Parser(path, compact_xref = compact)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        if rss is None:
+            rss = resident_size() - before
+        parser.close()
+        del parser
+    print(best, rss)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--objects", type=int, default=1000000)
+    arg_parser.add_argument("--kind", choices=("table", "stream"), default="table")
+    arg_parser.add_argument("--measure", help=argparse.SUPPRESS)
+    arg_parser.add_argument("--compact", action="store_true", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.compact, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "objects.pdf")
+        build_file(path, args.objects, args.kind)
+        print("objects: {}, kind: {}, size: {:,} bytes".format(args.objects, args.kind, os.path.getsize(path)))
+        for name, flags in (("XRefTable", []), ("CompactXRefTable", ["--compact"])):
+            output = subprocess.run([sys.executable, __file__, "--measure", path, "--repeat", str(args.repeat)]
+                + flags, check=True, stdout=subprocess.PIPE).stdout.split()
+            best, rss = float(output[0]), int(output[1])
+            print("{:>16}: best of {}: {:.3f} s, RSS +{:,.1f} MiB".format(name, args.repeat, best, rss / 2**20))
+
+
+if __name__ == "__main__":
+    main()
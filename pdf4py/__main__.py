@@ -0,0 +1,55 @@
+"""
+The command line interface of pdf4py. For example, to scan a corpus of documents with 8 processes,
+giving up on documents that take more than 30 seconds:
+
+::
+
+    python -m pdf4py scan path/to/corpus --workers 8 --timeout 30 > report.jsonl
+
+One JSON object is printed for each document (see `pdf4py.scan.scan_file`), while the totals are
+printed on the standard error at the end.
+"""
+import argparse
+import json
+import sys
+import time
+from .scan import find_documents, scan
+
+
+
+def run_scan(args):
+    files = errors = size = 0
+    start = time.perf_counter()
+    memory_limit = None if args.memory is None else args.memory * 2**20
+    for record in scan(find_documents(args.patterns), args.workers, args.timeout, memory_limit, args.objects):
+        print(json.dumps(record), flush = True)
+        files += 1
+        errors += 1 if record["errors"] else 0
+        size += record["size"] or 0
+    elapsed = time.perf_counter() - start
+    print("files: {}, with errors: {}, {:.1f} MB in {:.2f} s, {:.1f} files/s, {:.2f} MB/s".format(
+        files, errors, size / 10**6, elapsed, files / elapsed, size / 10**6 / elapsed), file = sys.stderr)
+    return 0
+
+
+
+def main(argv = None):
+    arg_parser = argparse.ArgumentParser(prog = "python -m pdf4py", description = "pdf4py command line interface.")
+    commands = arg_parser.add_subparsers(dest = "command")
+    scan_parser = commands.add_parser("scan", help = "open many documents and report about each one as a JSON line")
+    scan_parser.add_argument("patterns", nargs = "+", metavar = "dir|glob",
+        help = "a directory, searched recursively for PDF files, or a glob pattern")
+    scan_parser.add_argument("--workers", type = int, default = None, help = "number of processes (default: one per CPU)")
+    scan_parser.add_argument("--timeout", type = float, default = None, help = "seconds after which a document is abandoned")
+    scan_parser.add_argument("--memory", type = int, default = None, help = "memory cap of each process, in MiB")
+    scan_parser.add_argument("--objects", action = "store_true", help = "parse all the objects and decode the streams")
+    args = arg_parser.parse_args(argv)
+    if args.command == "scan":
+        return run_scan(args)
+    arg_parser.print_help()
+    return 2
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
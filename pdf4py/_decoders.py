@@ -1,10 +1,17 @@
 import zlib
+from itertools import chain
 from math import floor
 from binascii import unhexlify
 from .exceptions import PDFUnsupportedError, PDFGenericError
 from ._charset import BLANKS
 
 decoders = {}
+# decoders taking the encoded data as an iterable of chunks and yielding the decoded data
+# a piece at a time, each piece being at most (about) `size` bytes long
+incremental_decoders = {}
+# filters whose decoders accept any bytes-like object, so that a view over the source can be
+# given to them without copying it. The others are given a bytes object.
+_VIEW_DECODERS = frozenset(("FlateDecode", "ASCIIHexDecode", "JBIG2Decode", "JPXDecode", "DCTDecode"))
 
 
 def register(filter_name):
@@ -14,6 +21,13 @@ def register(filter_name):
     return wrapper
 
 
+def register_incremental(filter_name):
+    def wrapper(func):
+        incremental_decoders[filter_name] = func
+        return func
+    return wrapper
+
+
 
 def tiff_predictor(data, width, bits_per_component, colors):
     # TODO: must be tested
@@ -44,17 +58,21 @@ def paeth_predictor(a, b, c):
 
 
 
-def png_filter(data, width, bits_per_component, colors):
+def png_filter(data, width, bits_per_component, colors, previous_scanline = None):
     """
     For more information
     https://www.w3.org/TR/PNG-Filters.html
+
+    `previous_scanline` is the last unfiltered row preceding `data`, if `data` is not the
+    beginning of the image.
     """
     if bits_per_component < 8:
         raise PDFUnsupportedError("The value '{}' for 'BitsPerComponent' parameter of 'FlateDecode' is not supported.".format(bits_per_component))
     output = bytearray()
     bpp = int(bits_per_component / 8 * colors)
     width *= bpp
-    previous_scanline = b'\x00' * width
+    if previous_scanline is None:
+        previous_scanline = b'\x00' * width
     for row_index in range(0, len(data), width + 1):
         filter_type = data[row_index]
         current_scanline = data[row_index + 1:row_index + 1 + width]    
@@ -103,8 +121,59 @@ def flate_decode(data, params):
     return data
 
 
+@register_incremental("FlateDecode")
+def iter_flate_decode(chunks, params, size):
+    decompressor = zlib.decompressobj()
+
+    def inflate():
+        for chunk in chunks:
+            data = decompressor.decompress(chunk, size)
+            while data:
+                yield data
+                data = decompressor.decompress(decompressor.unconsumed_tail, size)
+            if decompressor.eof:
+                return
+        data = decompressor.flush()
+        if data:
+            yield data
+        if not decompressor.eof:
+            raise zlib.error("Error -5 while decompressing data: incomplete or truncated stream")
+
+    predictor = params.get('Predictor', 1)
+    if predictor != 2 and predictor < 10:
+        yield from inflate()
+        return
+    columns = params.get('Columns', 1)
+    colors = params.get('Colors', 1)
+    bits_per_component = params.get('BitsPerComponent', 8)
+    if bits_per_component < 8:
+        raise PDFUnsupportedError("The value '{}' for 'BitsPerComponent' parameter of 'FlateDecode' is not supported.".format(bits_per_component))
+    # predictors are applied to whole rows
+    row_size = columns * int(bits_per_component / 8 * colors)
+    if predictor >= 10:
+        row_size += 1
+    pending = b""
+    previous_scanline = None
+    for data in chain(inflate(), (None,)):
+        if data is not None:
+            pending += data
+            n = len(pending) // row_size * row_size
+        else:
+            n = len(pending)
+        if n == 0:
+            continue
+        rows, pending = pending[:n], pending[n:]
+        if predictor == 2:
+            yield tiff_predictor(rows, columns, bits_per_component, colors)
+        else:
+            unfiltered = png_filter(rows, columns, bits_per_component, colors, previous_scanline)
+            previous_scanline = unfiltered[-(row_size - 1):]
+            yield unfiltered
+
+
 @register("ASCIIHexDecode")
 def asciihexdecode(data, params):
+    data = bytes(data)
     EOD = data.find(ord('>'))
     if EOD != len(data) - 1:
         raise PDFGenericError("ASCIIHexDecode: badly encoded data.")
@@ -129,6 +198,13 @@ def dct_decode(data, params):
     return data
 
 
+@register_incremental("JBIG2Decode")
+@register_incremental("JPXDecode")
+@register_incremental("DCTDecode")
+def iter_identity_decode(chunks, params, size):
+    return chunks
+
+
 @register("ASCII85Decode")
 def ascii85decode(data, params):
     result = bytearray()
@@ -176,6 +252,38 @@ def decode(D : 'dict', data):
             decoder = decoders.get(filterSpecifier)
             if decoder is None:
                 raise PDFUnsupportedError("Filter '{}' is not supported.".format(filterSpecifier))
+            if isinstance(data, memoryview) and filterSpecifier not in _VIEW_DECODERS:
+                data = bytes(data)
             data = decoder(data, filterParams)
     return data
 
+
+
+def iter_decode(D : 'dict', chunks, size = 64 * 1024):
+    """
+    Decodes the stream with dictionary `D` whose content is given as the iterable of bytes
+    sequences `chunks`. Returns an iterator over the decoded content, produced a piece at a
+    time by the filters that support it. The other filters decode their whole input at once.
+    """
+    filtersChain = D.get('Filter')
+    if filtersChain is not None:
+        if not isinstance(filtersChain, list):
+            filtersChain = (filtersChain,)
+        filterParams = D.get('DecodeParms', {})
+        for filterSpecifier in reversed(filtersChain):
+            if filterSpecifier == "Crypt":
+                continue # It has been already processed elsewhere
+            decoder = decoders.get(filterSpecifier)
+            if decoder is None:
+                raise PDFUnsupportedError("Filter '{}' is not supported.".format(filterSpecifier))
+            incremental_decoder = incremental_decoders.get(filterSpecifier)
+            if incremental_decoder is not None:
+                chunks = incremental_decoder(chunks, filterParams, size)
+            else:
+                chunks = _decode_at_once(decoder, chunks, filterParams)
+    return iter(chunks)
+
+
+
+def _decode_at_once(decoder, chunks, params):
+    yield decoder(b"".join(chunks), params)
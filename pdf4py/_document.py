@@ -25,8 +25,8 @@ class Page:
 
 class Document:
 
-    def __init__(self, source):
-        self._parser = Parser(source)
+    def __init__(self, source, **kwargs):
+        self._parser = Parser(source, **kwargs)
         self._read_catalog()
     
 
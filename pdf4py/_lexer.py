@@ -1,7 +1,11 @@
+import io
 import logging
+import mmap
+import re
+import sys
+import threading
 from ._charset import *
 from .types import *
-import _io
 from .exceptions import PDFLexicalError
 
 
@@ -52,6 +56,50 @@ class Seekable:
 
 
 
+# Patterns used to scan the input in bulk. Each of them matches a (possibly empty) run of bytes
+# starting from the given position, so that a whole lexeme is consumed with a single call.
+_BLANKS_AND_COMMENTS = re.compile(rb"(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*")
+_REGULAR_CHARACTERS = re.compile(rb"[^\x00-\x20\x7f-\xff()<>\[\]{}/%]*")
+_NUMBER = re.compile(rb"[+-]?[0-9]*(\.[0-9]*)?")
+_INVALID_NAME_ESCAPE = re.compile(rb"#(?![0-9A-Fa-f]{2})")
+_NAME_ESCAPE = re.compile(rb"#([0-9A-Fa-f]{2})")
+_END_OF_LINE = re.compile(rb"[\r\n]")
+_STRING_CHARACTERS = re.compile(rb"[^()\\]*")
+_HEXADECIMAL_STRING = re.compile(rb"[0-9A-Fa-f\x00\t\n\x0c\r ]*")
+_BLANK_CHARACTERS = bytes(sorted(BLANKS))
+
+# File-like sources that cannot be memory-mapped are read in aligned blocks of this size.
+_BLOCK_SIZE = 64 * 1024
+
+# Files of these types are memory-mapped, other file-like objects are read through a window.
+_MAPPABLE_FILES = (io.BufferedReader, io.BufferedRandom, io.FileIO)
+
+# Each Lexer keeps the names and operators it has seen, keyed on their raw bytes, so that the same
+# shared objects are returned every time they occur. A table stops growing at _INTERN_LIMIT entries.
+_INTERN_LIMIT = 4096
+
+
+
+# Lexemes made of a fixed sequence of letters, grouped by their first byte in the order they must
+# be tried. `PDFStreamReader` stands for the lexeme built when the `stream` keyword is found.
+_FIXED_LEXEMES = dict()
+for _literal, _lexeme in [(b"true", True), (b"false", False), (b"stream", PDFStreamReader), (b"null", None)] + \
+        [(k, PDFKeyword(k)) for k in KEYWORDS]:
+    _FIXED_LEXEMES.setdefault(_literal[0], []).append((_literal, _lexeme))
+del _literal, _lexeme
+
+_DICT_START = PDFDictDelimiter(b"<<")
+_DICT_END = PDFDictDelimiter(b">>")
+
+
+
+class _WindowExhausted(Exception):
+    """
+    Raised internally when a lexeme runs past the end of the window over a file-like source.
+    """
+
+
+
 class Lexer:
     """
     A lexical analyzer, in short lexer, is a software that takes as input a sequence of characters 
@@ -64,9 +112,15 @@ class Lexer:
     The Lexer class implements the __next__ and __iter__ dunder methods to iterate over the lexemes 
     that are present in the input bytes sequence. It also give to the user methods to move around
     the input sequence to allow lazy parsing (i.e. to parse only the required lexemes). 
+
+    The input is scanned as a contiguous buffer with an integer cursor (the Lexer's head). Runs
+    of blanks, comments, names and numbers are consumed with precompiled regular expressions,
+    so that a lexeme costs a handful of calls instead of one call per byte. When the source is a
+    file-like object that cannot be memory-mapped, the buffer is a window over the file that is
+    refilled in aligned blocks when the head leaves it, and grown when a lexeme does not fit in it.
     """
 
-    def __init__(self, source, contextSize = 200):
+    def __init__(self, source, contextSize = 200, lock = None, position = None):
         """
         Creates a new instance of a PDF lexical analyzer associated to the given source sequence of
         bytes.
@@ -74,41 +128,111 @@ class Lexer:
 
         Parameters
         ----------
-        source : (read/tell/seek)-supporting type, bytes or bytearray
-            The source from where bytes are read.
+        source : bytes, bytearray, mmap.mmap or (readinto/seek/tell)-supporting type
+            The source from where bytes are read. When a file opened in binary mode is given, it
+            is memory-mapped (read only). Other file-like objects, such as `io.BytesIO` or
+            `tempfile.SpooledTemporaryFile`, and files that cannot be mapped are read in blocks
+            of 64 KiB. In both cases the head is placed at the current position of the file.
         
         contextSize : int
             The size of the context that will be collected if `get_context` is called.
-        """
 
-        if isinstance(source, bytes) or isinstance(source, bytearray):
-            self.__source = Seekable(source)
-        elif isinstance(source, _io.BufferedReader):
-            self.__source = source
+        lock : threading.Lock, optional
+            The lock held while a file-like source is read. Lexers reading the same file from
+            different threads must share it, see `Lexer.cursor`.
+
+        position : int, optional
+            The position the head is placed at. By default it is the current position of a
+            file-like source, and the start of the input otherwise.
+        """
+        self.__mapping = None
+        self.__file = None
+        self.__lock = lock
+        if isinstance(source, (bytes, bytearray, mmap.mmap)):
+            self.__buffer = source
+            startPos = 0 if position is None else position
+        elif hasattr(source, "readinto"):
+            if lock is None:
+                self.__lock = threading.Lock()
+            if position is None:
+                with self.__lock:
+                    position = source.tell()
+            startPos = position
+            if isinstance(source, _MAPPABLE_FILES):
+                try:
+                    self.__mapping = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError):
+                    # for example an empty file, or a file that does not support mapping
+                    pass
+            if self.__mapping is not None:
+                self.__buffer = self.__mapping
+            else:
+                self.__file = source
+                self.__buffer = bytearray()
         else:
             raise ValueError("The parser is given an invalid source of bytes.")
-        
-        cpos = self.__source.tell()
-        self.__source.seek(0, 2)
-        self.__length = self.__source.tell()
-        self.__source.seek(cpos, 0)
-        self.__head = self.__source.read(1)
-        if self.__head == b"":
-            self.__head = ord(' ')
-            self.__ended = True
-        else:
-            self.__ended = False
-            self.__head = self.__head[0]
 
+        if self.__file is None:
+            self.__size = len(self.__buffer)
+            self.__base = 0
+            self.__length = self.__size
+            self.__eof = True
+            self.__pos = startPos
+        else:
+            with self.__lock:
+                self.__size = source.seek(0, 2)
+            self.__fill(startPos)
         self.__lexemesBuffer = list()
         self.__movesHistory = list()
         self.__contextSize = contextSize
         self.__current_lexeme = None
+        self.__interned_names = dict()
+        self.__interned_operators = dict()
     
 
     @property
     def source(self):
-        return self.__source
+        """
+        The bytes-like object or the file-like object the Lexer is scanning.
+        """
+        return self.__buffer if self.__file is None else self.__file
+
+
+    @property
+    def size(self):
+        """
+        The size of the input, in bytes.
+        """
+        return self.__size
+
+
+    def cursor(self):
+        """
+        Returns a new Lexer over the same source, with its own head placed at the start of the
+        input. The cursor shares the memory mapping and the buffer of the source with this Lexer,
+        the lock guarding the reads from a file-like source and the interned names and operators,
+        so that each thread can scan the input with its own cursor.
+        """
+        # the position of a shared file is wherever the last read of another Lexer left it
+        cursor = Lexer(self.source, self.__contextSize, self.__lock, position = 0)
+        cursor.__interned_names = self.__interned_names
+        cursor.__interned_operators = self.__interned_operators
+        return cursor
+
+
+    def close(self):
+        """
+        Releases the memory mapping the Lexer has created over a file object, if any. Sources
+        given by the user are never closed. If views over the mapping are still alive, e.g. in the
+        traceback of an error met while decoding a stream, the mapping is released once they are
+        garbage collected.
+        """
+        if self.__mapping is not None:
+            try:
+                self.__mapping.close()
+            except BufferError:
+                pass
+            self.__mapping = None
 
 
     @property
@@ -120,17 +244,91 @@ class Lexer:
             The last parsed lexeme.
         """
         return self.__current_lexeme
+
+
+    def tell(self):
+        """
+        Returns
+        -------
+        pos : int
+            The position of the Lexer's head, i.e. the position of the first byte that has not
+            been consumed yet.
+        """
+        return self.__base + self.__pos
+
+
+    def read(self, pos, n):
+        """
+        Returns at most `n` bytes of the input starting from position `pos`, without moving
+        the Lexer's head.
+        """
+        if self.__file is None:
+            return bytes(self.__buffer[pos : pos + n])
+        with self.__lock:
+            self.__file.seek(pos, 0)
+            return self.__file.read(n)
+
+
+    def __fill(self, pos, size = 0):
+        """
+        Loads the window over a file-like source so that it contains at least `size` bytes
+        (one block, by default) starting from position `pos`, and places the Lexer's head at
+        `pos`. The window starts at the block boundary preceding `pos` and its size is rounded up
+        to a multiple of the block size.
+        """
+        size = max(size, _BLOCK_SIZE)
+        start = pos - pos % _BLOCK_SIZE
+        size = -(-(pos - start + size) // _BLOCK_SIZE) * _BLOCK_SIZE
+        if len(self.__buffer) < size:
+            self.__buffer.extend(bytes(size - len(self.__buffer)))
+        with self.__lock, memoryview(self.__buffer) as view:
+            self.__file.seek(start, 0)
+            filled = 0
+            while filled < size:
+                n = self.__file.readinto(view[filled : size])
+                if not n:
+                    break
+                filled += n
+        self.__base = start
+        self.__length = filled
+        self.__eof = start + filled >= self.__size
+        self.__pos = pos - start
+
+
+    def __seek(self, pos):
+        """
+        Places the Lexer's head at position `pos`, refilling the window if `pos` is outside it.
+        """
+        if self.__file is None:
+            self.__pos = pos
+        elif 0 <= pos - self.__base < self.__length:
+            self.__pos = pos - self.__base
+        else:
+            self.__fill(pos)
     
 
-    def rfind(self, keyword : 'bytes'):
+    def rfind(self, keyword : 'bytes', tail = 1024, limit = None):
         """
         Searches a sequence of bytes starting from the end of the input bytes sequence.
 
+        The last `tail` bytes of the input are searched first, with a single read. If the sequence
+        is not there, the search goes on backwards one block at a time, up to `limit` bytes from
+        the end of the input. If the sequence is found, the Lexer's head is moved at its position
+        and the sequence is extracted as the current lexeme.
+
 
         Parameters
         ----------
         keyword : bytes
             The sequence of bytes to search for.
+
+        tail : int
+            Size of the trailing part of the input that is searched first.
+
+        limit : int or None
+            Maximum distance from the end of the input the search can reach. `None` means that
+            the whole input can be searched, while a value not greater than `tail` disables the
+            search outside the tail.
         
 
         Returns
@@ -138,30 +336,34 @@ class Lexer:
         pos : int
             The starting position of the sequence if found, `-1` otherwise.
         """
-        revKeyword = bytes(reversed(keyword))
-        buff = bytearray()
-        count = 1
-        while bytes(buff) != revKeyword:
-            buff.clear()
-            while count <= self.__length:
-                self.__source.seek(self.__length - count, 0)
-                c = self.__source.read(1)[0]
-                count += 1
-                if c not in [CARRIAGE_RETURN, LINE_FEED]:
-                    buff.append(c)
-                else:
-                    break
-            if c in [CARRIAGE_RETURN, LINE_FEED]:
-                c = None
-                continue
-            if count > self.__length:
-                return -1
-        pos = self.__source.tell()
-        self.__advance()
+        stop = 0 if limit is None else max(self.__size - max(limit, tail), 0)
+        end = self.__size
+        start = max(end - tail, stop)
+        while True:
+            pos = self.__rfind_between(keyword, start, end)
+            if pos >= 0 or start <= stop:
+                break
+            # consecutive blocks overlap, so that a sequence crossing their boundary is not missed.
+            end = start + len(keyword) - 1
+            start = max(end - max(_BLOCK_SIZE, 2 * len(keyword)), stop)
+        if pos < 0:
+            return -1
+        self.__seek(pos)
         self.__next__()
         return pos
 
 
+    def __rfind_between(self, keyword, start, end):
+        """
+        Returns the position of the last occurrence of `keyword` entirely contained in the input
+        between positions `start` and `end`, or `-1` if there is not any.
+        """
+        if self.__file is None:
+            return self.__buffer.rfind(keyword, start, end)
+        pos = self.read(start, end - start).rfind(keyword)
+        return pos if pos < 0 else start + pos
+
+
     def get_context(self):
         """
         Returns the bytes near the Lexer's current head position.
@@ -185,20 +387,17 @@ class Lexer:
             Position in the context sequence where the error occurred.
         """
         # collect the context in which the error occurred
-        errorPosition = self.__source.tell()
+        errorPosition = self.tell()
         contextSideSize = self.__contextSize // 2
         contextStart = errorPosition - contextSideSize
         if contextStart < 0:
             contextSideSize = contextSideSize + contextStart
             contextStart = 0
-        self.__source.seek(contextStart, 0)
-        context = self.__source.read(self.__contextSize)
-        if isinstance(context, memoryview):
-            context = bytes(context)
+        context = self.read(contextStart, self.__contextSize)
         # escaped occurrences occupy 2 spaces instead of one, when printed as bytes.
         escapedOccurrences = sum(context[:contextSideSize].count(x) for x in STRING_ESCAPE_SEQUENCES.values())
-        errorRelativePosition = contextSideSize + escapedOccurrences + 1
-        self.__source.seek(errorPosition, 0)
+        # the context is printed with the "b'" prefix
+        errorRelativePosition = contextSideSize + escapedOccurrences + 2
         return context, errorPosition, errorRelativePosition
 
         
@@ -227,7 +426,7 @@ class Lexer:
         raise PDFLexicalError(finalMsg)
 
 
-    def move_at_position(self, pos):
+    def move_at_position(self, pos, save = True):
         """
         Moves the Lexer's head to the new position `pos` and extracts the lexeme starting at that
         position, Also, saves the current position and lexeme into a stack so that they can be
@@ -238,6 +437,10 @@ class Lexer:
         ----------
         pos : int
             The position where to move to.
+
+        save : bool
+            If False, the current position is not saved, as for moves that are never undone with
+            `move_back`.
         
 
         Returns
@@ -245,11 +448,10 @@ class Lexer:
         lex : A Python object
             The lexeme extracted starting from position `pos`.
         """
-        previousLexeme = self.current_lexeme
-        previousPosition = self.__source.tell()
-        self.__movesHistory.append((previousLexeme, previousPosition))
-        self.__source.seek(pos, 0)
-        self.__advance()
+        if save:
+            self.__movesHistory.append((self.__current_lexeme, self.tell(), self.__lexemesBuffer))
+        self.__lexemesBuffer = list()
+        self.__seek(pos)
         return self.__next__()
 
 
@@ -260,29 +462,8 @@ class Lexer:
         """
         if len(self.__movesHistory) == 0:
             raise Exception("No move in history")
-        prevLex, prevPos = self.__movesHistory.pop()
-        self.__current_lexeme = prevLex
-        self.__source.seek(prevPos - 1, 0)
-        self.__advance()
-
-
-    def __advance(self, k = 1):
-        """
-        Advance the Lexer's head of `k` positions.
-
-        Parameters
-        ----------
-        k : int
-            Number of position the Lexer's head must be moved.
-        """
-        if self.__ended:
-            raise StopIteration()
-        self.__head = self.__source.read(k)
-        if len(self.__head) < k:
-            self.__head = ord(' ')
-            self.__ended = True
-        else:
-            self.__head = self.__head[-1]
+        self.__current_lexeme, prevPos, self.__lexemesBuffer = self.__movesHistory.pop()
+        self.__seek(prevPos)
 
 
     def __remove_blanks(self):
@@ -291,14 +472,25 @@ class Lexer:
         position until the next meaningful character position.
         """
         while True:
-            if self.__head in BLANKS:
-                self.__advance()
-            elif self.__head == PERCENTAGE: # comment starts
-                while self.__head != LINE_FEED:
-                    self.__advance()
-                self.__advance()
-            else:
-                break
+            end = _BLANKS_AND_COMMENTS.match(self.__buffer, self.__pos, self.__length).end()
+            if end < self.__length or self.__eof:
+                self.__pos = end
+                return
+            # The window ends within the blanks. If the last line is a comment, its end
+            # must be searched in the next windows.
+            lineStart = max(self.__buffer.rfind(b"\n", self.__pos, end),
+                self.__buffer.rfind(b"\r", self.__pos, end), self.__pos)
+            inComment = self.__buffer.find(b"%", lineStart, end) >= 0
+            self.__fill(self.__base + end)
+            while inComment:
+                eol = _END_OF_LINE.search(self.__buffer, self.__pos, self.__length)
+                if eol is not None:
+                    self.__pos = eol.start()
+                    break
+                elif self.__eof:
+                    self.__pos = self.__length
+                    break
+                self.__fill(self.__base + self.__length)
 
 
     def __peek(self, k = 1):
@@ -316,17 +508,14 @@ class Lexer:
         Returns
         -------
         current_byte : int
-            The peeked byte
+            The peeked byte, or `None` if the position is past the end of the input.
         """
-        k -= 1
-        currentPos = self.__source.tell()
-        if currentPos + k >= self.__length:
+        pos = self.__pos + k
+        if pos >= self.__length:
+            if not self.__eof:
+                raise _WindowExhausted()
             return None
-        else:
-            self.__source.seek(k, 1)
-            v = self.__source.read(1)
-            self.__source.seek(currentPos, 0)
-            return v[0]
+        return self.__buffer[pos]
     
 
     def __extract_string_literal(self):
@@ -335,38 +524,59 @@ class Lexer:
 
         Returns
         -------
-        successful : bool
-            `successful` is set to `True` if the method executes without
-            errors, `False` otherwise.
-        """
-        self.__advance()
+        string : PDFLiteralString
+            The extracted string, with escape sequences already processed.
+        """
+        source = self.__buffer
+        length = self.__length
+        pos = self.__pos + 1
+        # fast path: strings without escape sequences and nested parentheses are taken in one slice
+        end = _STRING_CHARACTERS.match(source, pos, length).end()
+        if end < length and source[end] == CLOSE_PARENTHESIS:
+            self.__pos = end + 1
+            return PDFLiteralString(bytes(source[pos:end]))
         openParentheses = 1
         buffer = bytearray()
-        while openParentheses > 0:
-            if self.__head == OPEN_PARENTHESIS:
+        while True:
+            # copy the run of ordinary characters in one go
+            buffer += source[pos:end]
+            pos = end
+            if pos + 4 > length:
+                # an escape sequence takes at most 4 bytes
+                if not self.__eof:
+                    raise _WindowExhausted()
+                if pos >= length:
+                    self.__pos = pos
+                    self.__raise_lexer_error("Unterminated literal string.")
+            c = source[pos]
+            pos += 1
+            if c == OPEN_PARENTHESIS:
                 openParentheses += 1
-            elif self.__head == CLOSE_PARENTHESIS:
+            elif c == CLOSE_PARENTHESIS:
                 openParentheses -= 1
-            elif self.__head == BACK_SLASH:
+                if openParentheses == 0:
+                    break
+            elif pos < length:
                 # parse special content (escaped sequence)
-                self.__advance()
-                if not is_digit(self.__head):
+                c = source[pos]
+                if not is_digit(c):
                     # then it must be one of the blanks like: \n, \r, \t etc..
-                    buffer.append(STRING_ESCAPE_SEQUENCES.get(self.__head, self.__head))
-                    self.__advance()
-                    continue
+                    buffer.append(STRING_ESCAPE_SEQUENCES.get(c, c))
+                    pos += 1
                 else:
                     # otherwise it is an octal number
-                    digits = bytearray()
-                    while is_digit(self.__head) and len(digits) < 3:
-                        digits.append(self.__head)
-                        self.__advance()
-                    charCode = sum(int(x) << 3*(len(digits) -i - 1) for i, x in enumerate(digits.decode('ascii')))
-                    buffer.append(charCode)
-                    continue
-            buffer.append(self.__head)
-            self.__advance()
-        buffer.pop()
+                    charCode = 0
+                    digits = 0
+                    while pos < length and digits < 3 and is_digit(source[pos]):
+                        charCode = (charCode << 3) + source[pos] - 48
+                        digits += 1
+                        pos += 1
+                    buffer.append(charCode & 0xFF)
+                end = _STRING_CHARACTERS.match(source, pos, length).end()
+                continue
+            buffer.append(c)
+            end = _STRING_CHARACTERS.match(source, pos, length).end()
+        self.__pos = pos
         return PDFLiteralString(bytes(buffer))
         
 
@@ -377,92 +587,89 @@ class Lexer:
 
         Returns
         -------
-        successful : bool
-            `successful` is set to `True` if the method executes without
-            errors, `False` otherwise.
-        """
-        self.__advance()
-        buffer = bytearray()
-        while True:
-            if self.__head in BLANKS:
-                self.__advance()
-                continue
-            if not is_hex_digit(self.__head):
-                break
-            buffer.append(self.__head)
-            self.__advance()
-        if self.__head != CLOSE_ANGLE_BRACKET:
+        string : PDFHexString
+            The extracted string, holding the hexadecimal digits without blanks.
+        """
+        source = self.__buffer
+        pos = self.__pos + 1
+        end = _HEXADECIMAL_STRING.match(source, pos, self.__length).end()
+        if end >= self.__length and not self.__eof:
+            raise _WindowExhausted()
+        self.__pos = end
+        if self.__peek(0) != CLOSE_ANGLE_BRACKET:
             self.__raise_lexer_error("Expected '>' to end hexadecimal string.")
-        self.__advance()
-        return PDFHexString(bytes(buffer))
+        self.__pos += 1
+        # the digits are taken in one slice, then the blanks between them are dropped
+        value = bytes(source[pos:end]).translate(None, _BLANK_CHARACTERS)
+        return PDFHexString(value)
 
             
-    def __extract_name_or_operator(self):
+    def __extract_name_or_operator(self, interned, wrapper=None):
         """
-        Extracts a PDF name object from the input bytes sequence.
+        Extracts a sequence of regular characters from the input bytes sequence, processing the
+        `#xx` escape sequences allowed in names.
 
 
-        Returns
-        -------
-        successful : bool
-            `successful` is set to `True` if the method executes without
-            errors, `False` otherwise.
-        """
-        buffer = bytearray()
-        while ord('!') <= self.__head and self.__head <= ord('~') and self.__head not in DELIMITERS:
-            if self.__head == NUMBER_SIGN:
-                self.__advance()
-                try:
-                    hexDigit1 = hex_to_number(self.__head)
-                    self.__advance()
-                    hexDigit2 = hex_to_number(self.__head)
-                    hexNum = (hexDigit1 << 4) + hexDigit2
-                    buffer.append(hexNum)
-                except ValueError:
-                    self.__raise_lexer_error("'{}' is not an hexadecimal digit.".format(self.__head))
-            else:
-                buffer.append(self.__head)
-            self.__advance()
-        return buffer.decode('utf8')
+        Parameters
+        ----------
+        interned : dict
+            The table of the lexemes already extracted, keyed on their raw bytes. If the sequence
+            is found there the stored lexeme is returned without decoding it again.
 
+        wrapper : type, optional
+            If given, the decoded characters are wrapped into an instance of this type.
 
-    def __extract_number(self, startsWithNumber):
+
+        Returns
+        -------
+        name : str or `wrapper`
+            The extracted characters sequence.
+        """
+        end = _REGULAR_CHARACTERS.match(self.__buffer, self.__pos, self.__length).end()
+        if end >= self.__length and not self.__eof:
+            raise _WindowExhausted()
+        raw = self.__buffer[self.__pos : end]
+        if not isinstance(raw, bytes):
+            raw = bytes(raw)
+        lexeme = interned.get(raw)
+        if lexeme is None:
+            buffer = raw
+            if NUMBER_SIGN in buffer:
+                invalid = _INVALID_NAME_ESCAPE.search(buffer)
+                if invalid is not None:
+                    self.__pos += invalid.start() + 1
+                    self.__raise_lexer_error("'{}' is not an hexadecimal digit.".format(self.__peek(0)))
+                buffer = _NAME_ESCAPE.sub(lambda m : bytes((int(m.group(1), 16),)), buffer)
+            lexeme = sys.intern(buffer.decode('utf8'))
+            if wrapper is not None:
+                lexeme = wrapper(lexeme)
+            if len(interned) < _INTERN_LIMIT:
+                interned[raw] = lexeme
+        self.__pos = end
+        return lexeme
+
+
+    def __extract_number(self):
         """
         Extracts an integer or real value from the input bytes sequence.
 
 
         Returns
         -------
-        successful : bool
-            `successful` is set to `True` if the method executes without
-            errors, `False` otherwise.
-        """
-        buff = bytearray()
-        if self.__head == PLUS or self.__head == MINUS:
-            buff.append(self.__head)
-            self.__advance()
-        
-        while is_digit(self.__head):
-            buff.append(self.__head)
-            self.__advance()
-        
-        if self.__head == POINT:
-            buff.append(POINT)
-            self.__advance()
-        else:
-            if not startsWithNumber and len(buff) == 1:
-                self.__raise_lexer_error("unexpected bytes sequence encountered.")
-            else:
-                return int(buff.decode('utf-8'))
-        
-        while is_digit(self.__head):
-            buff.append(self.__head)
-            self.__advance()
-        
-        if not startsWithNumber and len(buff) == 1:
+        number : int or float
+            The extracted number.
+        """
+        m = _NUMBER.match(self.__buffer, self.__pos, self.__length)
+        if m.end() >= self.__length and not self.__eof:
+            raise _WindowExhausted()
+        text = m.group()
+        if len(text) == 1 and not is_digit(text[0]) or text in (b"+.", b"-."):
             self.__raise_lexer_error("unexpected bytes sequence encountered.")
+        self.__pos = m.end()
+        if m.group(1) is None:
+            return int(text)
         else:
-            return float(buff.decode('utf-8'))
+            return float(text)
         
     
     def __extract_literal(self, lit):
@@ -482,37 +689,85 @@ class Lexer:
             `successful` is set to `True` if the method executes without
             errors, `False` otherwise.
         """
-        diff = False
-        for i, l in enumerate(lit):
-            p = self.__peek(i)
-            if p != l:
-                diff = True
-                break
-        if not diff:
-            # ok, we matched it
-            self.__advance(len(lit))
+        end = self.__pos + len(lit)
+        if end > self.__length and not self.__eof:
+            raise _WindowExhausted()
+        if self.__buffer[self.__pos : end] == lit:
+            self.__pos = end
             return True
         else:
             return False
 
 
-    def __extract_keyword(self):
+    def __extract_keyword_or_operator(self):
         """
-        Extracts one of the PDF language keywords.
+        Extracts one of the keywords starting with the byte at the Lexer's head, or an operator
+        if none of them matches.
 
 
         Returns
         -------
-        successful : bool
-            `successful` is set to `True` if the method executes without
-            errors, `False` otherwise.
+        lex : bool, None, PDFKeyword, PDFStreamReader or PDFOperator
+            The extracted lexeme.
         """
-        for k in KEYWORDS:
-            if self.__extract_literal(k):
-                self.__current_lexeme = PDFKeyword(k)
-                return True
-        else:
-            return False
+        for literal, lexeme in _FIXED_LEXEMES[self.__buffer[self.__pos]]:
+            if self.__extract_literal(literal):
+                if lexeme is PDFStreamReader:
+                    return self.__extract_stream_reader()
+                return lexeme
+        return self.__extract_operator()
+
+
+    def __extract_operator(self):
+        """
+        Extracts an operator appearing in a content stream (or the `R`, `n` and `f` markers).
+        """
+        return self.__extract_name_or_operator(self.__interned_operators, PDFOperator)
+
+
+    def __extract_name(self):
+        """
+        Extracts a PDF name object, skipping the leading slash.
+        """
+        self.__pos += 1
+        return self.__extract_name_or_operator(self.__interned_names)
+
+
+    def __extract_open_angle_bracket(self):
+        """
+        Extracts the `<<` delimiter, or a hexadecimal string if the next byte is not `<`.
+        """
+        if self.__peek() != OPEN_ANGLE_BRACKET:
+            return self.__extract_hexadecimal_string()
+        self.__pos += 2
+        return _DICT_START
+
+
+    def __extract_close_angle_bracket(self):
+        """
+        Extracts the `>>` delimiter.
+        """
+        if self.__peek() != CLOSE_ANGLE_BRACKET:
+            self.__extract_invalid()
+        self.__pos += 2
+        return _DICT_END
+
+
+    def __extract_singleton(self):
+        """
+        Extracts a lexeme made of only one character.
+        """
+        head = self.__buffer[self.__pos]
+        self.__pos += 1
+        return PDFSingleton(head)
+
+
+    def __extract_invalid(self):
+        """
+        Called when the byte at the Lexer's head can not start any lexeme.
+        """
+        head = self.__buffer[self.__pos]
+        self.__raise_lexer_error("Invalid characters sequence in input stream: '{}'.".format(chr(head)))
 
 
     def __extract_stream_reader(self):
@@ -524,27 +779,25 @@ class Lexer:
         Returns
         -------
         A PDFStreamReader object, containing a callable that will return the stream content when called.
+        The callable takes the number of bytes to be read and, optionally, the offset from the start
+        of the stream content where to begin reading.
         """
         # check whether there are the optional \r\n
-        if self.__head == CARRIAGE_RETURN:
-            self.__advance()
-            if self.__head != LINE_FEED:
+        if self.__peek(0) == CARRIAGE_RETURN:
+            self.__pos += 1
+            if self.__peek(0) != LINE_FEED:
                 self.__raise_lexer_error("Carriage return not followed by a line feed after 'stream' keyword.")
-        streamPos = self.__source.tell()
-        # build a closure to read the stream later
-        def read_stream(length):
-            oldEnded = self.__ended
-            self.__ended = False
-            oldPos = self.__source.tell()
-            self.__source.seek(streamPos, 0)
-            data = self.__source.read(length)
-            self.__advance()
-            # now need to match endstream, or line feed + endstream
-            if self.__head == LINE_FEED:
-                self.__advance()
-            self.__source.seek(oldPos, 0)
-            self.__ended = oldEnded
-            return data
+        self.__pos += 1
+        streamPos = self.tell()
+        if self.__file is None:
+            source = self.__buffer
+            # build a closure to read the stream later. The returned view shares memory with the
+            # source, so that no copy is made before the data reaches the decoders.
+            def read_stream(length, offset = 0):
+                return memoryview(source)[streamPos + offset : streamPos + offset + length]
+        else:
+            def read_stream(length, offset = 0):
+                return self.read(streamPos + offset, length)
 
         return PDFStreamReader(read_stream)
         
@@ -584,61 +837,27 @@ class Lexer:
             self.__current_lexeme = self.__lexemesBuffer.pop()
             return self.__current_lexeme
 
-        self.__remove_blanks()
-        # now try to parse lexical entities
-        if self.__head == OPEN_PARENTHESIS:
-            self.__current_lexeme = self.__extract_string_literal()
-    
-        elif self.__head == OPEN_ANGLE_BRACKET and self.__peek() != OPEN_ANGLE_BRACKET:
-            # If the next bytes had been another OPEN_ANGLE_BRACKET then we would have gotten
-            # a "dictionary starts here" mark 
-            self.__current_lexeme = self.__extract_hexadecimal_string()
-
-        elif self.__head == FORWARD_SLASH:
-            self.__advance()
-            item = self.__extract_name_or_operator()
-            self.__current_lexeme = item 
-        
-        elif is_digit(self.__head):
-            self.__current_lexeme = self.__extract_number(startsWithNumber=True)
+        while True:
+            self.__remove_blanks()
+            if self.__pos >= self.__length:
+                raise StopIteration()
+            start = self.__pos
+            try:
+                return self.__extract_lexeme()
+            except _WindowExhausted:
+                # the lexeme does not fit in the window: read it again from a larger one
+                self.__fill(self.__base + start, 2 * (self.__length - start))
 
-        elif self.__head in [PLUS, MINUS, POINT]:
-            self.__current_lexeme = self.__extract_number(startsWithNumber=False)
 
-        elif self.__extract_literal(b"true"):
-            self.__current_lexeme = True
-        
-        elif self.__extract_literal(b"false"):
-            self.__current_lexeme = False
-        
-        elif self.__extract_literal(b"stream"):
-            self.__current_lexeme = self.__extract_stream_reader()
-
-        elif self.__extract_literal(b"<<"):
-            self.__current_lexeme = PDFDictDelimiter(b"<<")
-        
-        elif self.__extract_literal(b">>"):
-            self.__current_lexeme = PDFDictDelimiter(b">>")
-        
-        elif self.__extract_literal(b"null"):
-            self.__current_lexeme = None
-        
-        elif self.__extract_keyword():
-            # self.__current_lexeme is set inside the called function
-            pass
-        
-        elif self.__head in SINGLETONS:
-            self.__current_lexeme = PDFSingleton(self.__head)
-            self.__advance()
-        
-        elif ord('!') <= self.__head and self.__head <= ord('~') and self.__head not in DELIMITERS:
-            item = self.__extract_name_or_operator()
-            self.__current_lexeme = PDFOperator(item)
-            
-        else:
-            # If the input bytes sequence prefix doesn't match anything known, then...
-            raise self.__raise_lexer_error("Invalid characters sequence in input stream: '{}'.".format(chr(self.__head)))
+    def __extract_lexeme(self):
+        """
+        Extracts the lexeme starting at the Lexer's head, that must be placed on a meaningful
+        character, and sets it as current lexeme.
 
+        The method that extracts the lexeme is looked up in a table indexed by the byte at the
+        Lexer's head, so that at most the keywords starting with that byte are tried.
+        """
+        self.__current_lexeme = self.__dispatch[self.__buffer[self.__pos]](self)
         return self.__current_lexeme
 
 
@@ -658,3 +877,21 @@ class Lexer:
         """
         self.__lexemesBuffer.append(self.__current_lexeme)
         self.__current_lexeme = item
+
+
+    # the extractor to be used for each value of the first byte of a lexeme
+    __dispatch = [__extract_invalid] * 256
+    for __byte in range(ord('!'), ord('~') + 1):
+        if __byte in _FIXED_LEXEMES:
+            __dispatch[__byte] = __extract_keyword_or_operator
+        elif __byte in SINGLETONS:
+            __dispatch[__byte] = __extract_singleton
+        elif __byte in b"0123456789+-.":
+            __dispatch[__byte] = __extract_number
+        elif __byte not in DELIMITERS:
+            __dispatch[__byte] = __extract_operator
+    del __byte
+    __dispatch[OPEN_PARENTHESIS] = __extract_string_literal
+    __dispatch[OPEN_ANGLE_BRACKET] = __extract_open_angle_bracket
+    __dispatch[CLOSE_ANGLE_BRACKET] = __extract_close_angle_bracket
+    __dispatch[FORWARD_SLASH] = __extract_name
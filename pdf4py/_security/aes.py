@@ -229,4 +229,23 @@ def cbc_decrypt(data : 'bytes', key : 'bytes', iv : 'bytes', padding = True):
         pad = decrypted[-1]
         return bytes(decrypted[:-pad])
     else:
-        return bytes(decrypted)
\ No newline at end of file
+        return bytes(decrypted)
+
+
+def cbc_decrypt_chunks(chunks, key : 'bytes', iv : 'bytes', padding = True):
+    """
+    Decrypts the ciphertext given as an iterable of bytes sequences of any length, yielding the
+    plaintext a piece at a time. The result is the same as the one of `cbc_decrypt` called on
+    the concatenation of `chunks`.
+    """
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        # the last block is kept until the end, as it holds the padding
+        n = (len(pending) - 1 if padding else len(pending)) // (4*Nb) * (4*Nb)
+        if n > 0:
+            data, pending = pending[:n], pending[n:]
+            yield cbc_decrypt(data, key, iv, padding = False)
+            iv = data[-4*Nb:]
+    if padding or pending:
+        yield cbc_decrypt(pending, key, iv, padding)
@@ -22,24 +22,45 @@ def rc4(buffer, key):
     ----------------
     Adapted from http://cypherpunks.venona.com/archive/1994/09/msg00304.html
     """
-    # Preparation step
-    state = list(range(256))       
-    x = 0
-    y = 0   
-    index1 = 0
-    index2 = 0             
-    for counter in range(256):
-        index2 = (key[index1] + state[counter] + index2) % 256                
-        state[counter], state[index2] = state[index2], state[counter]            
-        index1 = (index1 + 1) % len(key)  
-    
-    # encryption / decryption step
-    output = [0] * len(buffer)
-    for i in range(len(buffer)):
-        x = (x + 1) % 256                      
-        y = (state[x] + y) % 256               
-        state[x], state[y] = state[y], state[x]                          
-        xorIndex = (state[x] + state[y]) % 256                 
-        output[i] = buffer[i] ^ state[xorIndex]
-    
-    return bytes(output)
+    return RC4(key).process(buffer)
+
+
+
+class RC4:
+    """
+    Keeps the state of the RC4 algorithm, so that a long bytes sequence can be encrypted or
+    decrypted a piece at a time through consecutive calls to `process`.
+    """
+
+    def __init__(self, key):
+        # Preparation step
+        state = list(range(256))
+        index1 = 0
+        index2 = 0
+        for counter in range(256):
+            index2 = (key[index1] + state[counter] + index2) % 256
+            state[counter], state[index2] = state[index2], state[counter]
+            index1 = (index1 + 1) % len(key)
+        self.__state = state
+        self.__x = 0
+        self.__y = 0
+
+
+    def process(self, buffer):
+        """
+        Encrypts / decrypts `buffer`, continuing from the end of the previous call.
+        """
+        state = self.__state
+        x = self.__x
+        y = self.__y
+        # encryption / decryption step
+        output = [0] * len(buffer)
+        for i in range(len(buffer)):
+            x = (x + 1) % 256
+            y = (state[x] + y) % 256
+            state[x], state[y] = state[y], state[x]
+            xorIndex = (state[x] + state[y]) % 256
+            output[i] = buffer[i] ^ state[xorIndex]
+        self.__x = x
+        self.__y = y
+        return bytes(output)
@@ -1,9 +1,8 @@
 from itertools import takewhile, chain
 from hashlib import md5, sha256
-from binascii import unhexlify
 from ..exceptions import *
-from .rc4 import rc4
-from .aes import cbc_decrypt
+from .rc4 import rc4, RC4
+from .aes import cbc_decrypt, cbc_decrypt_chunks
 from ..types import PDFHexString, PDFLiteralString
 import stringprep
 import unicodedata
@@ -49,9 +48,9 @@ def compute_encryption_key_AESV3(password : 'str', encryption_dict : 'dict'):
     A bytes sequence representing the encryption key.
     """
     U = encryption_dict["U"]
-    U = U.value if isinstance(U, PDFLiteralString) else unhexlify(U.value)
+    U = U.value if isinstance(U, PDFLiteralString) else U.decoded
     O = encryption_dict["O"]
-    O = O.value if isinstance(O, PDFLiteralString) else unhexlify(O.value)
+    O = O.value if isinstance(O, PDFLiteralString) else O.decoded
 
     prepped = sals_stringprep(password)
     truncated = prepped.encode("utf8")[:127]
@@ -60,14 +59,14 @@ def compute_encryption_key_AESV3(password : 'str', encryption_dict : 'dict'):
     if digest == O[:32]:
         intermediate = sha256(truncated + O[-8:] + U).digest()
         OE = encryption_dict["OE"]
-        OE = OE.value if isinstance(OE, PDFLiteralString) else unhexlify(OE.value)
+        OE = OE.value if isinstance(OE, PDFLiteralString) else OE.decoded
         file_encryption_key = cbc_decrypt(OE, intermediate, b'\x00'*16, padding = False)
     else:
         digest = sha256(truncated + U[32:32+8]).digest()
         if digest == U[:32]:
             intermediate = sha256(truncated + U[-8:]).digest()
             UE = encryption_dict["UE"]
-            UE = UE.value if isinstance(UE, PDFLiteralString) else unhexlify(UE.value)
+            UE = UE.value if isinstance(UE, PDFLiteralString) else UE.decoded
             file_encryption_key = cbc_decrypt(UE, intermediate, b'\x00'*16, padding = False)
         else:
             raise PDFWrongPasswordError()
@@ -93,7 +92,7 @@ def compute_encryption_key(password : 'bytes', encryption_dict : 'dict', id_arra
     R = encryption_dict["R"]
     O = encryption_dict["O"]
     V = encryption_dict.get("V", 0)
-    O = O.value if isinstance(O, PDFLiteralString) else unhexlify(O.value)
+    O = O.value if isinstance(O, PDFLiteralString) else O.decoded
     if V == 3:
         raise PDFUnsupportedError("An unknown algorithm has been used to encrypt the document.")
 
@@ -137,7 +136,7 @@ def authenticate_user_password(password : 'bytes', encryption_dict : 'dict', id_
     """
     R = encryption_dict["R"]
     U = encryption_dict["U"]
-    U = U.value if isinstance(U, PDFLiteralString) else unhexlify(U.value)
+    U = U.value if isinstance(U, PDFLiteralString) else U.decoded
     encryption_key = compute_encryption_key(password, encryption_dict, id_array)
     if R == 2:
         cipher = rc4(PASSWORD_PADDING, encryption_key)
@@ -179,7 +178,7 @@ def authenticate_owner_password(password : 'bytes', encryption_dict : 'dict', id
     Length = Length // 8
     R = encryption_dict["R"]
     O = encryption_dict["O"]
-    O = O.value if isinstance(O, PDFLiteralString) else unhexlify(O.value)
+    O = O.value if isinstance(O, PDFLiteralString) else O.decoded
     input_to_md5 = bytearray()
     input_to_md5.extend((password + PASSWORD_PADDING)[:32])
     input_to_md5 = md5(input_to_md5).digest()
@@ -198,7 +197,11 @@ def authenticate_owner_password(password : 'bytes', encryption_dict : 'dict', id
 
 
 
-def decrypt(encryption_key: 'bytes', encryption_dict : 'dict', data : 'bytes', identifier : 'tuple', algo = 'rc4'):
+def object_key(encryption_key: 'bytes', identifier : 'tuple', algo = 'rc4'):
+    """
+    Derives the key used to encrypt the strings and streams of the object `identifier` from the
+    file encryption key (Algorithm 1 of the Standard).
+    """
     n = len(encryption_key)
     object_number = identifier[0].to_bytes(4, byteorder='little')
     generation_number = identifier[1].to_bytes(4, byteorder='little')
@@ -206,7 +209,12 @@ def decrypt(encryption_key: 'bytes', encryption_dict : 'dict', data : 'bytes', i
     if algo == 'AES':
         encryption_key_ext += b'\x73\x41\x6C\x54'
     hashed_value = md5(encryption_key_ext).digest()
-    encryption_key = hashed_value[:min([n + 5, 16])]
+    return hashed_value[:min([n + 5, 16])]
+
+
+
+def decrypt(encryption_key: 'bytes', encryption_dict : 'dict', data : 'bytes', identifier : 'tuple', algo = 'rc4'):
+    encryption_key = object_key(encryption_key, identifier, algo)
     if algo == 'AES':
         IV, data = data[:16], data[16:]
         return cbc_decrypt(data, encryption_key, IV)
@@ -230,7 +238,7 @@ class StandardSecurityHandler:
             self.__encryption_key = compute_encryption_key_AESV3(password, encryption_dict)
         else:
             password = bytes() if password is None else password
-            self.__id_array = [unhexlify(x.value) if isinstance(x, PDFHexString) else x.value for x in id_array]
+            self.__id_array = [x.decoded if isinstance(x, PDFHexString) else x.value for x in id_array]
             self.__encryption_key = authenticate_user_password(password, encryption_dict, self.__id_array)
             if self.__encryption_key is None:
                 self.__encryption_key = authenticate_owner_password(password, encryption_dict, self.__id_array)    
@@ -267,7 +275,11 @@ class StandardSecurityHandler:
             return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier)
 
     
-    def decrypt_stream(self, data, D, identifier):
+    def __stream_crypt_method(self, D):
+        """
+        Returns the method used to encrypt the stream with dictionary `D`: 'Identity', 'V2' (RC4),
+        'AESV2' or 'AESV3'.
+        """
         if self.__V == 4:
             filters = D.get('Filters')
             if isinstance(filters, list):
@@ -280,7 +292,7 @@ class StandardSecurityHandler:
                 params = D.get('DecodeParams', {})
                 crypt_filter_name = params.get('Name', 'Identity')
             if crypt_filter_name == 'Identity':
-                return data
+                return 'Identity'
             else:
                 CF = self.__encryption_dict.get('CF')
                 if CF is None:
@@ -289,16 +301,47 @@ class StandardSecurityHandler:
                 CFM = crypt_filter.get('CFM', 'None')
                 if CFM == 'None':
                     raise PDFUnsupportedError("Crypt filter with CFM = None is not supported.")
-                elif CFM == 'V2':
-                    return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier)
-                elif CFM == 'AESV2':
-                    return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier, 'AES')
-                elif CFM == 'AESV3':
-                    return cbc_decrypt(data[16:], self.__encryption_key, data[:16])
+                elif CFM in ('V2', 'AESV2', 'AESV3'):
+                    return CFM
                 else:
                     raise PDFSyntaxError('Unexpected value for CFM: "{}"'.format(CFM))
 
         else:
-            return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier)
+            return 'V2'
 
-        
\ No newline at end of file
+
+    def decrypt_stream(self, data, D, identifier):
+        method = self.__stream_crypt_method(D)
+        if method == 'Identity':
+            return data
+        elif method == 'V2':
+            return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier)
+        elif method == 'AESV2':
+            return decrypt(self.__encryption_key, self.__encryption_dict, data, identifier, 'AES')
+        else:
+            return cbc_decrypt(data[16:], self.__encryption_key, data[:16])
+
+
+    def iter_decrypt_stream(self, chunks, D, identifier):
+        """
+        Decrypts the content of the stream with dictionary `D`, given as an iterable of bytes
+        sequences `chunks`, a piece at a time. The concatenation of the yielded pieces is equal
+        to the result of `decrypt_stream`.
+        """
+        method = self.__stream_crypt_method(D)
+        if method == 'Identity':
+            yield from chunks
+        elif method == 'V2':
+            cipher = RC4(object_key(self.__encryption_key, identifier))
+            for chunk in chunks:
+                yield cipher.process(chunk)
+        else:
+            key = object_key(self.__encryption_key, identifier, 'AES') if method == 'AESV2' else self.__encryption_key
+            # the initialization vector is in the first 16 bytes
+            chunks = iter(chunks)
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= 16:
+                    break
+            yield from cbc_decrypt_chunks(chain((head[16:],), chunks), key, head[:16])
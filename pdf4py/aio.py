@@ -0,0 +1,211 @@
+"""
+Defines `AsyncParser` and `AsyncDocument`, that let `asyncio` applications parse documents without
+blocking the event loop: opening a document, parsing objects and decoding streams are run in an
+executor, and awaited. The module needs Python 3.6 or later, as it defines asynchronous generators.
+"""
+import asyncio
+from collections import deque
+from functools import partial
+from ._document import Document
+from .parser import Parser
+from .types import *
+
+# called from a coroutine, get_event_loop returns the running loop on the versions that lack
+# get_running_loop (before 3.7)
+_get_running_loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)
+
+
+
+class AsyncParser:
+    """
+    An awaitable front-end of a thread safe `Parser`. For example,
+
+    ::
+
+        >>> from pdf4py.aio import AsyncParser
+        >>> async with await AsyncParser.open('path/to/file.pdf') as parser:
+        >>>     root = await parser.parse_reference(parser.trailer['Root'])
+        >>>     async for entry, obj in parser.objects(concurrency = 8):
+        >>>         if isinstance(obj, PDFStream):
+        >>>             data = await parser.stream(obj)
+
+    The blocking work is run in `executor`, a `concurrent.futures.ThreadPoolExecutor` (the
+    default executor of the event loop if `None`). Since the parser is shared by the threads of
+    the executor, it must have been created with `thread_safe = True`, as `AsyncParser.open` does.
+
+    Parameters
+    ----------
+    parser : Parser
+        The parser to use.
+
+    executor : concurrent.futures.Executor, optional
+        The executor running the blocking calls.
+    """
+
+    def __init__(self, parser : 'Parser', executor = None):
+        self.parser = parser
+        self.executor = executor
+
+
+    @classmethod
+    async def open(cls, source, password = None, executor = None, **kwargs):
+        """
+        Creates a thread safe `Parser` in `executor` and returns an `AsyncParser` using it. The
+        arguments are the ones of `Parser`.
+        """
+        kwargs["thread_safe"] = True
+        parser = await _get_running_loop().run_in_executor(executor, partial(Parser, source, password, **kwargs))
+        return cls(parser, executor)
+
+
+    @property
+    def xreftable(self):
+        return self.parser.xreftable
+
+
+    @property
+    def trailer(self):
+        return self.parser.trailer
+
+
+    @property
+    def version(self):
+        return self.parser.version
+
+
+    def close(self):
+        """
+        Closes the parser, see `Parser.close`.
+        """
+        self.parser.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    async def run(self, function, *args):
+        """
+        Runs `function(*args)` in the executor and returns its result.
+        """
+        return await _get_running_loop().run_in_executor(self.executor, partial(function, *args))
+
+
+    async def parse_reference(self, reference):
+        """
+        Parses the object `reference` points to, see `Parser.parse_reference`.
+        """
+        return await self.run(self.parser.parse_reference, reference)
+
+
+    async def stream(self, stream : 'PDFStream', max_bytes = None):
+        """
+        Returns the decoded content of `stream`, or its first `max_bytes` bytes, see `PDFStream`.
+        """
+        if max_bytes is None:
+            return await self.run(stream.stream)
+        return await self.run(stream.stream, max_bytes)
+
+
+    async def iter_chunks(self, stream : 'PDFStream', size = 64 * 1024):
+        """
+        Asynchronously yields the decoded content of `stream` in pieces of `size` bytes (the last
+        one may be shorter), each of them decoded in the executor. See `PDFStream.iter_chunks`.
+        """
+        chunks = stream.iter_chunks(size)
+        while True:
+            chunk = await self.run(next, chunks, None)
+            if chunk is None:
+                break
+            yield chunk
+
+
+    async def objects(self, entries = None, concurrency = 4):
+        """
+        Asynchronously yields the pairs `(entry, obj)` of the entries in `entries` (by default,
+        the entries of the XRefTable) and of the objects they point to, in the same order. At most
+        `concurrency` objects are parsed at the same time.
+
+        If parsing an object fails, the exception is raised when its pair would have been yielded.
+        """
+        if concurrency < 1:
+            raise ValueError("'concurrency' must be a positive integer.")
+        entries = iter(self.xreftable if entries is None else entries)
+        loop = _get_running_loop()
+        pending = deque()
+        try:
+            for entry in entries:
+                pending.append((entry, loop.run_in_executor(self.executor, self.parser.parse_reference, entry)))
+                if len(pending) >= concurrency:
+                    entry, future = pending.popleft()
+                    yield entry, await future
+            while pending:
+                entry, future = pending.popleft()
+                yield entry, await future
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+
+class AsyncDocument:
+    """
+    An awaitable front-end of `Document`, created with `AsyncDocument.open`. The attributes
+    `catalog` and `pages` are the ones of the document, while `parser` is an `AsyncParser` over
+    the parser of the document. For example,
+
+    ::
+
+        >>> from pdf4py.aio import AsyncDocument
+        >>> document = await AsyncDocument.open('path/to/file.pdf')
+        >>> contents = await document.parser.parse_reference(document.pages[0]['Contents'])
+
+    Parameters
+    ----------
+    document : Document
+        A document whose parser is thread safe.
+
+    executor : concurrent.futures.Executor, optional
+        The executor running the blocking calls, see `AsyncParser`.
+    """
+
+    def __init__(self, document : 'Document', executor = None):
+        self.document = document
+        self.parser = AsyncParser(document._parser, executor)
+
+
+    @classmethod
+    async def open(cls, source, executor = None, **kwargs):
+        """
+        Creates a `Document` with a thread safe parser in `executor` and returns an
+        `AsyncDocument` using it. Other keyword arguments are passed to `Parser`.
+        """
+        kwargs["thread_safe"] = True
+        document = await _get_running_loop().run_in_executor(executor, partial(Document, source, **kwargs))
+        return cls(document, executor)
+
+
+    @property
+    def catalog(self):
+        return self.document.catalog
+
+
+    @property
+    def pages(self):
+        return self.document.pages
+
+
+    def close(self):
+        self.parser.close()
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,308 @@
+"""
+Defines the size-bounded caches used by `Parser` to keep in memory the objects it has already
+parsed, so that they are not parsed again when requested multiple times, and the folder where
+it can keep the cross-reference tables of the documents it opens, so that they are not read
+again when the same files are opened multiple times.
+"""
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import threading
+from collections import namedtuple, OrderedDict
+
+
+
+CacheStats = namedtuple("CacheStats", ["hits", "misses", "evictions", "entries", "size"])
+"""
+Statistics of a `Cache` instance: the number of lookups that found (`hits`) or did not find
+(`misses`) the key, the number of entries removed to stay within the budget (`evictions`), the
+number of entries held (`entries`) and their total size (`size`).
+"""
+
+
+
+def estimate_size(obj):
+    """
+    Returns an estimate, in bytes, of the memory used by a parsed PDF object, including the
+    objects it contains.
+    """
+    size = 0
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        size += sys.getsizeof(x)
+        if isinstance(x, dict):
+            stack.extend(x.keys())
+            stack.extend(x.values())
+        elif isinstance(x, (list, tuple)):
+            stack.extend(x)
+    return size
+
+
+
+class Cache:
+    """
+    A mapping from keys to values, bounded by the number of entries and/or by the total size
+    of the values.
+
+    When adding an entry exceeds one of the limits, entries are evicted according to `policy`:
+
+    - `"lru"` evicts the least recently used entry, that is the one that has been added or looked
+      up least recently;
+    - `"fifo"` evicts the oldest entry, regardless of how often it is used.
+
+    For example,
+
+    ::
+
+        >>> from pdf4py.cache import Cache
+        >>> cache = Cache(max_entries = 2)
+        >>> cache.put((1, 0), "a")
+        >>> cache.put((2, 0), "b")
+        >>> cache.get((1, 0))
+        'a'
+        >>> cache.put((3, 0), "c")
+        >>> (2, 0) in cache
+        False
+        >>> cache.stats
+        CacheStats(hits=1, misses=0, evictions=1, entries=2, size=2)
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        The maximum number of entries held. `None` means no limit.
+
+    max_bytes : int, optional
+        The maximum total size of the values held, as computed by `sizeof`. `None` means no limit.
+        A value larger than `max_bytes` is not stored at all.
+
+    policy : str
+        The eviction policy, either `"lru"` (the default) or `"fifo"`.
+
+    sizeof : callable, optional
+        The function computing the size of a value. If not given, each value counts as 1 unless
+        `max_bytes` is given, in which case `estimate_size` is used.
+
+    A cache can be shared by several threads, for example by the threads of a thread safe `Parser`.
+    """
+
+    POLICIES = ("lru", "fifo")
+
+
+    def __init__(self, max_entries = None, max_bytes = None, policy = "lru", sizeof = None):
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown cache policy '{}', expected one of {}.".format(policy, self.POLICIES))
+        if max_entries is not None and max_entries < 0 or max_bytes is not None and max_bytes < 0:
+            raise ValueError("Cache limits must not be negative.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        if sizeof is None:
+            sizeof = estimate_size if max_bytes is not None else (lambda value : 1)
+        self.__sizeof = sizeof
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__size = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+
+    @property
+    def stats(self):
+        """
+        A `CacheStats` instance with the current statistics of the cache.
+        """
+        with self.__lock:
+            return CacheStats(self.__hits, self.__misses, self.__evictions, len(self.__entries), self.__size)
+
+
+    def get(self, key, default = None):
+        """
+        Returns the value associated to `key`, or `default` if it is not in the cache.
+        """
+        with self.__lock:
+            try:
+                value, _ = self.__entries[key]
+            except KeyError:
+                self.__misses += 1
+                return default
+            self.__hits += 1
+            if self.policy == "lru":
+                self.__entries.move_to_end(key)
+            return value
+
+
+    def put(self, key, value):
+        """
+        Associates `value` to `key`, evicting other entries if a limit is exceeded.
+        """
+        size = self.__sizeof(value)
+        with self.__lock:
+            self.__discard(key)
+            if self.max_entries == 0 or self.max_bytes is not None and size > self.max_bytes:
+                return
+            self.__entries[key] = (value, size)
+            self.__size += size
+            while self.max_entries is not None and len(self.__entries) > self.max_entries or \
+                    self.max_bytes is not None and self.__size > self.max_bytes:
+                _, (_, evicted_size) = self.__entries.popitem(last = False)
+                self.__size -= evicted_size
+                self.__evictions += 1
+
+
+    def discard(self, key):
+        """
+        Removes the entry associated to `key`, if present.
+        """
+        with self.__lock:
+            self.__discard(key)
+
+
+    def __discard(self, key):
+        entry = self.__entries.pop(key, None)
+        if entry is not None:
+            self.__size -= entry[1]
+
+
+    def clear(self):
+        """
+        Removes all the entries. Statistics are not reset.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+
+
+class IndexCache:
+    """
+    A folder where `Parser` stores the cross-reference table, the trailer and the offsets of the
+    objects in the object streams of the documents it opens, so that opening the same files again
+    takes a few reads instead of parsing all their cross-reference sections. It is used by `Parser`
+    if it is given as `index_cache`, and only for documents opened from a path.
+
+    Each document has its own entry, named after its real path, that records the size, the
+    modification time and a hash of the last `TAIL_SIZE` bytes of the file it has been built from.
+    When they do not match the file anymore, the entry is discarded and built again.
+
+    For example,
+
+    ::
+
+        >>> from pdf4py.cache import IndexCache
+        >>> from pdf4py.parser import Parser
+        >>> index_cache = IndexCache("/tmp/pdf4py-index")
+        >>> parser = Parser("tests/pdfs/0000.pdf", index_cache = index_cache)
+        >>> parser = Parser("tests/pdfs/0000.pdf", index_cache = index_cache)
+        >>> index_cache.hits, index_cache.misses
+        (1, 1)
+
+    Entries are written to a temporary file which is then renamed, so that several processes can
+    share the same folder: they read either the previous entry or the new one, never a partial one.
+
+    Parameters
+    ----------
+    folder : str or path-like
+        The folder holding the entries, created if it does not exist.
+    """
+
+    TAIL_SIZE = 1 << 16
+    # the first bytes of the entries, that change when their format changes
+    MAGIC = b"pdf4py-index-1\n"
+
+
+    def __init__(self, folder):
+        self.folder = os.path.abspath(os.path.expanduser(str(folder)))
+        os.makedirs(self.folder, exist_ok = True)
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+    @staticmethod
+    def signature(size, mtime_ns, tail):
+        """
+        Returns the digest identifying the version of a file of `size` bytes, modified at
+        `mtime_ns` (in nanoseconds), whose last `TAIL_SIZE` bytes are `tail`.
+        """
+        return hashlib.sha256("{} {}\n".format(size, mtime_ns).encode("ascii") + tail).digest()
+
+
+    def entry_path(self, path):
+        """
+        Returns the path of the entry of the document at `path`.
+        """
+        name = hashlib.sha256(os.fsencode(os.path.realpath(path))).hexdigest()
+        return os.path.join(self.folder, name + ".index")
+
+
+    def get(self, path, signature):
+        """
+        Returns the content of the entry of the document at `path`, or None if there is none or
+        if it has been built from another version of the file, whose `signature` is different.
+        In that case the entry is discarded.
+        """
+        entry_path = self.entry_path(path)
+        try:
+            with open(entry_path, "rb") as fp:
+                data = fp.read()
+        except OSError:
+            data = None
+        header = self.MAGIC + signature
+        if data is not None and data.startswith(header):
+            with self.__lock:
+                self.hits += 1
+            return data[len(header):]
+        with self.__lock:
+            self.misses += 1
+        if data is not None:
+            self.__remove(entry_path)
+        return None
+
+
+    def put(self, path, signature, content):
+        """
+        Stores `content` as the entry of the document at `path`, the version of the file being
+        identified by `signature`. Errors are logged and otherwise ignored, as the entry can be
+        built again.
+        """
+        entry_path = self.entry_path(path)
+        try:
+            fd, temp_path = tempfile.mkstemp(suffix = ".tmp", dir = self.folder)
+        except OSError as e:
+            logging.warning("Cannot write the index of '{}': {}".format(path, e))
+            return
+        try:
+            with open(fd, "wb") as fp:
+                fp.write(self.MAGIC + signature)
+                fp.write(content)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            logging.warning("Cannot write the index of '{}': {}".format(path, e))
+            self.__remove(temp_path)
+
+
+    def discard(self, path):
+        """
+        Removes the entry of the document at `path`, if present.
+        """
+        self.__remove(self.entry_path(path))
+
+
+    @staticmethod
+    def __remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,152 @@
+"""
+Defines `walk`, that parses all the objects of a document with a pool of processes, so that
+validating or indexing a large document is not bound to a single core.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .parser import Parser
+from .types import *
+
+
+
+WalkResult = namedtuple("WalkResult", ["results", "errors"])
+"""
+The outcome of `walk`: `results` maps the `(object_number, generation_number)` of each object that
+has been parsed to the value returned by the visitor for it, while `errors` maps the objects that
+could not be parsed (or visited) to the message of the exception raised.
+"""
+
+
+
+def decode_streams(parser : 'Parser', obj):
+    """
+    The default visitor of `walk`: reads and decodes the content of the streams contained in
+    `obj`, without following references, and returns `None`. Errors in stream data are thus
+    reported along with syntax errors.
+    """
+    stack = [obj]
+    while stack:
+        x = stack.pop()
+        if isinstance(x, PDFStream):
+            x.stream()
+            stack.append(x.dictionary)
+        elif isinstance(x, list):
+            stack.extend(x)
+        elif isinstance(x, dict):
+            stack.extend(x.values())
+
+
+
+# the parser of the document being walked, opened once by each worker process
+_worker_parser = None
+
+
+
+def _open_document(path, password):
+    global _worker_parser
+    _worker_parser = Parser(path, password, prefetch_object_streams = True)
+
+
+
+def _walk_objects(keys : 'list', visit):
+    """
+    Parses and visits the objects `keys` with the parser of the worker process.
+    """
+    results, errors = dict(), dict()
+    for key in keys:
+        try:
+            results[key] = visit(_worker_parser, _worker_parser.parse_reference(_worker_parser.xreftable[key]))
+        except Exception as e:
+            errors[key] = "{}: {}".format(type(e).__name__, e)
+    return results, errors
+
+
+
+def _split(groups : 'list', count : 'int'):
+    """
+    Packs the lists of keys in `groups` into about `count` lists of similar length, without
+    splitting any group.
+    """
+    target = max(1, sum(len(x) for x in groups) // max(count, 1))
+    tasks, current = [], []
+    for group in groups:
+        current.extend(group)
+        if len(current) >= target:
+            tasks.append(current)
+            current = []
+    if current:
+        tasks.append(current)
+    return tasks
+
+
+
+def walk(path, visit = decode_streams, password = None, workers = None, tasks_per_worker = 4):
+    """
+    Parses all the objects in use of the document stored in the file at `path`, sharing them
+    among a pool of `workers` processes (by default, one for each CPU).
+
+    Each worker opens the document on its own and parses its share of the objects, then calls
+    `visit(parser, obj)` for each of them. Objects stored in the same object stream are given to
+    the same worker, so that each object stream is decoded once. The parent process merges the
+    values returned by `visit` and the errors into a `WalkResult`. For example,
+
+    ::
+
+        >>> from pdf4py.parallel import walk
+        >>> result = walk('path/to/file.pdf')
+        >>> for key, message in result.errors.items():
+        >>>     print(key, message)
+
+    Parameters
+    ----------
+    path : str or path-like object
+        The path of the PDF document.
+
+    visit : callable
+        A function taking the `Parser` used by the worker and the parsed object, whose return
+        value is sent to the parent process. It must be defined at module level, so that it can
+        be sent to the workers, and return a picklable value. By default `decode_streams` is
+        used, which checks that stream contents can be decoded.
+
+    password : bytes or str, optional
+        The password of the document, if encrypted.
+
+    workers : int, optional
+        The number of worker processes.
+
+    tasks_per_worker : int
+        The objects are split into about `workers * tasks_per_worker` tasks, so that workers that
+        finish early take up a part of the remaining work.
+
+    Returns
+    -------
+    result : WalkResult
+        The values returned by `visit` and the errors, keyed on `(object_number, generation_number)`.
+
+    Raises
+    ------
+    `ValueError` if `path` is not a path. Errors met while opening the document, e.g. a damaged
+    cross reference table, are raised as by `Parser`.
+    """
+    if not(isinstance(path, str) or hasattr(path, "__fspath__")):
+        raise ValueError("The document must be given as the path of a file.")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    with Parser(path, password) as parser:
+        groups = dict()
+        for entry in parser.xreftable:
+            if isinstance(entry, XrefCompressedEntry):
+                groups.setdefault(("objstm", entry.objstm_number), []).append((entry.object_number, 0))
+            else:
+                groups.setdefault(("object", entry.object_number), []).append((entry.object_number, entry.generation_number))
+    # the XRefTable yields each object once, so the groups never share a key
+    key_groups = [sorted(group) for group in groups.values()]
+    results, errors = dict(), dict()
+    with ProcessPoolExecutor(workers, initializer = _open_document, initargs = (path, password)) as executor:
+        futures = [executor.submit(_walk_objects, keys, visit) for keys in _split(key_groups, workers * tasks_per_worker)]
+        for future in futures:
+            task_results, task_errors = future.result()
+            results.update(task_results)
+            errors.update(task_errors)
+    return WalkResult(results, errors)
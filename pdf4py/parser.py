@@ -1,10 +1,92 @@
+import io
 import logging
+import os
+import pickle
+import re
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
 from contextlib import suppress
-from functools import lru_cache, partial
+from functools import partial
+from heapq import merge
+from itertools import islice, repeat
+from operator import lt
 from ._lexer import *
-from ._decoders import decode
+from .cache import Cache, IndexCache
+from ._decoders import decode, iter_decode
 from ._security.securityhandler import StandardSecurityHandler
-from .exceptions import PDFSyntaxError, PDFUnsupportedError
+from .exceptions import PDFLexicalError, PDFSyntaxError, PDFUnsupportedError
+
+
+# kinds of the frames used by SequentialParser.parse_object
+_ARRAY, _DICTIONARY, _INDIRECT_OBJECT = "array", "dictionary", "indirect object"
+
+# marks that the object being parsed by SequentialParser.parse_object is not complete yet
+_PENDING = object()
+
+# returned by the object cache of Parser for objects that are not in it
+_NOT_CACHED = object()
+
+# searched in the whole file when the cross-reference table is rebuilt. Object headers are
+# searched in the reversed input, so that the pattern starts with a literal
+_REVERSED_OBJECT_HEADER = re.compile(rb"jbo[\x00\t\n\x0c\r ]+([0-9]{1,5})[\x00\t\n\x0c\r ]+([0-9]{1,10})(?![0-9])")
+_REGULAR_BYTES = frozenset(set(range(256)) - set(b"\x00\t\n\x0c\r ()<>[]{}/%"))
+_TRAILER = re.compile(rb"trailer[\x00\t\n\x0c\r ]*<<")
+_XREF_STREAM_TYPE = re.compile(rb"/Type[\x00\t\n\x0c\r ]*/XRef(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+_CATALOG_TYPE = re.compile(rb"/Type[\x00\t\n\x0c\r ]*/Catalog(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+# size of the blocks the input is scanned and read in when the table is rebuilt
+_RECONSTRUCTION_BLOCK_SIZE = 1 << 24
+
+# searched in the first bytes of the file for the linearization dictionary, and the first-page
+# cross-reference section that follows it
+_FIRST_OBJECT_HEADER = re.compile(rb"[0-9]+[\x00\t\n\x0c\r ]+[0-9]+[\x00\t\n\x0c\r ]+obj")
+_END_OF_OBJECT = re.compile(rb"endobj[\x00\t\n\x0c\r ]*")
+
+
+
+def _find_object_headers(data):
+    """
+    Returns the positions, the object numbers and the generation numbers of the object headers
+    (`N G obj`) found in `data`, in order of position.
+
+    The input is scanned backwards, in reversed blocks of 16 MiB, with a pattern that starts with
+    the reversed `obj` keyword, so that the regular expression engine can skip to the candidates
+    as it does when searching a literal. A header belongs to the block its keyword starts in.
+    """
+    positions, numbers, generations = [], [], []
+    end = len(data)
+    while end > 0:
+        start = max(0, end - _RECONSTRUCTION_BLOCK_SIZE)
+        low, high = max(0, start - 64), min(len(data), end + 4)
+        block = data[low:high][::-1]
+        for m in _REVERSED_OBJECT_HEADER.finditer(block):
+            keyword = high - m.start() - 3
+            if not start <= keyword < end or (m.start() > 0 and block[m.start() - 1] in _REGULAR_BYTES):
+                continue
+            positions.append(high - m.end())
+            generation, number = m.groups()
+            numbers.append(int(number[::-1]))
+            generations.append(int(generation[::-1]))
+        end = start
+    positions.reverse()
+    numbers.reverse()
+    generations.reverse()
+    return positions, numbers, generations
+
+
+
+def _entry_key(entry):
+    """
+    Returns the `(seq, gen)` key of a cross-reference table entry, or of a free object.
+    """
+    t = type(entry)
+    if t is XrefInUseEntry:
+        return entry[1], entry[2]
+    if t is XrefCompressedEntry:
+        return entry[0], 0
+    return entry
 
 
 
@@ -33,6 +115,15 @@ class XRefTable:
       representing the sequence and generation numbers. This is because it implements the __getitem__ 
       method that is used by the parser to look up objects if required during the parsing process.
 
+    Each instance holds a section of the table, and the section of the previous revision of the
+    document is in `previous`. Lookups and iterations do not walk this chain: they use an index
+    that merges all the sections, the newest ones winning, and that is built by `build_index`.
+    The index of the latest section is built when the document is opened, the ones of the previous
+    revisions only if they are used.
+
+    `previous` can also be a callable returning the previous section, that is called the first
+    time an entry is not found in the sections loaded so far, or when all the entries are needed.
+    It is used by `Parser` to load the sections of linearized documents after the first page.
     """
     def __init__(self, previous : 'XRefTable', inuse_objects : 'dict', free_objects : 'set',
             compressed_objects : 'dict' = None):
@@ -40,6 +131,12 @@ class XRefTable:
         self.__free_objects = free_objects
         self.__compressed_objects = {} if compressed_objects is None else compressed_objects
         self.__previous = previous
+        # the latest entry of each object number ((seq, gen) tuples for free objects), and the
+        # entries superseded by an entry with another generation number (None for free objects)
+        self.__latest = None
+        self.__superseded = None
+        # the oldest section in the index, if the sections before it have not been loaded yet
+        self.__pending = None
         
 
     @property
@@ -48,9 +145,58 @@ class XRefTable:
         Points to the `XRefTable` instance that is associated to the `/Prev` key in the trailer
         dictionary of the current cross-reference table.
         """
+        if callable(self.__previous):
+            self.__previous = self.__previous()
         return self.__previous
 
 
+    def build_index(self):
+        """
+        Builds the index used by lookups and iterations, merging this section with the previous
+        ones. It is built by the first lookup or iteration if this method is not called.
+        """
+        if self.__latest is None:
+            self.__build_index()
+
+
+    def __load_pending(self):
+        """
+        Loads the sections that are not in the index yet, if any, and builds the index again.
+        Returns False if all the sections were already in the index.
+        """
+        if self.__pending is None:
+            return False
+        # the property loads the previous sections
+        self.__pending.previous
+        self.__build_index()
+        return True
+
+
+    def __build_index(self):
+        sections = []
+        table = self
+        while isinstance(table, XRefTable):
+            sections.append(table)
+            table = table.__previous
+        pending = sections[-1] if table is not None else None
+        latest = dict()
+        superseded = dict()
+        for table in reversed(sections):
+            # in use entries win over compressed and free ones in the same section
+            for entries in (table.__free_objects, table.__compressed_objects.values(), table.__inuse_objects.values()):
+                for entry in entries:
+                    key = _entry_key(entry)
+                    old = latest.get(key[0])
+                    if old is not None:
+                        old_key = _entry_key(old)
+                        if old_key != key:
+                            superseded[old_key] = None if type(old) is tuple else old
+                    latest[key[0]] = entry
+        self.__pending = pending
+        self.__superseded = superseded
+        self.__latest = latest
+
+
     def __getitem__(self, key : 'tuple'):
         """
         Returns a cross-reference table entry corresponding to the sequence and generation numbers
@@ -76,18 +222,18 @@ class XRefTable:
         ------
         `KeyError` if no entry corresponds to the given key.
         """
-        v = self.__inuse_objects.get(key)
-        if v is not None:
-            return v
-        v = self.__compressed_objects.get(key)
-        if v is not None:
-            return v
-        if key in self.__free_objects:
-            return None
-        if self.__previous is None:
-            raise KeyError("Key not found: " + str(key))
-        else:
-            return self.__previous[key]
+        if self.__latest is None:
+            self.build_index()
+        entry = self.__latest.get(key[0])
+        if entry is not None and _entry_key(entry) == key:
+            return None if type(entry) is tuple else entry
+        try:
+            return self.__superseded[key]
+        except KeyError:
+            pass
+        if self.__load_pending():
+            return self[key]
+        raise KeyError("Key not found: " + str(key))
     
     
     def __iter__(self):
@@ -95,17 +241,13 @@ class XRefTable:
         Returns
         -------
         gen : generator
-            a generator over the in use entries.
+            a generator over the in use entries, yielding the latest entry of each object that
+            has not been freed.
         """ 
-        def gen():
-            if self.previous is not None:
-                for item in iter(self.previous):
-                    if isinstance(item, XrefInUseEntry) and (item[1], item[2]) in self.__free_objects:
-                        pass
-                    yield item
-            yield from self.__inuse_objects.values()
-            yield from self.__compressed_objects.values()
-        return gen()
+        if self.__latest is None:
+            self.build_index()
+        self.__load_pending()
+        return (x for x in self.__latest.values() if type(x) is not tuple)
 
     
     def __support_str_(self):
@@ -126,8 +268,8 @@ class XRefTable:
         resulting_string = "Section\nIn use objects:\n{}\nFree objects:\n{}\nCompressed objects:\n{}".format(
             inuse_objs, free_objs, compressed_objs)
         
-        if self.__previous is not None:
-            prev_string = self.__previous.__support_str_()
+        if self.previous is not None:
+            prev_string = self.previous.__support_str_()
             return prev_string + "\n" + resulting_string
         else:
             return resulting_string
@@ -139,6 +281,324 @@ class XRefTable:
 
 
 
+# kinds of the entries stored by CompactXRefTable
+_IN_USE, _COMPRESSED, _FREE = 1, 2, 3
+
+# maps the types of the entries of cross-reference streams to kinds, unknown types are kept as
+# compressed entries
+_XREF_STREAM_KINDS = bytes([_FREE, _IN_USE] + [_COMPRESSED] * 254)
+
+
+
+def _xref_stream_column(data, offset, width, row_size, count):
+    """
+    Returns an `array('q')` with the big-endian unsigned integers of `width` bytes that start at
+    `offset` in the first `count` rows of `row_size` bytes of `data`.
+
+    The bytes of the field are copied with extended slices into 8 bytes cells, so that the
+    integers are decoded in bulk instead of one at a time.
+    """
+    cells = bytearray(8 * count)
+    end = row_size * count
+    # at most 8 bytes are kept, the leading ones of wider fields are expected to be 0
+    for i in range(max(0, width - 8), width):
+        cells[8 - width + i::8] = data[offset + i:end:row_size]
+    column = array("q")
+    column.frombytes(cells)
+    if sys.byteorder == "little":
+        column.byteswap()
+    return column
+
+
+
+# maps the markers of the records of classic cross-reference tables to kinds
+_XREF_TABLE_KINDS = bytes.maketrans(b"nf", bytes([_IN_USE, _FREE]))
+
+
+
+def _parse_xref_records(records, count):
+    """
+    Parses `count` records of a classic cross-reference table, that take exactly 20 bytes each
+    (`nnnnnnnnnn ggggg n` followed by a two bytes end of line), by position.
+
+    Returns the kinds, the offsets and the generation numbers of the entries as arrays, or
+    None if the records do not have the fixed format.
+    """
+    if len(records) != 20 * count:
+        return None
+    spaces = b" " * count
+    markers = records[17::20]
+    if records[10::20] != spaces or records[16::20] != spaces or markers.translate(None, b"nf") \
+            or records[18::20].translate(None, b" \r") or records[19::20].translate(None, b"\r\n"):
+        return None
+    fields = records.split()
+    if len(fields) != 3 * count:
+        return None
+    try:
+        offsets = array("q", map(int, fields[0::3]))
+        generations = array("q", map(int, fields[1::3]))
+    except ValueError:
+        return None
+    kinds = markers.translate(_XREF_TABLE_KINDS)
+    # free objects keep the generation number they had when they were in use
+    i = kinds.find(_FREE)
+    while i >= 0:
+        generations[i] -= 1
+        i = kinds.find(_FREE, i + 1)
+    return array("B", kinds), offsets, generations
+
+
+
+class _XRefColumns:
+    """
+    The entries of a cross-reference section, in the order they are read, stored in columns: the
+    object number, the kind of the entry and two fields, that are the offset and the generation
+    number of in use and free objects, and the number of the object stream and the index in it
+    of compressed objects (-1 if unknown). The object numbers may be a `range` if they are
+    contiguous.
+    """
+
+    def __init__(self, numbers = None, kinds = None, fields1 = None, fields2 = None):
+        self.numbers = range(0) if numbers is None else numbers
+        self.kinds = array("B") if kinds is None else kinds
+        self.fields1 = array("q") if fields1 is None else fields1
+        self.fields2 = array("q") if fields2 is None else fields2
+
+
+    def append(self, number, kind, field1, field2):
+        if isinstance(self.numbers, range):
+            self.numbers = array("q", self.numbers)
+        self.numbers.append(number)
+        self.kinds.append(kind)
+        self.fields1.append(field1)
+        self.fields2.append(field2)
+
+
+    def extend(self, numbers, kinds, fields1, fields2):
+        if isinstance(self.numbers, range) and isinstance(numbers, range) and \
+                (not self.numbers or not numbers or self.numbers.stop == numbers.start):
+            self.numbers = range(self.numbers.start if self.numbers else numbers.start,
+                numbers.stop if numbers else self.numbers.stop)
+        else:
+            if isinstance(self.numbers, range):
+                self.numbers = array("q", self.numbers)
+            self.numbers.extend(numbers)
+        self.kinds.extend(kinds)
+        self.fields1.extend(fields1)
+        self.fields2.extend(fields2)
+
+
+    def to_dicts(self):
+        """
+        Returns the in use entries, the free entries and the compressed entries, as they are
+        given to `XRefTable`.
+        """
+        inuse_objects = dict()
+        free_objects = set()
+        compressed_objects = dict()
+        for number, kind, field1, field2 in zip(self.numbers, self.kinds, self.fields1, self.fields2):
+            if kind == _IN_USE:
+                inuse_objects[(number, field2)] = XrefInUseEntry(field1, number, field2)
+            elif kind == _COMPRESSED:
+                compressed_objects[(number, 0)] = XrefCompressedEntry(number, field1, None if field2 < 0 else field2)
+            elif kind == _FREE:
+                free_objects.add((number, field2))
+        return inuse_objects, free_objects, compressed_objects
+
+
+
+def _compact_entry(kind, number, field1, field2):
+    """
+    Returns the entry of an object in use or compressed stored by `CompactXRefTable`.
+    """
+    if kind == _IN_USE:
+        return XrefInUseEntry(field1, number, field2)
+    return XrefCompressedEntry(number, field1, None if field2 < 0 else field2)
+
+
+
+class CompactXRefTable:
+    """
+    A cross-reference table with the same interface of `XRefTable`, that stores its entries in
+    arrays of machine integers instead of keeping a Python object for each of them: the entries
+    are created when they are looked up or iterated. It uses about 25 bytes per object, a fraction
+    of the memory needed by `XRefTable`, so that documents with millions of objects can be
+    opened quickly. It is used by `Parser` if `compact_xref` is `True`.
+
+    As in `XRefTable`, lookups and iterations use an index that merges the sections of all the
+    revisions, built by `build_index`. The index is stored as a section itself, unless there is
+    only one section: its entries are sorted by object number and looked up with a binary
+    search, or by position if the object numbers are contiguous. Entries in use are iterated in
+    order of object number, followed by the compressed ones. As in `XRefTable`, `previous` can be
+    a callable loading the previous section when it is needed.
+    """
+    def __init__(self, previous : 'CompactXRefTable', columns : '_XRefColumns'):
+        self.__previous = previous
+        numbers = columns.numbers
+        order = range(len(numbers))
+        if not isinstance(numbers, range) and not all(map(lt, numbers, islice(numbers, 1, None))):
+            # entries that come later in the section replace the ones with the same number
+            last = {n : i for i, n in enumerate(numbers)}
+            order = sorted(last.values(), key = numbers.__getitem__)
+            columns_list = (columns.numbers, columns.kinds, columns.fields1, columns.fields2)
+            numbers, kinds, fields1, fields2 = (array(c.typecode, (c[i] for i in order)) for c in columns_list)
+        else:
+            kinds, fields1, fields2 = columns.kinds, columns.fields1, columns.fields2
+        self.__first = numbers[0] if numbers else 0
+        # the numbers are not needed if they are contiguous
+        self.__numbers = None if not numbers or numbers[-1] - numbers[0] == len(numbers) - 1 else numbers
+        self.__kinds = kinds
+        self.__fields1 = fields1
+        self.__fields2 = fields2
+        # the section holding the merged index, and the entries superseded by an entry with another
+        # generation number (see XRefTable)
+        self.__index = None
+        self.__superseded = None
+        # the oldest section in the index, if the sections before it have not been loaded yet
+        self.__pending = None
+
+
+    @property
+    def previous(self):
+        """
+        Points to the `CompactXRefTable` instance that is associated to the `/Prev` key in the
+        trailer dictionary of the current cross-reference table.
+        """
+        if callable(self.__previous):
+            self.__previous = self.__previous()
+        return self.__previous
+
+
+    def build_index(self):
+        """
+        Builds the index used by lookups and iterations, merging this section with the previous
+        ones. It is built by the first lookup or iteration if this method is not called.
+        """
+        if self.__index is None:
+            self.__build_index()
+
+
+    def __load_pending(self):
+        """
+        Loads the sections that are not in the index yet, if any, and builds the index again.
+        Returns False if all the sections were already in the index.
+        """
+        if self.__pending is None:
+            return False
+        # the property loads the previous sections
+        self.__pending.previous
+        self.__build_index()
+        return True
+
+
+    def __build_index(self):
+        sections = []
+        table = self
+        while isinstance(table, CompactXRefTable):
+            sections.append(table)
+            table = table.__previous
+        pending = sections[-1] if table is not None else None
+        if len(sections) == 1:
+            self.__pending = pending
+            self.__superseded = dict()
+            self.__index = self
+            return
+        def rows(age, table):
+            numbers = table.__numbers or range(table.__first, table.__first + len(table.__kinds))
+            return zip(numbers, repeat(age), table.__kinds, table.__fields1, table.__fields2)
+        # the rows of an object come from the newest section to the oldest one
+        columns = _XRefColumns()
+        superseded = dict()
+        last = None
+        for number, _, kind, field1, field2 in merge(*(rows(age, table) for age, table in enumerate(sections))):
+            generation = 0 if kind == _COMPRESSED else field2
+            if number != last:
+                last, last_generation = number, generation
+                columns.append(number, kind, field1, field2)
+            elif generation != last_generation and (number, generation) not in superseded:
+                superseded[number, generation] = None if kind == _FREE else _compact_entry(kind, number, field1, field2)
+        self.__pending = pending
+        self.__superseded = superseded
+        self.__index = CompactXRefTable(None, columns)
+
+
+    def __position(self, number):
+        """
+        Returns the position of the entry of object `number` in the columns, or -1.
+        """
+        if self.__numbers is None:
+            i = number - self.__first
+            return i if 0 <= i < len(self.__kinds) else -1
+        i = bisect_left(self.__numbers, number)
+        return i if i < len(self.__numbers) and self.__numbers[i] == number else -1
+
+
+    def __entry(self, i, number):
+        return _compact_entry(self.__kinds[i], number, self.__fields1[i], self.__fields2[i])
+
+
+    def __getitem__(self, key : 'tuple'):
+        """
+        Returns the entry of the object `key = (seq, gen)`, or None if it has been freed. See
+        `XRefTable.__getitem__`.
+        """
+        if self.__index is None:
+            self.build_index()
+        index = self.__index
+        number, generation = key
+        i = index.__position(number)
+        if i >= 0:
+            kind = index.__kinds[i]
+            if generation == (0 if kind == _COMPRESSED else index.__fields2[i]):
+                return None if kind == _FREE else index.__entry(i, number)
+        try:
+            return self.__superseded[key]
+        except KeyError:
+            pass
+        if self.__load_pending():
+            return self[key]
+        raise KeyError("Key not found: " + str(key))
+
+
+    def __iter__(self):
+        """
+        Returns
+        -------
+        gen : generator
+            a generator over the in use entries, yielding the latest entry of each object that
+            has not been freed.
+        """
+        if self.__index is None:
+            self.build_index()
+        self.__load_pending()
+        index = self.__index
+        def gen():
+            numbers = index.__numbers or range(index.__first, index.__first + len(index.__kinds))
+            for kind in (_IN_USE, _COMPRESSED):
+                for i, k in enumerate(index.__kinds):
+                    if k == kind:
+                        yield index.__entry(i, numbers[i])
+        return gen()
+
+
+    def __str__(self):
+        numbers = self.__numbers or range(self.__first, self.__first + len(self.__kinds))
+        lines = {_IN_USE : [], _FREE : [], _COMPRESSED : []}
+        for i, kind in enumerate(self.__kinds):
+            if kind == _IN_USE:
+                lines[kind].append("{:10} {:5} {:10} n".format(numbers[i], self.__fields2[i], self.__fields1[i]))
+            elif kind == _FREE:
+                lines[kind].append("{:10} {:5} f".format(numbers[i], self.__fields2[i] + 1))
+            elif kind == _COMPRESSED:
+                lines[kind].append("{} {}".format(numbers[i], self.__fields1[i]))
+        resulting_string = "Section\nIn use objects:\n{}\nFree objects:\n{}\nCompressed objects:\n{}".format(
+            "\n".join(lines[_IN_USE]), "\n".join(lines[_FREE]), "\n".join(lines[_COMPRESSED]))
+        if self.previous is not None:
+            return str(self.previous) + "\n" + resulting_string
+        return resulting_string
+
+
+
 class SequentialParser:
     """
     Implements a parser that is able to parse a PDF objects by scanning the input bytes sequence.
@@ -151,10 +611,10 @@ class SequentialParser:
     reference pointing at the Integer holding the length of a stream). However, this class is
     used in defining the more powerful `Parser`.
 
-    The constructor that must be used by users takes a positional argument, `source`, being
-    the source bytes stream. It can by a `byte`, `bytearray` or a file pointer opened in
-    binary mode. Other keyword arguments are used internally in pdf4y, specifically by 
-    the `Parser` class.
+    The constructor that must be used by users takes a positional argument, `source`, being the
+    source bytes stream. It can by a `byte`, `bytearray`, `mmap.mmap`, a file-like object opened in
+    binary mode or a `Lexer` (e.g. a cursor over the source of another parser). Other keyword
+    arguments are used internally in pdf4y, specifically by the `Parser` class.
     """
 
 
@@ -166,7 +626,7 @@ class SequentialParser:
         lexer must be set to the fist unprocessed lexeme in the input.
         """
         # read the header
-        self._lexer = Lexer(source)
+        self._lexer = source if isinstance(source, Lexer) else Lexer(source)
         self._stream_reader = kwargs.get('stream_reader', None)
         self._security_handler = None
         self.__ended = False
@@ -178,6 +638,14 @@ class SequentialParser:
             self.__ended = True
         
 
+    def _restart(self):
+        """
+        Allows parsing again after the end of the input has been reached, once the Lexer has been
+        moved to a new position.
+        """
+        self.__ended = False
+
+
     def _raise_syntax_error(self, msg : 'str'):
         """
         Raises an exception with a message containing the string `msg` accompanied with
@@ -217,136 +685,195 @@ class SequentialParser:
         obj : one of the PDF types defined in module `types`
             The parsed PDF object.
         """
-        if self.__ended:
-            raise StopIteration()
+        # Arrays, dictionaries and indirect objects being parsed are kept in an explicit stack
+        # of frames `[kind, container, key]` instead of recursing, so that the nesting depth is
+        # limited only by the available memory.
+        lexer = self._lexer
+        stack = []
+        while True:
+            if self.__ended:
+                raise StopIteration()
+            lexeme = lexer.current_lexeme
 
-        if isinstance(self._lexer.current_lexeme, PDFSingleton) and self._lexer.current_lexeme.value == OPEN_SQUARE_BRACKET:
-            # it is a list of objects
-            next(self._lexer)
-            L = list()
+            if isinstance(lexeme, PDFSingleton) and lexeme.value == OPEN_SQUARE_BRACKET:
+                # it is a list of objects
+                next(lexer)
+                stack.append([_ARRAY, list(), None])
+                obj = _PENDING
+
+            elif isinstance(lexeme, PDFDictDelimiter) and lexeme.value == b"<<":
+                next(lexer)
+                stack.append([_DICTIONARY, dict(), None])
+                obj = _PENDING
+
+            elif lexeme is None or isinstance(lexeme, (PDFHexString, PDFLiteralString, bool, float, str)):
+                obj = lexeme
+                try:
+                    next(lexer)
+                except StopIteration:
+                    self.__ended = True
+                if isinstance(obj, (PDFHexString, PDFLiteralString)) and obj_num is not None and self._security_handler is not None:
+                    obj = obj.__class__(self._security_handler.decrypt_string(obj.value, obj_num))
+
+            elif isinstance(lexeme, int):
+                obj = self.__parse_number_or_reference(stack)
+
+            elif isinstance(lexeme, PDFOperator) and self.__content_stream_mode:
+                obj = lexeme
+                try:
+                    next(lexer)
+                except StopIteration:
+                    self.__ended = True
+
+            else:
+                # if the execution arrived here, it means that there is a syntax error.
+                raise self._raise_syntax_error("Unexpected lexeme encountered ({}).".format(lexeme))
+
+            # store the parsed object in its container, and close the containers that end here
             while True:
-                if isinstance(self._lexer.current_lexeme, PDFSingleton) and self._lexer.current_lexeme.value == CLOSE_SQUARE_BRACKET:
+                if obj is _PENDING:
+                    # the frame on top of the stack is waiting for its next element
+                    frame = stack[-1]
+                    lexeme = lexer.current_lexeme
+                    if frame[0] is _ARRAY:
+                        if isinstance(lexeme, PDFSingleton) and lexeme.value == CLOSE_SQUARE_BRACKET:
+                            # we have successfully parsed a list
+                            # remove CLOSE_SQUARE_BRACKET token stream from stream
+                            stack.pop()
+                            obj = frame[1]
+                            try:
+                                next(lexer)
+                            except StopIteration:
+                                self.__ended = True
+                            continue
+                    elif frame[0] is _DICTIONARY:
+                        if isinstance(lexeme, PDFDictDelimiter) and lexeme.value == b">>":
+                            stack.pop()
+                            obj = self.__end_dictionary(frame[1], obj_num)
+                            continue
+                        elif not isinstance(lexeme, str):
+                            self._raise_syntax_error("Expecting dictionary key, '{}' found instead.".format(lexeme))
+                        # now get the value
+                        frame[2] = lexeme
+                        next(lexer)
                     break
-                L.append(self.parse_object(obj_num))
-            # we have successfully parsed a list
-            # remove CLOSE_SQUARE_BRACKET token stream from stream
-            try:
-                next(self._lexer)
-            except StopIteration:
-                self.__ended = True
-            return L
-        
-        elif isinstance(self._lexer.current_lexeme, PDFDictDelimiter) and self._lexer.current_lexeme.value == b"<<":
+
+                if not stack:
+                    return obj
+                frame = stack[-1]
+                if frame[0] is _ARRAY:
+                    frame[1].append(obj)
+                elif frame[0] is _DICTIONARY:
+                    frame[1][frame[2]] = obj
+                else:
+                    # the value of an indirect object has been parsed
+                    stack.pop()
+                    if not isinstance(lexer.current_lexeme, PDFKeyword) or lexer.current_lexeme.value != b"endobj":
+                        self._raise_syntax_error("Expecting matching 'endobj' for 'obj', but not found.")
+                    try:
+                        next(lexer)
+                    except StopIteration:
+                        self.__ended = True
+                    obj = PDFIndirectObject(frame[1], frame[2], obj)
+                    continue
+                obj = _PENDING
+
+
+    def __end_dictionary(self, D : 'dict', obj_num : 'tuple'):
+        """
+        Called when the `>>` delimiter closing the dictionary `D` is the current lexeme. If the
+        dictionary is followed by the `stream` keyword, the associated stream is parsed as well.
+
+        Returns
+        -------
+        obj : dict or PDFStream
+            The parsed dictionary, or the stream it describes.
+        """
+        try:
             next(self._lexer)
-            D = dict()
-            # now process key - value pairs
-            while True:
-                # get the key
-                keyToken = self._lexer.current_lexeme
-                if isinstance(keyToken, PDFDictDelimiter) and keyToken.value == b">>":
-                    break
-                elif not isinstance(keyToken, str):
-                    self._raise_syntax_error("Expecting dictionary key, '{}' found instead.".format(keyToken))
-                
-                # now get the value
-                next(self._lexer)
-                keyValue = self.parse_object(obj_num)    
-                D[keyToken] = keyValue
-            
-            try:
-                nextLexeme = next(self._lexer)
-            except StopIteration:
-                self.__ended = True
-                return D
-            
-            if not isinstance(self._lexer.current_lexeme, PDFStreamReader):
-                return D
-        
-            if self._stream_reader is None:
-                raise Exception("Cannot parse a stream with BasicParser without providing a stream_reader callable.")
+        except StopIteration:
+            self.__ended = True
+            return D
         
-            # now we can provide this info to reader
-            bytesReader = self._lexer.current_lexeme.value
-            length, reader = self._stream_reader(D, bytesReader, obj_num)
-
-            # and move the header to the endstream position
-            currentLexeme = self._lexer.move_at_position(self._lexer.source.tell() + length)
-            if not isinstance(currentLexeme, PDFKeyword) or currentLexeme.value != b"endstream": 
-                self._raise_syntax_error("'stream' not matched with an 'endstream' keyword.")
-            next(self._lexer)
-            return PDFStream(D, reader)
-  
-        elif self._lexer.current_lexeme is None:
-            try:
-                next(self._lexer)
-            except StopIteration:
-                self.__ended = True
-            return None
+        if not isinstance(self._lexer.current_lexeme, PDFStreamReader):
+            return D
     
-        elif isinstance(self._lexer.current_lexeme, (PDFHexString, PDFLiteralString, bool, float, str)):
-            s = self._lexer.current_lexeme
-            try:
-                next(self._lexer)
-            except StopIteration:
-                self.__ended = True
+        if self._stream_reader is None:
+            raise Exception("Cannot parse a stream with BasicParser without providing a stream_reader callable.")
+    
+        # now we can provide this info to reader
+        bytesReader = self._lexer.current_lexeme.value
+        length, reader = self._stream_reader(D, bytesReader, obj_num)
 
-            if isinstance(s, (PDFHexString, PDFLiteralString)) and obj_num is not None and self._security_handler is not None:
-                s = s.__class__(self._security_handler.decrypt_string(s.value, obj_num))
-                
-            return s
+        # and move the header to the endstream position
+        currentLexeme = self._lexer.move_at_position(self._lexer.tell() + length)
+        if not isinstance(currentLexeme, PDFKeyword) or currentLexeme.value != b"endstream": 
+            self._raise_syntax_error("'stream' not matched with an 'endstream' keyword.")
+        next(self._lexer)
+        return PDFStream(D, reader)
 
-        elif isinstance(self._lexer.current_lexeme, int):
-            # Here we can parse a single number or a reference to an indirect object
-            lex1 = self._lexer.current_lexeme
-            
-            try:
-                lex2 = next(self._lexer)
-            except StopIteration:
-                self.__ended = True
-                return lex1
 
-            if not isinstance(lex2, int):
-                return lex1
-            
+    def __parse_number_or_reference(self, stack : 'list'):
+        """
+        Called when the current lexeme is an integer, that can be a number on its own, or the
+        first lexeme of a reference or of an indirect object.
+
+        Returns
+        -------
+        obj : int or PDFReference
+            The parsed object. If it is an indirect object, a frame for it is pushed on `stack`
+            and `_PENDING` is returned, as its value must be parsed yet.
+        """
+        lex1 = self._lexer.current_lexeme
+        
+        try:
+            lex2 = next(self._lexer)
+        except StopIteration:
+            self.__ended = True
+            return lex1
+
+        if not isinstance(lex2, int):
+            return lex1
+        
+        try:
+            lex3 = next(self._lexer)
+        except StopIteration:
+            self.__ended = True
+            return lex1
+    
+        if isinstance(lex3, PDFOperator) and lex3.value == "R":
             try:
-                lex3 = next(self._lexer)
+                next(self._lexer)
             except StopIteration:
                 self.__ended = True
-                return lex1
+            return PDFReference(lex1, lex2)
         
-            if isinstance(lex3, PDFOperator) and lex3.value == "R":
-                try:
-                    next(self._lexer)
-                except StopIteration:
-                    self.__ended = True
-                return PDFReference(lex1, lex2)
-            
-            elif isinstance(lex3, PDFKeyword) and lex3.value == b"obj":
-                next(self._lexer)
-                o = self.parse_object(obj_num)
-                if not isinstance(self._lexer.current_lexeme, PDFKeyword) or self._lexer.current_lexeme.value != b"endobj":
-                    self._raise_syntax_error("Expecting matching 'endobj' for 'obj', but not found.")
-                try:
-                    next(self._lexer)
-                except StopIteration:
-                    self.__ended = True
-                return PDFIndirectObject(lex1, lex2, o)
-            
-            else:
-                # it was just a integer number, undo the last next() call and return it
-                self._lexer.undo_next(lex2)
-                return lex1
+        elif isinstance(lex3, PDFKeyword) and lex3.value == b"obj":
+            next(self._lexer)
+            stack.append([_INDIRECT_OBJECT, lex1, lex2])
+            return _PENDING
         
-        elif isinstance(self._lexer.current_lexeme, PDFOperator) and self.__content_stream_mode:
-                val = self._lexer.current_lexeme
-                try:
-                    next(self._lexer)
-                except StopIteration:
-                    self.__ended = True
-                return val
+        else:
+            # it was just a integer number, undo the last next() call and return it
+            self._lexer.undo_next(lex2)
+            return lex1
+
+
+
+class _IndexUnpickler(pickle.Unpickler):
+    """
+    Loads the entries of an `IndexCache`, refusing the globals other than the types they are made
+    of, so that a tampered entry cannot run arbitrary code.
+    """
+    ALLOWED = {(x.__module__, x.__qualname__) for x in (XRefTable, CompactXRefTable, XrefInUseEntry,
+        XrefCompressedEntry, PDFReference, PDFLiteralString, PDFHexString, array, range)} | \
+        {("array", "_array_reconstructor")}
 
-        # if the execution arrived here, it means that there is a syntax error.
-        raise self._raise_syntax_error("Unexpected lexeme encountered ({}).".format(self._lexer.current_lexeme))
+
+    def find_class(self, module, name):
+        if (module, name) not in self.ALLOWED:
+            raise pickle.UnpicklingError("'{}.{}' is not allowed in an index.".format(module, name))
+        return super().find_class(module, name)
 
 
 
@@ -354,18 +881,67 @@ class Parser:
     """
     Parse a PDF document to retrieve PDF objects composing it.
 
-    The constructor takes as argument an object `source`, the sequence of bytes the PDF document 
-    is encoded into. It can be of type `bytes`, `bytearray` or file pointer opened for reading
-    in binary mode. Optionally, the second argument is the password to be provided if the document
-    is protected through encryption (if encrypted with AESV3, the password is of type `str`, else `bytes`).
-    For example,
+    The constructor takes as argument an object `source`, the sequence of bytes the PDF document is
+    encoded into. It can be of type `bytes`, `bytearray`, `mmap.mmap`, a file pointer opened for
+    reading in binary mode or the path of the file. Files are memory-mapped rather than read into
+    memory, so that large documents do not fill the heap and the pages of the same file are shared
+    by all the processes that open it. Any other file-like object supporting `readinto`, `seek` and
+    `tell` (e.g. `io.BytesIO`) is read in blocks, as needed. Optionally, the second argument is the
+    password to be provided if the document is protected through encryption (if encrypted with
+    AESV3, the password is of type `str`, else `bytes`). For example,
 
     ::
 
         >>> from pdf4py.parser import Parser
         >>> with open('path/to/file.pdf', 'rb') as fp:
         >>>     parser = Parser(fp)
+        >>> with Parser('path/to/file.pdf') as parser:
+        >>>     root = parser.parse_reference(parser.trailer['Root'])
     
+    The mapping created over a file is released by `Parser.close`, which is called automatically
+    when the parser is used as a context manager.
+
+    The `startxref` keyword, which locates the Cross Reference Table, is searched in the last
+    kilobyte of the file. If it is not there, because the file ends with padding or other data,
+    the rest of the file is searched backwards, up to `startxref_search_limit` bytes from the end
+    (the whole file if `None`). Setting `startxref_search_limit` to 0 disables this fallback.
+
+    Objects stored in object streams can be parsed all at once with `Parser.load_object_stream`.
+    If `prefetch_object_streams` is `True`, this is done the first time an object of each object
+    stream is requested, which is convenient when most of the objects of the document are going
+    to be read.
+
+    Parsed objects are kept in `object_cache`, an instance of `pdf4py.cache.Cache` keyed on
+    `(object_number, generation_number)`, so that objects requested again are not parsed again.
+    A cache with a different budget or eviction policy can be given to the constructor with the
+    `object_cache` argument, by default the 256 most recently used objects are kept. Each parser
+    has its own cache, that can be emptied with `parser.object_cache.clear()`.
+
+    The content of streams is read and decoded every time `PDFStream.stream` is called, unless a
+    `Cache` is given as `stream_cache`. In that case the decoded contents of indirect objects are
+    kept in it, so that resources shared by many pages (fonts, images, ...) are decoded once. For
+    example, to keep up to 64 MiB of decoded data:
+
+    ::
+
+        >>> from pdf4py.cache import Cache
+        >>> parser = Parser('path/to/file.pdf', stream_cache = Cache(max_bytes = 64 * 2**20, sizeof = len))
+
+    A parser can be used by several threads at once if `thread_safe` is `True`. The cross
+    reference table, the trailer, the security handler and the caches are shared, while each
+    thread scans the source (or its memory mapping) with a cursor of its own, created the first
+    time the thread parses an object. This way the objects of a large document can be resolved by
+    a pool of threads, which run in parallel while zlib decompresses stream data. For example,
+
+    ::
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> parser = Parser('path/to/file.pdf', thread_safe = True)
+        >>> with ThreadPoolExecutor() as executor:
+        >>>     objects = list(executor.map(parser.parse_reference, parser.xreftable))
+
+    Note that an object requested by two threads at the same time may be parsed twice.
+
     
     Creates a new instance of `Parser`. The constructor reads the Cross Reference Table of the
     PDF document to retrieve the list of PDF objects that are present and parsable in the document.
@@ -375,23 +951,189 @@ class Parser:
 
     After the instantiation, `parser` will have a `XRefTable` instance associated to the attribute
     `xreftable`. To retrieve PDF objects pass entries in the table to the `Parser.parse_reference`
-    method.
+    method. If `compact_xref` is `True`, the table is a `CompactXRefTable` instead, which takes
+    much less memory for documents with many objects. The attribute `xref_kind` tells how the
+    latest section of the table is stored: in a classic table (`"table"`), in a cross-reference
+    stream (`"stream"`) or in both, as hybrid-reference files do (`"hybrid"`).
+
+    If the table cannot be read, because `startxref` is missing or points to garbage, a
+    `PDFSyntaxError` is raised, unless `recover` is `True`. In that case the table and the trailer
+    are rebuilt by scanning the whole file for object headers (`N G obj`), trailer dictionaries
+    and cross-reference streams, the definitions found last in the file winning over the previous
+    ones, and `xref_kind` is `"reconstructed"`.
+
+    If `index_cache` is an `IndexCache` (or the path of its folder) and `source` is a path, the
+    table, the trailer and the offsets of the objects in the object streams are loaded from the
+    entry of the document in the cache, if it has been built from the same version of the file,
+    instead of being parsed. Otherwise they are parsed and stored in the cache. Offsets of object
+    streams read later are stored when the parser is closed. The table is stored as it is, so
+    that entries of a `CompactXRefTable` load much faster than the ones of a `XRefTable`.
+
+    If the document is linearized (see `linearization`, None otherwise) and has not been updated
+    since, only the cross-reference section of its first page, which follows the linearization
+    dictionary at the beginning of the file, is parsed when it is opened: the objects of the first
+    page can be parsed after reading just the head of the file. The other sections are parsed the
+    first time an entry is not found in the table, or when all the entries are iterated, and the
+    entries missing from the trailer are then taken from theirs.
     """
     TRAILER_FIELDS = {"Root", "ID", "Size", "Encrypt", "Info", "Prev"}
+    OBJECT_STREAMS_CACHE_SIZE = 32
 
 
-    def __init__(self, source, password = None):
-        self._basic_parser = SequentialParser(source, stream_reader = self._stream_reader, content_stream_mode = False)
-        self._read_header()
-        self.__parse_xref_table()
-        encryption_dict = self.trailer.get("Encrypt")
-        if encryption_dict is not None:
-            if isinstance(encryption_dict, PDFReference):
-                encryption_dict = self.parse_reference(encryption_dict)
-            self._security_handler = StandardSecurityHandler(password, encryption_dict, self.trailer.get("ID"))
-        else:
-            self._security_handler = None
-        self._basic_parser._security_handler = self._security_handler
+    def __init__(self, source, password = None, startxref_search_limit = None, prefetch_object_streams = False,
+            object_cache = None, stream_cache = None, thread_safe = False, compact_xref = False, recover = False,
+            index_cache = None):
+        self.object_cache = Cache(max_entries = 256) if object_cache is None else object_cache
+        self.stream_cache = stream_cache
+        # decoded object streams, with the offsets of the objects they contain
+        self.__object_streams = OrderedDict()
+        self.__object_streams_lock = threading.Lock()
+        self.__prefetch_object_streams = prefetch_object_streams
+        self.__compact_xref = compact_xref
+        # the IndexCache, the path and the signature of the document if the index is cached, and
+        # the offsets of the objects in the object streams, stored with it
+        self.__index = None
+        self.__objstm_offsets = None
+        self.__index_changed = False
+        self.linearization = None
+        self._security_handler = None
+        # the sections the first-page one of a linearized document points to, once they are loaded
+        self.__remaining_xref = None
+        self.__remaining_xref_lock = threading.RLock()
+        self.__loading_xref = False
+        # the cursors of the threads are created once the document has been opened
+        self.__cursors = None
+        # the file opened by the parser, if it cannot be memory-mapped and must be read until the
+        # parser is closed
+        self.__file = None
+        is_path = isinstance(source, str) or hasattr(source, "__fspath__")
+        if is_path:
+            source_path, source = source, open(source, "rb")
+            self.__file = source
+        try:
+            if hasattr(source, "readinto"):
+                # positions in the document are counted from the start of the file
+                source.seek(0, 0)
+            self.__basic_parser = SequentialParser(source, stream_reader = self._stream_reader, content_stream_mode = False)
+            if is_path and index_cache is not None:
+                if not isinstance(index_cache, IndexCache):
+                    index_cache = IndexCache(index_cache)
+                stat = os.fstat(source.fileno())
+                tail = self.__basic_parser._lexer.read(max(0, stat.st_size - IndexCache.TAIL_SIZE),
+                    IndexCache.TAIL_SIZE)
+                self.__index = (index_cache, source_path, index_cache.signature(stat.st_size, stat.st_mtime_ns, tail))
+                self.__objstm_offsets = dict()
+            if is_path and self.__basic_parser._lexer.source is not source:
+                # the file can be closed as soon as it has been mapped.
+                self.__file = None
+                source.close()
+            self._read_header()
+            if self.__index is None or not self.__load_index(recover):
+                try:
+                    # the index cache needs the whole table
+                    if self.__index is not None or not self.__parse_linearized_xref_table():
+                        self.__parse_xref_table(startxref_search_limit)
+                except (PDFSyntaxError, PDFLexicalError, StopIteration) as e:
+                    if not recover:
+                        raise
+                    logging.warning("The cross-reference table cannot be read ({}), rebuilding it.".format(
+                        str(e).split("\n")[0] or type(e).__name__))
+                    self.__reconstruct_xref_table()
+                if self.__index is not None:
+                    self.__save_index()
+            encryption_dict = self.trailer.get("Encrypt")
+            if encryption_dict is not None:
+                if isinstance(encryption_dict, PDFReference):
+                    encryption_dict = self.parse_reference(encryption_dict)
+                self._security_handler = StandardSecurityHandler(password, encryption_dict, self.trailer.get("ID"))
+            else:
+                self._security_handler = None
+            self.__basic_parser._security_handler = self._security_handler
+        except BaseException:
+            if self.__file is not None:
+                self.__file.close()
+            raise
+        if thread_safe:
+            self.__cursors = threading.local()
+
+
+    @property
+    def _basic_parser(self):
+        """
+        The `SequentialParser` used to parse the objects of the document. When the parser is
+        thread safe, each thread has its own, scanning the source with a cursor of its own.
+        """
+        if self.__cursors is None:
+            return self.__basic_parser
+        try:
+            return self.__cursors.parser
+        except AttributeError:
+            parser = SequentialParser(self.__basic_parser._lexer.cursor(), stream_reader = self._stream_reader,
+                content_stream_mode = False)
+            parser._security_handler = self._security_handler
+            self.__cursors.parser = parser
+            return parser
+
+
+    def close(self):
+        """
+        Releases the memory mapping created over the source file, or closes the file if it has
+        been opened by the parser and it could not be mapped. Objects that have already been
+        parsed remain valid, but the streams of the file can no longer be read. If the index of
+        the document is cached, the offsets of the object streams read since it has been stored
+        are added to it.
+        """
+        if self.__index_changed:
+            self.__save_index()
+        self.__basic_parser._lexer.close()
+        if self.__file is not None:
+            self.__file.close()
+
+
+    def __load_index(self, recover):
+        """
+        Loads the cross-reference table, the trailer and the offsets of the objects in the object
+        streams from the entry of the document in the index cache. Returns False if there is no
+        usable entry: it is missing, it cannot be read or it has been built with other options.
+        """
+        index_cache, path, signature = self.__index
+        content = index_cache.get(path, signature)
+        if content is None:
+            return False
+        try:
+            xreftable, trailer, xref_kind, objstm_offsets = _IndexUnpickler(io.BytesIO(content)).load()
+        except Exception as e:
+            # unpickling damaged data can raise almost any exception
+            logging.warning("The index of '{}' cannot be read ({}), rebuilding it.".format(path, e))
+            return False
+        if type(xreftable) is not (CompactXRefTable if self.__compact_xref else XRefTable) or \
+                not isinstance(trailer, dict) or not isinstance(objstm_offsets, dict) or \
+                xref_kind == "reconstructed" and not recover:
+            return False
+        self.xreftable, self.trailer, self.xref_kind = xreftable, trailer, xref_kind
+        self.__objstm_offsets = objstm_offsets
+        return True
+
+
+    def __save_index(self):
+        """
+        Stores the cross-reference table, the trailer and the offsets of the objects in the object
+        streams read so far as the entry of the document in the index cache.
+        """
+        index_cache, path, signature = self.__index
+        with self.__object_streams_lock:
+            objstm_offsets = dict(self.__objstm_offsets)
+            self.__index_changed = False
+        content = pickle.dumps((self.xreftable, self.trailer, self.xref_kind, objstm_offsets), pickle.HIGHEST_PROTOCOL)
+        index_cache.put(path, signature, content)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
 
     def _read_header(self):
@@ -399,12 +1141,8 @@ class Parser:
         Reads the PDF header to retrive the standard used.
         """
         logging.debug("Reading the header..")
-        self._basic_parser._lexer.source.seek(0, 0)
-        buff = bytearray()
-        c = self._basic_parser._lexer.source.read(1)[0]
-        while(c != LINE_FEED and c != CARRIAGE_RETURN):
-            buff.append(c)
-            c = self._basic_parser._lexer.source.read(1)[0]
+        buff = self._basic_parser._lexer.read(0, 1024)
+        buff = buff.split(b"\n", 1)[0].split(b"\r", 1)[0]
         try:
             self.version = buff.decode()[1:]
         except UnicodeDecodeError:
@@ -412,7 +1150,6 @@ class Parser:
         logging.debug("_read_header finished.")
     
 
-    @lru_cache(maxsize=256)
     def parse_reference(self, reference):
         """
         Parse and retrieve the PDF object `xref_entry` points to.
@@ -421,8 +1158,8 @@ class Parser:
         -----
         PDF objects are not parsed when an instance of `Parser` is being created. Instead,
         parsing occurs when this method is called. To avoid that the same object is being
-        parsed too many times, a LRU cache is being used to keep in memory the last 256
-        parsed objects.
+        parsed too many times, parsed objects are kept in `object_cache` (by default, the last
+        256 parsed objects).
 
         Parameters
         ----------
@@ -439,6 +1176,30 @@ class Parser:
         ------
         `ValueError` if `reference` object type is not a valid one.
         """
+        if isinstance(reference, PDFReference):
+            key = (reference.object_number, reference.generation_number)
+        elif isinstance(reference, (XrefInUseEntry, XrefCompressedEntry)):
+            key = (reference.object_number, 0 if isinstance(reference, XrefCompressedEntry) else reference.generation_number)
+            # entries of previous revisions of the document, that have been replaced, are not cached
+            try:
+                current_entry = self.xreftable[key]
+            except KeyError:
+                current_entry = None
+            if current_entry != reference:
+                return self.__parse_reference(reference)
+        else:
+            raise ValueError("Argument type not supported.")
+        obj = self.object_cache.get(key, _NOT_CACHED)
+        if obj is _NOT_CACHED:
+            obj = self.__parse_reference(reference)
+            self.object_cache.put(key, obj)
+        return obj
+
+
+    def __parse_reference(self, reference):
+        """
+        Parses the PDF object `reference` points to, see `Parser.parse_reference`.
+        """
         logging.debug("parse_reference with input: " + str(reference))
         if isinstance(reference, PDFReference):
             logging.debug("It is a PDFReference")
@@ -446,86 +1207,389 @@ class Parser:
         
         if isinstance(reference, XrefInUseEntry):
             logging.debug("it is an XrefInUSeEntry")
-            self.__current_obj_num = (reference.object_number, reference.generation_number)
-            self._basic_parser._lexer.move_at_position(reference.offset)
-            parsedObject = self._basic_parser.parse_object(self.__current_obj_num).value
-            self._basic_parser._lexer.move_back()
+            basic_parser = self._basic_parser
+            basic_parser._lexer.move_at_position(reference.offset)
+            # a damaged file may end with the previous object parsed
+            basic_parser._restart()
+            parsedObject = basic_parser.parse_object((reference.object_number, reference.generation_number)).value
+            basic_parser._lexer.move_back()
             logging.debug("pasing the XrefInUseEntry finished.")
             return parsedObject
         
         elif isinstance(reference, XrefCompressedEntry):
             # now parse the object stream containing the object the entry refers to
             logging.debug("It is a Xref Compressed Entry.")
-            stream_token = self.parse_reference(PDFReference(reference.objstm_number, 0))
-            logging.debug("Stream token: " + str(stream_token))
-            D, stream_reader = stream_token
-            stream = stream_reader()
-            logging.debug("Stream got: " + str(stream))
-            prev_basic_parser = self._basic_parser
-            self._basic_parser = SequentialParser(stream, stream_reader = self._stream_reader, content_stream_mode = False)
-            obj = None
-            for i in range(D["N"]):
-                n1 = self._basic_parser.parse_object()
-                n2 = self._basic_parser.parse_object()
-                if not(isinstance(n1, int) and isinstance(n2, int)):
-                    self._basic_parser._raise_syntax_error("Expected integers in object stream.")
-                if n1 == reference.object_number:
-                    offset = D["First"] + n2
-                    self._basic_parser._lexer.move_at_position(offset)
-                    obj = self._basic_parser.parse_object(self.__current_obj_num)
-                    break
-            if obj is None:
-                self._basic_parser._raise_syntax_error("Compressed object not found.")
-            self._basic_parser = prev_basic_parser
-            logging.debug("setting back the parser.")
-            return obj
+            objstm = self.__load_object_stream(reference.objstm_number)
+            if objstm[2] is None and self.__prefetch_object_streams:
+                self.__parse_object_stream(objstm)
+            data, offsets, objects = objstm
+            if objects is not None:
+                try:
+                    return objects[(reference.object_number, 0)]
+                except KeyError:
+                    offset = None
+            # the entry tells the index of the object in the stream, the table is searched
+            # only if it is missing or does not match
+            elif reference.index is not None and 0 <= reference.index < len(offsets) and \
+                    offsets[reference.index][0] == reference.object_number:
+                offset = offsets[reference.index][1]
+            else:
+                offset = next((o for n, o in offsets if n == reference.object_number), None)
+            objstm_parser = SequentialParser(data, stream_reader = self._stream_reader, content_stream_mode = False)
+            if offset is None:
+                objstm_parser._raise_syntax_error("Compressed object not found.")
+            objstm_parser._lexer.move_at_position(offset)
+            return objstm_parser.parse_object()
         else:
             raise ValueError("Argument type not supported.")
 
 
-    def __parse_xref_table(self):
+    def load_object_stream(self, reference):
+        """
+        Parses all the objects stored in an object stream, in one pass over its content.
+
+        The parsed objects are kept along with the object stream, so that the following calls to
+        `Parser.parse_reference` for any of them do not parse them again (as long as the object
+        stream is in the cache, see `OBJECT_STREAMS_CACHE_SIZE`).
+
+        Parameters
+        ----------
+        reference : PDFReference or XrefInUseEntry or XrefCompressedEntry
+            A reference or XRefTable entry pointing to the object stream, or the `XrefCompressedEntry`
+            of one of the objects stored in it.
+
+        Returns
+        -------
+        objects : dict
+            The objects stored in the object stream, keyed on `(object_number, generation_number)`.
+
+        Raises
+        ------
+        `ValueError` if `reference` object type is not a valid one.
+        """
+        if isinstance(reference, XrefCompressedEntry):
+            objstm_number = reference.objstm_number
+        elif isinstance(reference, (PDFReference, XrefInUseEntry)):
+            objstm_number = reference.object_number
+        else:
+            raise ValueError("Argument type not supported.")
+        objstm = self.__load_object_stream(objstm_number)
+        if objstm[2] is None:
+            self.__parse_object_stream(objstm)
+        return dict(objstm[2])
+
+
+    def __parse_object_stream(self, objstm : 'list'):
+        """
+        Parses all the objects in the object stream `objstm`, as returned by
+        `__load_object_stream`, and stores them in its last item.
+        """
+        data, offsets, _ = objstm
+        objstm_parser = SequentialParser(data, stream_reader = self._stream_reader, content_stream_mode = False)
+        objects = dict()
+        # objects are parsed in the order they are stored, so that only the last one can reach
+        # the end of the content
+        for object_number, offset in sorted(offsets, key = lambda x: x[1]):
+            objstm_parser._lexer.move_at_position(offset)
+            obj = objstm_parser.parse_object()
+            objstm_parser._lexer.move_back()
+            objects.setdefault((object_number, 0), obj)
+        objstm[2] = objects
+
+
+    def __load_object_stream(self, objstm_number : 'int'):
+        """
+        Returns the object stream `objstm_number` as a list `[data, offsets, objects]`: its decoded
+        content, the list of `(object_number, offset)` pairs it begins with (offsets are relative
+        to the start of the decoded content) and the dictionary of the parsed objects, or None if
+        they have not been parsed all at once.
+
+        The last `OBJECT_STREAMS_CACHE_SIZE` object streams used are kept in memory, so that they
+        are decoded and their offsets parsed only once, however many objects are read from them.
+        """
+        with self.__object_streams_lock:
+            objstm = self.__object_streams.get(objstm_number)
+            if objstm is not None:
+                self.__object_streams.move_to_end(objstm_number)
+                return objstm
+        D, stream_reader = self.parse_reference(PDFReference(objstm_number, 0))
+        data = stream_reader()
+        # the offsets may be known from the index cache
+        offsets = None if self.__objstm_offsets is None else self.__objstm_offsets.get(objstm_number)
+        if offsets is None:
+            objstm_parser = SequentialParser(data, stream_reader = self._stream_reader, content_stream_mode = False)
+            offsets = []
+            for i in range(D["N"]):
+                n1 = objstm_parser.parse_object()
+                n2 = objstm_parser.parse_object()
+                if not(isinstance(n1, int) and isinstance(n2, int)):
+                    objstm_parser._raise_syntax_error("Expected integers in object stream.")
+                offsets.append((n1, D["First"] + n2))
+            if self.__objstm_offsets is not None:
+                with self.__object_streams_lock:
+                    self.__objstm_offsets[objstm_number] = offsets
+                    self.__index_changed = True
+        objstm = [data, offsets, None]
+        with self.__object_streams_lock:
+            # another thread may have loaded the same object stream in the meantime
+            objstm = self.__object_streams.setdefault(objstm_number, objstm)
+            self.__object_streams.move_to_end(objstm_number)
+            if len(self.__object_streams) > self.OBJECT_STREAMS_CACHE_SIZE:
+                self.__object_streams.popitem(last = False)
+        return objstm
+
+
+    def __parse_xref_table(self, startxref_search_limit = None):
         # fist, find xrefstart, starting from end of file
-        xrefstartpos = self._basic_parser._lexer.rfind(b"startxref")
+        xrefstartpos = self._basic_parser._lexer.rfind(b"startxref", limit = startxref_search_limit)
         if xrefstartpos < 0:
             self._basic_parser._raise_syntax_error("'startxref' keyword not found.")
         # get the position of the latest xref section
         xrefpos = next(self._basic_parser._lexer)
+        self.trailer = dict()
+        xrefs, self.xref_kind, _ = self.__parse_xref_sections(xrefpos, self.trailer)
+        self.xreftable = self.__build_xref_table(xrefs)
+        if self.xreftable is not None:
+            self.xreftable.build_index()
+
+
+    def __parse_xref_sections(self, xrefpos, trailer, count = None):
+        """
+        Parses the cross-reference sections starting from the one at `xrefpos` and following the
+        `Prev` entries of their trailers, at most `count` of them if it is given. The entries of
+        the trailers that are not in `trailer` yet are added to it, so that the newest ones win.
+
+        Returns the columns of the sections, from the oldest to the newest, the kind of the first
+        one (see `xref_kind`) and the position of the first section that has not been parsed, or -1.
+        """
         # the following list will hold all the xref sections found in the PDF file.
         xrefs = []
-        self.trailer = dict()
-        while xrefpos >= 0: # while there are xref to process
+        xref_kind = None
+        while xrefpos >= 0 and (count is None or count > 0): # while there are xref to process
             current_lexeme = self._basic_parser._lexer.move_at_position(xrefpos)
             if isinstance(current_lexeme, PDFKeyword) and current_lexeme.value == b"xref":
                 logging.debug("Parsing an xref table..")
                 # then it is a classic xref table, as opposed to xref streams
-                trailer, xref_data = self.__parse_xref_section()
+                section_trailer, xref_data = self.__parse_xref_section()
                 xrefs.insert(0, xref_data)
+                kind = "table"
                 # Check now if this is a PDF in compatibility mode where there is xref stream
                 # reference in the trailer.          
-                xrefstm_pos = trailer.get("XRefStm")
+                xrefstm_pos = section_trailer.get("XRefStm")
                 if xrefstm_pos is not None:
                     logging.debug("Found a xref stream reference in trailer of xref table..")
                     self._basic_parser._lexer.move_at_position(xrefstm_pos)
                     _, xref_data_stream = self.__parse_xref_stream()
                     xrefs.insert(0, xref_data_stream)
+                    kind = "hybrid"
             else:
                 # it can only be a xref stream
                 logging.debug("Parsing an xref stream..")
-                trailer, xref_data = self.__parse_xref_stream()
+                section_trailer, xref_data = self.__parse_xref_stream()
                 xrefs.insert(0, xref_data)
+                kind = "stream"
+            if xref_kind is None:
+                xref_kind = kind
                 
             # now process them
-            if "Prev" in trailer:
-                xrefpos = trailer["Prev"]
-                del trailer["Prev"]
+            if "Prev" in section_trailer:
+                xrefpos = section_trailer["Prev"]
+                del section_trailer["Prev"]
             else:
                 xrefpos = -1
-            self.trailer.update(trailer)
+            for key, value in section_trailer.items():
+                trailer.setdefault(key, value)
+            if count is not None:
+                count -= 1
+        return xrefs, xref_kind, xrefpos
+
 
+    def __build_xref_table(self, xrefs, previous = None):
+        """
+        Returns the table made of the sections `xrefs`, from the oldest to the newest, the oldest
+        one following `previous`.
+        """
         # now build a hierarchy of XrefTable instances
-        self.xreftable = None
-        for xref_data in xrefs:
-            self.xreftable = XRefTable(self.xreftable, *xref_data)
+        table = previous
+        for columns in xrefs:
+            if self.__compact_xref:
+                table = CompactXRefTable(table, columns)
+            else:
+                table = XRefTable(table, *columns.to_dicts())
+        return table
+
+
+    def __parse_linearized_xref_table(self):
+        """
+        If the document is linearized, and its length still matches the one in the linearization
+        dictionary, parses only the cross-reference section of the first page and returns True.
+        The table loads the other sections when it needs them, see `__load_remaining_xref`.
+
+        The hint tables are not read: the first-page section is enough to find the objects of
+        the first page, and the other sections are needed anyway to find the objects of the
+        other pages by number.
+        """
+        lexer = self._basic_parser._lexer
+        # the linearization dictionary must be within the first 1024 bytes of the file
+        head = lexer.read(0, 1024)
+        if b"/Linearized" not in head:
+            return False
+        m = _FIRST_OBJECT_HEADER.search(head)
+        end = _END_OF_OBJECT.search(head, m.end()) if m is not None else None
+        if end is None:
+            return False
+        trailer = dict()
+        try:
+            lexer.move_at_position(m.start())
+            obj = self._basic_parser.parse_object()
+            linearization = obj.value if isinstance(obj, PDFIndirectObject) else None
+            if not isinstance(linearization, dict) or "Linearized" not in linearization or \
+                    linearization.get("L") != lexer.size:
+                return False
+            xrefs, xref_kind, xrefpos = self.__parse_xref_sections(end.end(), trailer, 1)
+        except (PDFSyntaxError, PDFLexicalError, StopIteration):
+            return False
+        if "Root" not in trailer:
+            return False
+        self.trailer = trailer
+        self.xref_kind = xref_kind
+        self.linearization = linearization
+        self.xreftable = self.__build_xref_table(xrefs, None if xrefpos < 0 else partial(self.__load_remaining_xref, xrefpos))
+        self.xreftable.build_index()
+        return True
+
+
+    def __load_remaining_xref(self, xrefpos):
+        """
+        Parses the cross-reference sections of a linearized document that come before the one of
+        its first page, starting from the one at `xrefpos`, and returns them as a table. It is
+        called by the table the first time they are needed, and it parses them once.
+
+        As it can be called while another object is being parsed, the sections are parsed with
+        a `SequentialParser` of their own.
+        """
+        with self.__remaining_xref_lock:
+            if self.__remaining_xref is not None:
+                return self.__remaining_xref
+            if self.__loading_xref:
+                raise PDFSyntaxError("An object needed to read the cross-reference table is not in it.")
+            parser = SequentialParser(self.__basic_parser._lexer.cursor(), stream_reader = self._stream_reader,
+                content_stream_mode = False)
+            parser._security_handler = self._security_handler
+            if self.__cursors is None:
+                saved_parser, self.__basic_parser = self.__basic_parser, parser
+            else:
+                saved_parser, self.__cursors.parser = self._basic_parser, parser
+            self.__loading_xref = True
+            try:
+                xrefs, _, _ = self.__parse_xref_sections(xrefpos, self.trailer)
+            finally:
+                self.__loading_xref = False
+                if self.__cursors is None:
+                    self.__basic_parser = saved_parser
+                else:
+                    self.__cursors.parser = saved_parser
+            self.__remaining_xref = self.__build_xref_table(xrefs)
+            return self.__remaining_xref
+
+
+    def __reconstruct_xref_table(self):
+        """
+        Rebuilds the cross-reference table and the trailer of a damaged file with one scan of
+        the whole input, looking for object headers, trailer dictionaries and cross-reference
+        streams with regular expressions rather than with the lexer. Objects defined later in the
+        file replace the ones defined before. Compressed objects are known from the cross-reference
+        streams, and they replace the objects defined before the stream.
+        """
+        lexer = self._basic_parser._lexer
+        data = lexer.source
+        if hasattr(data, "readinto"):
+            chunks = []
+            while True:
+                chunk = lexer.read(len(chunks) * _RECONSTRUCTION_BLOCK_SIZE, _RECONSTRUCTION_BLOCK_SIZE)
+                chunks.append(chunk)
+                if len(chunk) < _RECONSTRUCTION_BLOCK_SIZE:
+                    break
+            data = b"".join(chunks)
+        # the object headers, in order of position
+        headers, numbers, generations = _find_object_headers(data)
+        # the index of the latest header of each object
+        latest = dict(zip(numbers, range(len(numbers))))
+        # the compressed objects, as (position of the cross-reference stream, object stream, index)
+        compressed = dict()
+        def object_at(pos):
+            # returns the position of the header of the object containing `pos`, or -1
+            i = bisect_left(headers, pos + 1) - 1
+            return headers[i] if i >= 0 else -1
+        def reset_parser():
+            # the sequential parser stops for good once it reaches the end of the input
+            with suppress(PDFLexicalError, StopIteration):
+                lexer.move_at_position(headers[0] if headers else 0, save = False)
+            self.__basic_parser = SequentialParser(lexer, stream_reader = self._stream_reader,
+                content_stream_mode = False)
+        def build_table():
+            if compressed:
+                rows = {n : (_IN_USE, headers[i], generations[i]) for n, i in latest.items()}
+                for n, (pos, objstm_number, index) in compressed.items():
+                    if n not in latest or headers[latest[n]] < pos:
+                        rows[n] = (_COMPRESSED, objstm_number, index)
+                order = sorted(rows)
+                kinds, fields1, fields2 = zip(*map(rows.__getitem__, order))
+            else:
+                order = sorted(latest)
+                indexes = list(map(latest.__getitem__, order))
+                kinds = bytes([_IN_USE]) * len(order)
+                fields1 = map(headers.__getitem__, indexes)
+                fields2 = map(generations.__getitem__, indexes)
+            columns = _XRefColumns(array("q", order), array("B", kinds), array("q", fields1), array("q", fields2))
+            if self.__compact_xref:
+                self.xreftable = CompactXRefTable(None, columns)
+            else:
+                self.xreftable = XRefTable(None, *columns.to_dicts())
+            self.xreftable.build_index()
+            return order
+
+        # trailer dictionaries and cross-reference streams, in order of position
+        trailers = []
+        for m in _TRAILER.finditer(data):
+            reset_parser()
+            try:
+                lexer.move_at_position(m.start() + len(b"trailer"), save = False)
+                trailer = self._basic_parser.parse_object()
+            except (PDFSyntaxError, PDFLexicalError, StopIteration):
+                continue
+            if isinstance(trailer, dict):
+                trailers.append((m.start(), trailer))
+        xref_streams = sorted({object_at(m.start()) for m in _XREF_STREAM_TYPE.finditer(data)} - {-1})
+        if xref_streams:
+            # the lengths of the cross-reference streams may be indirect objects
+            build_table()
+        for pos in xref_streams:
+            reset_parser()
+            try:
+                lexer.move_at_position(pos, save = False)
+                trailer, columns = self.__parse_xref_stream()
+            except (PDFSyntaxError, PDFLexicalError, StopIteration, KeyError, TypeError, ValueError):
+                continue
+            trailers.append((pos, trailer))
+            for n, kind, field1, field2 in zip(columns.numbers, columns.kinds, columns.fields1, columns.fields2):
+                if kind == _COMPRESSED:
+                    compressed[n] = (pos, field1, field2)
+        self.trailer = dict()
+        for _, trailer in sorted(trailers, key = lambda x : x[0]):
+            self.trailer.update((k, v) for k, v in trailer.items() if k in self.TRAILER_FIELDS and k != "Prev")
+        if "Root" not in self.trailer:
+            for m in _CATALOG_TYPE.finditer(data):
+                i = bisect_left(headers, m.start() + 1) - 1
+                if i >= 0:
+                    self.trailer["Root"] = PDFReference(numbers[i], generations[i])
+        self.xref_kind = "reconstructed"
+        order = build_table()
+        if order:
+            self.trailer.setdefault("Size", order[-1] + 1)
+        reset_parser()
+        # objects parsed while the file was scanned may have been read from the damaged table
+        self.object_cache.clear()
 
 
     def __parse_xref_stream(self):
@@ -551,9 +1615,9 @@ class Parser:
         trailer = {k : objstm_dict[k] for k in objstm_dict if k in self.TRAILER_FIELDS}
         # read the raw stream content
         xrefdata = objstm()
-        logging.debug("xref stream: " + str(xrefdata))
-        # current position inside xrefData
-        pos = 0
+        if not isinstance(xrefdata, (bytes, bytearray)):
+            xrefdata = bytes(xrefdata)
+        logging.debug("xref stream: %s", xrefdata)
         # retrieves info about xref stream layout
         # TODO: support extends keyword
         if "Extends" in objstm_dict:
@@ -565,57 +1629,56 @@ class Parser:
         index = objstm_dict.get("Index", [0, size])
         # An array of integers representing the size of the fields in a single cross-reference entry.
         w = [x for x in objstm_dict["W"]]
-        # where data will be saved
-        inuse_objects = dict()
-        free_objects = set()
-        compressed_objects = dict()
-        # start parsing
-        for i in range(0, len(index) - 1, 2):
-            start, count = index[i], index[i+1]
-            # for each section..
-            for j in range(count):
-                # skip object 0, we will not used it
-                if start == 0 and j == 0:
-                    pos += sum(w)
-                    continue
-                # parse the current record in an array of three elements
-                vals = [None] * 3
-                for k in range(3):
-                    if w[k] > 0:
-                        vals[k] = sum([x << (w[k] - l - 1)*8 for l, x in enumerate(xrefdata[pos:pos+w[k]])])
-                        pos += w[k]
-                
-                # set default values, based on the record type
-                if vals[0] is None:
-                    vals[0] = 1
-                if vals[0] == 1 and vals[2] is None:
-                    vals[2] = 0
-                
-                # transform the record into a higher level object
-                if vals[0] == 0:
-                    # type 0 is assigned to free objects. We will not keep the linked list structure (which is
-                    # redundant in our setting)
-                    entry = (start + j, vals[2])
-                    free_objects.add(entry)
-                elif vals[0] == 1:
-                    # In use object
-                    entry = XrefInUseEntry(vals[1], start + j, vals[2])
-                    logging.debug("XrefInUseEntry: {}".format(entry))
-                    inuse_objects[(entry.object_number, entry.generation_number)] = entry
-                else:
-                    # it is a compressed object
-                    entry = XrefCompressedEntry(start + j, vals[1], vals[2])
-                    logging.debug("XrefCompressedEntry: {}".format(entry))
-                    compressed_objects[(entry.object_number, 0)] = entry
+        row_size = sum(w)
+        # the object numbers of the rows, subsection after subsection
+        subsections = [(index[i], index[i + 1]) for i in range(0, len(index) - 1, 2)]
+        if all(x[0] + x[1] == y[0] for x, y in zip(subsections, subsections[1:])) and subsections:
+            numbers = range(subsections[0][0], subsections[-1][0] + subsections[-1][1])
+        else:
+            numbers = array("q")
+            for start, count in subsections:
+                numbers.extend(range(start, start + count))
+        if row_size == 0:
+            self._basic_parser._raise_syntax_error("Invalid /W array in xref stream: " + str(w))
+        if len(numbers) * row_size > len(xrefdata):
+            logging.warning("xref stream is too short for its /Index, the missing rows are ignored.")
+            numbers = numbers[:len(xrefdata) // row_size]
+        # decode the fields of all the rows at once, field after field
+        count = len(numbers)
+        if w[0] == 0:
+            # the default type is 1, objects in use
+            kinds = array("B", bytes([_IN_USE]) * count)
+        elif w[0] == 1:
+            kinds = array("B", xrefdata[:row_size * count:row_size].translate(_XREF_STREAM_KINDS))
+        else:
+            types = _xref_stream_column(xrefdata, 0, w[0], row_size, count)
+            kinds = array("B", (_XREF_STREAM_KINDS[min(x, 255)] for x in types))
+        fields1 = _xref_stream_column(xrefdata, w[0], w[1], row_size, count)
+        if w[2] > 0:
+            fields2 = _xref_stream_column(xrefdata, w[0] + w[1], w[2], row_size, count)
+        else:
+            # the default generation number of objects in use is 0, the index in the object stream
+            # of compressed objects is unknown
+            fields2 = array("q", (0 if x == _IN_USE else -1 for x in kinds))
+        # skip object 0, we will not use it
+        if 0 in numbers:
+            i = numbers.index(0)
+            if i == 0:
+                numbers = numbers[1:]
+            else:
+                numbers = array("q", numbers)
+                del numbers[i]
+            for column in (kinds, fields1, fields2):
+                del column[i]
+        columns = _XRefColumns(numbers, kinds, fields1, fields2)
         logging.debug("Ended parsing xref stream.")
-        return trailer, (inuse_objects, free_objects, compressed_objects)
+        return trailer, columns
 
 
     def __parse_xref_section(self):
         # first, locate the trailer
         next(self._basic_parser._lexer)
-        inuse_objects = dict()
-        free_objects = set()
+        columns = _XRefColumns()
         while isinstance(self._basic_parser._lexer.current_lexeme, int):
             start = self._basic_parser._lexer.current_lexeme
             if not isinstance(start, int):
@@ -623,7 +1686,18 @@ class Parser:
             count = next(self._basic_parser._lexer)
             if not isinstance(count, int):
                 self._basic_parser._raise_syntax_error("Expected the number of elements in the section.")
-            # read all records in subsection
+            # the records have a fixed size, read them all at once after the end of line
+            pos = self._basic_parser._lexer.tell()
+            blanks = self._basic_parser._lexer.read(pos, 32)
+            pos += len(blanks) - len(blanks.lstrip(b"\x00\t\n\x0c\r "))
+            parsed = _parse_xref_records(self._basic_parser._lexer.read(pos, 20 * count), count) if count > 0 else None
+            if parsed is not None:
+                first = 1 if start == 0 else 0 # skip head of the free objects linked list
+                kinds, offsets, generations = parsed
+                columns.extend(range(start + first, start + count), kinds[first:], offsets[first:], generations[first:])
+                self._basic_parser._lexer.move_at_position(pos + 20 * count, save = False)
+                continue
+            # malformed records: read all records in subsection with the lexer
             for i in range(count):
                 offsetToken = next(self._basic_parser._lexer)
                 if not isinstance(offsetToken, int):
@@ -637,19 +1711,16 @@ class Parser:
                 if start == 0 and i == 0:
                     continue # skip head of the free objects linked list  (will not be used)
                 if marker_token.value == "n":
-                    xrefentry = XrefInUseEntry(offsetToken, start + i, gennumber_token)
-                    logging.debug("xref entry: {}".format(xrefentry))
-                    inuse_objects[(xrefentry.object_number, xrefentry.generation_number)] = xrefentry
+                    columns.append(start + i, _IN_USE, offsetToken, gennumber_token)
                 else:
-                    xrefentry = (start + i, gennumber_token - 1)
-                    free_objects.add(xrefentry)
+                    columns.append(start + i, _FREE, 0, gennumber_token - 1)
             next(self._basic_parser._lexer)
         # now there must be the trailer
         if not isinstance(self._basic_parser._lexer.current_lexeme, PDFKeyword) or self._basic_parser._lexer.current_lexeme.value != b'trailer':
             self._basic_parser._raise_syntax_error("Expecting 'trailer' section after 'xref' table.")
         next(self._basic_parser._lexer)
         trailer = self._basic_parser.parse_object()
-        return trailer, (inuse_objects, free_objects)
+        return trailer, columns
     
 
     def _stream_reader(self, D : 'dict', reader, obj_num : 'tuple' = None):
@@ -679,20 +1750,80 @@ class Parser:
         if not isinstance(length, int):
             self._basic_parser._raise_syntax_error("The object referenced by 'Length' is not an integer.")
 
-        def complete_reader():
-            data = reader(length)
-            # TODO: improve this
-            if isinstance(data, memoryview):
-                data = bytes(data)
-            if D.get('Type') != 'XRef' and self._security_handler is not None:
+        # indirect objects are identified in the stream cache by their number and the position
+        # of their content, as objects of previous revisions may have the same number
+        key = None if obj_num is None else (obj_num, self._basic_parser._lexer.tell())
+
+        def complete_reader(max_bytes = None):
+            stream_cache = self.stream_cache if key is not None else None
+            if stream_cache is not None:
+                data = stream_cache.get(key)
+                if data is not None:
+                    return data if max_bytes is None else data[:max_bytes]
+            if max_bytes is not None:
+                # decoding stops as soon as enough bytes have been produced
+                chunks = []
+                count = 0
+                if max_bytes > 0:
+                    for chunk in iter_chunks(min(max(max_bytes, 4096), 64 * 1024)):
+                        chunks.append(chunk)
+                        count += len(chunk)
+                        if count >= max_bytes:
+                            break
+                return b"".join(chunks)[:max_bytes]
+            # data may be a view over the source, it is copied only if no filter produces a
+            # new bytes object from it.
+            view = data = reader(length)
+            try:
+                if D.get('Type') != 'XRef' and self._security_handler is not None:
+                    try:
+                        data = self._security_handler.decrypt_stream(data, D, obj_num)
+                    except Exception as e:
+                        self._basic_parser._raise_syntax_error("Error while decrypting data: " + str(e))
                 try:
-                    data = self._security_handler.decrypt_stream(data, D, obj_num)
+                    data = decode(D, data)
                 except Exception as e:
-                    self._basic_parser._raise_syntax_error("Error while decrypting data: " + str(e))
+                    self._basic_parser._raise_syntax_error("Error while decoding data: " + str(e))
+                if isinstance(data, memoryview):
+                    data = bytes(data)
+            finally:
+                # the traceback of an error would otherwise keep the mapping exported
+                if isinstance(view, memoryview):
+                    view.release()
+            if stream_cache is not None:
+                stream_cache.put(key, data)
+            return data
+
+        def iter_chunks(size):
+            # the content is read, decrypted and decoded a piece at a time
+            stream_cache = self.stream_cache if key is not None else None
+            data = None if stream_cache is None else stream_cache.get(key)
+            views = []
+            def read_chunks():
+                for offset in range(0, length, size):
+                    chunk = reader(min(size, length - offset), offset)
+                    if isinstance(chunk, memoryview):
+                        # only the view being decoded is kept, the previous ones have been consumed
+                        views[:] = [chunk]
+                    yield chunk
             try:
-                return decode(D, data)
+                if data is not None:
+                    decoded = (data,)
+                else:
+                    chunks = read_chunks()
+                    if D.get('Type') != 'XRef' and self._security_handler is not None:
+                        chunks = self._security_handler.iter_decrypt_stream(chunks, D, obj_num)
+                    decoded = iter_decode(D, chunks, size)
+                for chunk in decoded:
+                    # pieces produced by filters that decode all at once are split
+                    for i in range(0, len(chunk), size):
+                        yield bytes(chunk[i : i + size])
             except Exception as e:
                 self._basic_parser._raise_syntax_error("Error while decoding data: " + str(e))
-            
+            finally:
+                for view in views:
+                    view.release()
+
+        complete_reader.iter_chunks = iter_chunks
         return length, complete_reader
              
@@ -0,0 +1,256 @@
+"""
+Defines the functions behind the `python -m pdf4py scan` command, that opens many documents with
+a pool of processes and reports, for each one, what has been found in it and how long it took.
+"""
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from .parser import Parser
+from .types import *
+from .exceptions import PDFWrongPasswordError
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, where memory is not capped
+    resource = None
+
+try:
+    from signal import SIGALRM, ITIMER_REAL, setitimer, signal
+except ImportError:
+    # not available on Windows, where documents are not interrupted
+    SIGALRM = None
+
+
+
+class ScanTimeout(BaseException):
+    """
+    Raised when scanning a document takes longer than the timeout given to `scan`. Like
+    `KeyboardInterrupt`, it is not a subclass of `Exception`, so that it is not turned by the
+    parser into a syntax error of the object being parsed.
+    """
+    pass
+
+
+
+def find_documents(patterns : 'list'):
+    """
+    Yields the paths of the documents matching `patterns`, a list of directories, whose PDF files
+    are searched recursively, and of glob patterns (`**` matches any number of directories).
+    """
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for folder, _, names in os.walk(pattern):
+                for name in sorted(names):
+                    if name.lower().endswith(".pdf"):
+                        yield os.path.join(folder, name)
+        else:
+            for path in sorted(glob.glob(pattern, recursive = True)):
+                if os.path.isfile(path):
+                    yield path
+
+
+
+def _count_pages(parser : 'Parser'):
+    """
+    Returns the number of pages of the document, as declared by the root of its page tree.
+    """
+    root = parser.trailer["Root"]
+    catalog = parser.parse_reference(root) if isinstance(root, PDFReference) else root
+    pages = catalog["Pages"]
+    if isinstance(pages, PDFReference):
+        pages = parser.parse_reference(pages)
+    count = pages["Count"]
+    if isinstance(count, PDFReference):
+        count = parser.parse_reference(count)
+    return count
+
+
+
+def _new_record(path):
+    return {"path" : path, "size" : None, "version" : None, "objects" : None, "xref" : None,
+        "encrypted" : None, "pages" : None, "errors" : [], "timings" : dict()}
+
+
+
+def scan_file(path, parse_objects = False, password = None):
+    """
+    Opens the document at `path` and returns a dictionary describing it, with the keys:
+
+    - `path` and `size`, the size of the file in bytes;
+    - `version`, the version in the header of the document;
+    - `objects`, the number of objects in use;
+    - `xref`, the kind of the latest cross reference section (see `Parser`);
+    - `encrypted`, whether the document is encrypted;
+    - `pages`, the number of pages;
+    - `errors`, the list of the messages of the errors met;
+    - `timings`, the time in seconds spent in each phase: `open` (reading the header, the cross
+      reference table and the security handler), `objects` (parsing all the objects, if
+      `parse_objects` is `True`) and `pages`.
+
+    The values that could not be retrieved, because of an error, are `None`.
+    """
+    record = _new_record(path)
+    timings = record["timings"]
+    parser = None
+    try:
+        record["size"] = os.path.getsize(path)
+        start = time.perf_counter()
+        try:
+            parser = Parser(path, password)
+        finally:
+            timings["open"] = time.perf_counter() - start
+        record["version"] = parser.version
+        record["xref"] = parser.xref_kind
+        record["encrypted"] = "Encrypt" in parser.trailer
+        keys = {(x.object_number, getattr(x, "generation_number", 0)) for x in parser.xreftable}
+        record["objects"] = len(keys)
+        if parse_objects:
+            start = time.perf_counter()
+            for key in sorted(keys):
+                try:
+                    obj = parser.parse_reference(parser.xreftable[key])
+                    if isinstance(obj, PDFStream):
+                        obj.stream()
+                except Exception as e:
+                    record["errors"].append("object {} {}: {}: {}".format(key[0], key[1], type(e).__name__, e))
+            timings["objects"] = time.perf_counter() - start
+        start = time.perf_counter()
+        try:
+            record["pages"] = _count_pages(parser)
+        finally:
+            timings["pages"] = time.perf_counter() - start
+    except PDFWrongPasswordError as e:
+        record["encrypted"] = True
+        record["errors"].append("{}: {}".format(type(e).__name__, e))
+    except (Exception, ScanTimeout) as e:
+        record["errors"].append("{}: {}".format(type(e).__name__, e))
+    finally:
+        if parser is not None:
+            parser.close()
+    return record
+
+
+
+def _raise_timeout(signum, frame):
+    raise ScanTimeout("Scanning took longer than the timeout.")
+
+
+
+def _init_worker(memory_limit):
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if SIGALRM is not None:
+        signal(SIGALRM, _raise_timeout)
+
+
+
+def _scan_with_timeout(path, parse_objects, password, timeout):
+    if timeout is None or SIGALRM is None:
+        return scan_file(path, parse_objects, password)
+    try:
+        setitimer(ITIMER_REAL, timeout)
+        try:
+            return scan_file(path, parse_objects, password)
+        finally:
+            setitimer(ITIMER_REAL, 0)
+    except ScanTimeout as e:
+        # the alarm went off outside of the error handling of scan_file, e.g. while the parser
+        # was being closed
+        record = _new_record(path)
+        record["errors"].append("{}: {}".format(type(e).__name__, e))
+        return record
+
+
+
+def scan(paths, workers = None, timeout = None, memory_limit = None, parse_objects = False, password = None):
+    """
+    Scans the documents at `paths` with a pool of `workers` processes (by default, one for each
+    CPU) and yields the records returned by `scan_file`, in the order the documents are completed.
+
+    Paths are consumed lazily, so that `paths` can be a generator over a large corpus.
+
+    If a worker process terminates abruptly (e.g. it is killed by the OS), the pool is replaced,
+    and the documents that were given to it are scanned again one at a time, so that only the
+    document that terminated a worker is reported with a `BrokenProcessPool` error.
+
+    Parameters
+    ----------
+    paths : iterable of str
+        The paths of the documents.
+
+    workers : int, optional
+        The number of worker processes.
+
+    timeout : float, optional
+        The number of seconds after which the scan of a document is interrupted and a
+        `ScanTimeout` error is reported for it. Not supported on Windows.
+
+    memory_limit : int, optional
+        The maximum size, in bytes, of the address space of each worker process, memory mappings
+        of the documents included. A document that would exceed it is reported with a `MemoryError`.
+        Not supported on Windows.
+
+    parse_objects : bool
+        Whether all the objects in use, and the contents of the streams, have to be parsed.
+
+    password : bytes or str, optional
+        The password used to open encrypted documents.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    paths = iter(paths)
+    pending = dict()
+    # the documents that were in a pool when it broke, and the future of the one scanned alone
+    suspects = deque()
+    isolated = None
+    executor = None
+    try:
+        while True:
+            # after a pool breaks, the new one is started once all its futures have been collected
+            if executor is None and not pending:
+                executor = ProcessPoolExecutor(workers, initializer = _init_worker, initargs = (memory_limit,))
+            if executor is not None:
+                if suspects:
+                    # suspects are scanned alone, so that a pool breaking tells which one is guilty
+                    if not pending:
+                        path = suspects.popleft()
+                        isolated = executor.submit(_scan_with_timeout, path, parse_objects, password, timeout)
+                        pending[isolated] = path
+                else:
+                    # a few documents per worker are queued, so that workers never wait
+                    for path in paths:
+                        pending[executor.submit(_scan_with_timeout, path, parse_objects, password, timeout)] = path
+                        if len(pending) >= 4 * workers:
+                            break
+            if not pending:
+                break
+            done, _ = wait(pending, return_when = FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    record = future.result()
+                except BrokenProcessPool:
+                    # a worker has been killed (e.g. by the OS): a new pool is started, and the
+                    # documents of the broken one are scanned again, unless it was scanned alone
+                    if executor is not None:
+                        executor.shutdown(wait = False)
+                        executor = None
+                    if future is not isolated:
+                        suspects.append(path)
+                        continue
+                    record = _new_record(path)
+                    record["errors"].append("BrokenProcessPool: a worker process terminated abruptly.")
+                except (Exception, ScanTimeout) as e:
+                    record = _new_record(path)
+                    record["errors"].append("{}: {}".format(type(e).__name__, e))
+                yield record
+    finally:
+        for future in pending:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown()
+
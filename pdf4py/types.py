@@ -4,19 +4,35 @@ Defines custom Python classes used transversely within the library.
 Amongst these definition are found Python representations for PDF Objects
 (section 7.3 of the Standard), Lexer's output tokens, and XRefTable entry types. 
 """
+import io
 from collections import namedtuple
 
 
 
-PDFHexString = namedtuple("PDFHexString", ["value"])
-"""
-Represents the PDF Object 'Hexadecimal string'.
+class PDFHexString(namedtuple("PDFHexString", ["value"])):
+    """
+    Represents the PDF Object 'Hexadecimal string'.
 
-An hexadecimal string is used mainly to encode a small quantity of binary data.
-The sequence of hexadecimal digits are not decoded from ascii but stored directly
-as bytes in `value` attribute. This is so because you tipically want to pass that
-value to the `binascii.unhexlify` function.
-"""
+    An hexadecimal string is used mainly to encode a small quantity of binary data.
+    The sequence of hexadecimal digits are not decoded from ascii but stored directly
+    as bytes in `value` attribute. The decoded bytes are available through the
+    `decoded` attribute, which is computed the first time it is accessed.
+    """
+
+    @property
+    def decoded(self):
+        """
+        The bytes encoded by the hexadecimal digits in `value`. As stated in the
+        Standard, a final zero digit is assumed if the number of digits is odd.
+        """
+        try:
+            return self.__dict__["decoded"]
+        except KeyError:
+            digits = bytes(self.value).decode("ascii")
+            if len(digits) % 2 == 1:
+                digits += "0"
+            decoded = self.__dict__["decoded"] = bytes.fromhex(digits)
+            return decoded
 
 
 PDFLiteralString = namedtuple("PDFLiteralString", ["value"])
@@ -36,15 +52,72 @@ Represents an operator appearing in a ContentStream.
 """
 
 
-PDFStream = namedtuple("PDFStream", ["dictionary", "stream"])
-"""
-Represents a PDF stream.
+class PDFStream(namedtuple("PDFStream", ["dictionary", "stream"])):
+    """
+    Represents a PDF stream.
 
-The attribute `dictionary` points to the stream dictionary. The attribute `stream`
-is a callable object requiring no arguments that when called returns the stream 
-content bytes. The content is read from the source only when `stream` is called,
-following the lazy loading philosophy around which pdf4py is built around.
-"""
+    The attribute `dictionary` points to the stream dictionary. The attribute `stream`
+    is a callable object requiring no arguments that when called returns the stream 
+    content bytes. The content is read from the source only when `stream` is called,
+    following the lazy loading philosophy around which pdf4py is built around.
+
+    Large streams can be read a piece at a time with `PDFStream.iter_chunks` or
+    `PDFStream.open`, so that the whole content is never held in memory. The streams
+    returned by `Parser` also accept a `max_bytes` argument, ``stream(max_bytes = n)``,
+    to get only the first `n` bytes of the content: decoding stops as soon as they are
+    available (except for filters that can only decode their whole input at once).
+    """
+    __slots__ = ()
+
+
+    def iter_chunks(self, size = 64 * 1024):
+        """
+        Returns an iterator over the decoded content of the stream, in pieces of at most
+        `size` bytes. The content is read, decrypted and decoded as the iteration proceeds
+        (filters that cannot decode their input a piece at a time decode it all at once).
+        """
+        iter_chunks = getattr(self.stream, "iter_chunks", None)
+        if iter_chunks is not None:
+            return iter_chunks(size)
+        data = self.stream()
+        return (data[i : i + size] for i in range(0, len(data), size))
+
+
+    def open(self, size = 64 * 1024):
+        """
+        Returns a binary file-like object, open for reading, over the decoded content of the
+        stream. Content is decoded as it is read, in pieces of `size` bytes.
+        """
+        return io.BufferedReader(_ChunksReader(self.iter_chunks(size)), size)
+
+
+
+class _ChunksReader(io.RawIOBase):
+    """
+    A raw binary stream reading the bytes sequences produced by an iterator.
+    """
+
+    def __init__(self, chunks):
+        self.__chunks = chunks
+        self.__chunk = b""
+        self.__pos = 0
+
+
+    def readable(self):
+        return True
+
+
+    def readinto(self, b):
+        while self.__pos >= len(self.__chunk):
+            try:
+                self.__chunk = next(self.__chunks)
+            except StopIteration:
+                return 0
+            self.__pos = 0
+        n = min(len(b), len(self.__chunk) - self.__pos)
+        b[:n] = self.__chunk[self.__pos : self.__pos + n]
+        self.__pos += n
+        return n
 
 
 PDFReference = namedtuple("PDFReference", ["object_number", "generation_number"])
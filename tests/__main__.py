@@ -1,9 +1,16 @@
+import sys
 import unittest
 from .functional_tests import *
 from .unit_tests import *
 from .aes_unit_tests import *
 from .decrypt_unit_tests import *
 from .decoders_unit_tests import *
+from .cache_unit_tests import *
+from .parallel_unit_tests import *
+from .scan_unit_tests import *
+if sys.version_info >= (3, 6):
+    # asynchronous generators are needed by pdf4py.aio
+    from .aio_unit_tests import *
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
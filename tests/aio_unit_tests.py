@@ -0,0 +1,66 @@
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from .context import *
+
+
+
+def without_readers(obj):
+    return obj.dictionary if isinstance(obj, parpkg.PDFStream) else obj
+
+
+
+def run_until_complete(coroutine):
+    # asyncio.run is not available before Python 3.7
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+
+class AsyncParserTestCase(unittest.TestCase):
+
+
+    def test_async_parser(self):
+        path = os.path.join(PDFS_FOLDER, "0003.pdf")
+        with parpkg.Parser(path) as parser:
+            entries = list(parser.xreftable)
+            expected = [parser.parse_reference(x) for x in entries]
+            contents = [x.stream() for x in expected if isinstance(x, parpkg.PDFStream)]
+
+        async def run(executor):
+            async with await aiopkg.AsyncParser.open(path, executor = executor) as parser:
+                self.assertEqual(parser.version, "PDF-1.7")
+                objects = []
+                streams = []
+                async for entry, obj in parser.objects(concurrency = 3):
+                    objects.append((entry, without_readers(obj)))
+                    if isinstance(obj, parpkg.PDFStream):
+                        streams.append(await parser.stream(obj))
+                self.assertEqual(objects, [(x, without_readers(y)) for x, y in zip(entries, expected)])
+                self.assertEqual(streams, contents)
+                stream = next(x for x in expected if isinstance(x, parpkg.PDFStream))
+                stream = await parser.parse_reference(entries[expected.index(stream)])
+                self.assertEqual(b"".join([x async for x in parser.iter_chunks(stream, 100)]), contents[0])
+                self.assertEqual(await parser.stream(stream, 10), contents[0][:10])
+                self.assertEqual(await parser.stream(parpkg.PDFStream({}, lambda: b"content")), b"content")
+                with self.assertRaises(ValueError):
+                    async for _ in parser.objects(concurrency = 0):
+                        pass
+
+        run_until_complete(run(None))
+        with ThreadPoolExecutor(max_workers = 2) as executor:
+            run_until_complete(run(executor))
+
+
+    def test_async_document(self):
+        async def run():
+            async with await aiopkg.AsyncDocument.open(os.path.join(PDFS_FOLDER, "0000.pdf")) as document:
+                self.assertEqual(len(document.pages), 10)
+                self.assertEqual(await document.parser.parse_reference(document.catalog["Pages"]),
+                    document.document._parser.parse_reference(document.catalog["Pages"]))
+
+        run_until_complete(run())
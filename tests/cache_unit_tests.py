@@ -0,0 +1,145 @@
+import gc
+import pickle
+import os
+import shutil
+import tempfile
+import unittest
+import weakref
+from .context import *
+
+
+class CacheTestCase(unittest.TestCase):
+
+
+    def test_lru_policy(self):
+        cache = cachepkg.Cache(max_entries = 2)
+        cache.put((1, 0), "a")
+        cache.put((2, 0), "b")
+        self.assertEqual(cache.get((1, 0)), "a")
+        cache.put((3, 0), "c")
+        self.assertNotIn((2, 0), cache)
+        self.assertIsNone(cache.get((2, 0)))
+        self.assertEqual(cache.get((2, 0), "missing"), "missing")
+        self.assertEqual(cache.stats, cachepkg.CacheStats(hits = 1, misses = 2, evictions = 1, entries = 2, size = 2))
+
+
+    def test_fifo_policy(self):
+        cache = cachepkg.Cache(max_entries = 2, policy = "fifo")
+        cache.put((1, 0), "a")
+        cache.put((2, 0), "b")
+        self.assertEqual(cache.get((1, 0)), "a")
+        cache.put((3, 0), "c")
+        self.assertNotIn((1, 0), cache)
+        self.assertIn((2, 0), cache)
+        with self.assertRaises(ValueError):
+            cachepkg.Cache(policy = "random")
+
+
+    def test_byte_budget(self):
+        cache = cachepkg.Cache(max_bytes = 10, sizeof = len)
+        cache.put(1, b"12345")
+        cache.put(2, b"1234")
+        self.assertEqual(cache.stats.size, 9)
+        cache.put(3, b"12")
+        self.assertEqual((1 in cache, 2 in cache, 3 in cache), (False, True, True))
+        # values larger than the whole budget are not stored
+        cache.put(4, b"12345678901")
+        self.assertNotIn(4, cache)
+        cache.put(2, b"123")
+        self.assertEqual(cache.stats.size, 5)
+        cache.clear()
+        self.assertEqual((len(cache), cache.stats.size, cache.stats.evictions), (0, 0, 1))
+        # by default the size of parsed objects is estimated
+        cache = cachepkg.Cache(max_bytes = 10**6)
+        cache.put(1, {"Kids" : [parpkg.PDFReference(x, 0) for x in range(10)]})
+        self.assertGreater(cache.stats.size, cachepkg.estimate_size([]))
+
+
+    def test_parser_object_cache(self):
+        path = os.path.join(PDFS_FOLDER, "0000.pdf")
+        parser = parpkg.Parser(path)
+        root_ref = parser.trailer["Root"]
+        root = parser.parse_reference(root_ref)
+        # references and entries of the same object share the same cache entry
+        self.assertIs(parser.parse_reference(parser.xreftable[root_ref]), root)
+        self.assertEqual(parser.object_cache.stats.hits, 1)
+        parser.object_cache.clear()
+        self.assertIsNot(parser.parse_reference(root_ref), root)
+        # each parser has its own cache
+        other = parpkg.Parser(path, object_cache = cachepkg.Cache(max_entries = 0))
+        self.assertEqual(other.parse_reference(root_ref), root)
+        self.assertEqual(len(other.object_cache), 0)
+        self.assertIsNot(other.object_cache, parser.object_cache)
+        # parsers are not kept alive by the cache
+        parser.close()
+        parser = weakref.ref(parser)
+        gc.collect()
+        self.assertIsNone(parser())
+
+
+    def test_parser_stream_cache(self):
+        path = os.path.join(PDFS_FOLDER, "0000.pdf")
+        stream_cache = cachepkg.Cache(max_bytes = 2**20, sizeof = len)
+        parser = parpkg.Parser(path, stream_cache = stream_cache)
+        reference = next(x for x in parser.xreftable if isinstance(parser.parse_reference(x), parpkg.PDFStream))
+        stream = parser.parse_reference(reference)
+        content = stream.stream()
+        self.assertIs(stream.stream(), content)
+        # the content is found again even if the object is parsed again
+        parser.object_cache.clear()
+        self.assertIs(parser.parse_reference(reference).stream(), content)
+        self.assertEqual(stream_cache.stats.hits, 2)
+        self.assertEqual(stream_cache.stats.size, len(content))
+        self.assertEqual(parpkg.Parser(path).parse_reference(reference).stream(), content)
+        self.assertEqual(stream.stream(max_bytes = 10), content[:10])
+
+
+    def test_index_cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            index_cache = cachepkg.IndexCache(os.path.join(folder, "index"))
+            signature = index_cache.signature(10, 1, b"tail")
+            self.assertIsNone(index_cache.get("a.pdf", signature))
+            index_cache.put("a.pdf", signature, b"content")
+            self.assertEqual(index_cache.get("a.pdf", signature), b"content")
+            self.assertEqual(os.listdir(index_cache.folder), [os.path.basename(index_cache.entry_path("a.pdf"))])
+            # entries built from another version of the file are discarded
+            self.assertIsNone(index_cache.get("a.pdf", index_cache.signature(10, 2, b"tail")))
+            self.assertFalse(os.path.exists(index_cache.entry_path("a.pdf")))
+            self.assertEqual((index_cache.hits, index_cache.misses), (1, 2))
+
+
+    def test_parser_index_cache(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "0009.pdf")
+            shutil.copy(os.path.join(PDFS_FOLDER, "0009.pdf"), path)
+            expected = parpkg.Parser(path)
+            entries = sorted(expected.xreftable, key = lambda x : x.object_number)
+            compressed = next(x for x in entries if isinstance(x, parpkg.XrefCompressedEntry))
+            for compact in (False, True):
+                index_folder = os.path.join(folder, "index" + str(compact))
+                index_cache = cachepkg.IndexCache(index_folder)
+                with parpkg.Parser(path, compact_xref = compact, index_cache = index_cache) as parser:
+                    parser.parse_reference(compressed)
+                # the offsets of the object stream have been added when the parser has been closed
+                for _ in range(2):
+                    with parpkg.Parser(path, compact_xref = compact, index_cache = index_cache) as parser:
+                        self.assertEqual(sorted(parser.xreftable, key = lambda x : x.object_number), entries)
+                        self.assertEqual((parser.trailer, parser.xref_kind), (expected.trailer, expected.xref_kind))
+                        self.assertEqual(parser.parse_reference(compressed), expected.parse_reference(compressed))
+                self.assertEqual((index_cache.hits, index_cache.misses), (2, 1))
+                self.assertEqual(parpkg.Parser(path, compact_xref = compact, index_cache = index_folder).xref_kind,
+                    expected.xref_kind)
+            # the entry is built again when the file changes
+            with open(path, "ab") as fp:
+                fp.write(b"\n")
+            parpkg.Parser(path, compact_xref = True, index_cache = index_cache)
+            self.assertEqual(index_cache.misses, 2)
+            # damaged entries are ignored, and entries cannot load arbitrary globals
+            for content in (b"garbage", pickle.dumps((os.system, {}, "table", {}))):
+                with open(path, "rb") as fp:
+                    tail = fp.read()[-index_cache.TAIL_SIZE:]
+                stat = os.stat(path)
+                index_cache.put(path, index_cache.signature(stat.st_size, stat.st_mtime_ns, tail), content)
+                parser = parpkg.Parser(path, compact_xref = True, index_cache = index_cache)
+                self.assertEqual(sorted(parser.xreftable, key = lambda x : x.object_number), entries)
+
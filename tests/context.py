@@ -10,10 +10,32 @@ logging.basicConfig(level=logging.INFO)
 
 import pdf4py._lexer as lexpkg
 import pdf4py.parser as parpkg
+import pdf4py.cache as cachepkg
+import pdf4py.parallel as parallelpkg
+import pdf4py.scan as scanpkg
+import pdf4py.__main__ as mainpkg
+import pdf4py.aio as aiopkg
 import pdf4py._document as docpkg
 import pdf4py._security.rc4 as rc4pkg
 from pdf4py._security.aes import *
 from pdf4py._decoders import tiff_predictor
 from pdf4py.exceptions import *
 
-RUN_ALL_TESTS = True if os.environ.get("RUN_ALL_TESTS", "True") == "True" else False
\ No newline at end of file
+RUN_ALL_TESTS = True if os.environ.get("RUN_ALL_TESTS", "True") == "True" else False
+
+def make_pdf(objects, trailer = b""):
+    """
+    Returns a PDF file made of `objects`, a list of bytes sequences holding the bodies of
+    objects 1, 2, ..., with a classic cross-reference table. The entries in `trailer` are
+    added to the trailer dictionary.
+    """
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % (i + 1) + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % x for x in offsets)
+    out += b"trailer\n<< /Size %d " % (len(objects) + 1) + trailer + b" >>\nstartxref\n%d\n%%%%EOF\n" % xref
+    return bytes(out)
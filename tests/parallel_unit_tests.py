@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+from .context import *
+
+
+
+def object_type(parser, obj):
+    return type(obj).__name__
+
+
+
+class WalkTestCase(unittest.TestCase):
+
+
+    def test_walk(self):
+        path = os.path.join(PDFS_FOLDER, "0003.pdf")
+        with parpkg.Parser(path) as parser:
+            expected = {(x.object_number, getattr(x, "generation_number", 0)) :
+                type(parser.parse_reference(x)).__name__ for x in parser.xreftable}
+        result = parallelpkg.walk(path, object_type, workers = 2)
+        self.assertEqual(result.results, expected)
+        self.assertEqual(result.errors, dict())
+        result = parallelpkg.walk(path, workers = 2)
+        self.assertEqual(set(result.results), set(expected))
+        self.assertEqual(set(result.results.values()), {None})
+
+
+    def test_walk_errors(self):
+        objects = [b"<< /Type /Catalog >>", b"<< /Length 4 /Filter /FlateDecode >>\nstream\nabcd\nendstream",
+            b"[1 2 3]"]
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "errors.pdf")
+            with open(path, "wb") as fp:
+                fp.write(make_pdf(objects, b"/Root 1 0 R"))
+            result = parallelpkg.walk(path, workers = 2, tasks_per_worker = 2)
+        self.assertEqual(result.results, {(1, 0) : None, (3, 0) : None})
+        self.assertEqual(list(result.errors), [(2, 0)])
+        self.assertIn("Error while decoding data", result.errors[(2, 0)])
+        with self.assertRaises(ValueError):
+            parallelpkg.walk(b"%PDF-1.4")
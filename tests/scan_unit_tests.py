@@ -0,0 +1,77 @@
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import unittest
+import unittest.mock
+from .context import *
+
+
+
+class ScanTestCase(unittest.TestCase):
+
+
+    def test_scan_file(self):
+        record = scanpkg.scan_file(os.path.join(PDFS_FOLDER, "0003.pdf"), parse_objects = True)
+        self.assertEqual((record["version"], record["xref"], record["encrypted"], record["errors"]),
+            ("PDF-1.7", "hybrid", False, []))
+        # objects updated by incremental updates are counted once
+        self.assertEqual(record["objects"], 246)
+        self.assertIsInstance(record["pages"], int)
+        self.assertEqual(set(record["timings"]), {"open", "objects", "pages"})
+        record = scanpkg.scan_file(os.path.join(ENCRYPTED_PDFS_FOLDER, "0016.pdf"))
+        self.assertTrue(record["encrypted"])
+        self.assertIn("PDFWrongPasswordError", record["errors"][0])
+        record = scanpkg.scan_file(os.path.join(PDFS_FOLDER, "missing.pdf"))
+        self.assertIn("FileNotFoundError", record["errors"][0])
+
+
+    def test_scan(self):
+        paths = list(scanpkg.find_documents([PDFS_FOLDER]))
+        self.assertEqual(paths, list(scanpkg.find_documents([os.path.join(PDFS_FOLDER, "*.pdf")])))
+        records = list(scanpkg.scan(paths, workers = 2, timeout = 60))
+        self.assertEqual(sorted(x["path"] for x in records), paths)
+        self.assertEqual([x["errors"] for x in records], [[]] * len(paths))
+        # documents taking longer than the timeout are abandoned
+        record, = scanpkg.scan([os.path.join(PDFS_FOLDER, "0014.pdf")], workers = 1, timeout = 0.001,
+            parse_objects = True)
+        self.assertEqual(record["errors"], ["ScanTimeout: Scanning took longer than the timeout."])
+
+
+    def test_scan_timeout_outside_scan_file(self):
+        # an alarm going off after the errors of scan_file are handled is reported too
+        def late_timeout(path, parse_objects, password):
+            raise scanpkg.ScanTimeout("Scanning took longer than the timeout.")
+
+        with unittest.mock.patch.object(scanpkg, "scan_file", late_timeout):
+            record = scanpkg._scan_with_timeout("0000.pdf", False, None, 60)
+        self.assertEqual(record["errors"], ["ScanTimeout: Scanning took longer than the timeout."])
+
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == "fork", "workers must inherit the patch")
+    def test_scan_broken_pool(self):
+        # only the document that terminates a worker is reported, the others are scanned again
+        scan_file = scanpkg.scan_file
+        def crashing_scan_file(path, parse_objects, password):
+            if path.endswith("crash.pdf"):
+                os._exit(1)
+            return scan_file(path, parse_objects, password)
+
+        paths = sorted(scanpkg.find_documents([os.path.join(PDFS_FOLDER, "000[0-5].pdf")]))
+        crash = os.path.join(PDFS_FOLDER, "crash.pdf")
+        with unittest.mock.patch.object(scanpkg, "scan_file", crashing_scan_file):
+            records = list(scanpkg.scan(paths[:3] + [crash] + paths[3:], workers = 2))
+        errors = {x["path"] : x["errors"] for x in records}
+        self.assertEqual(len(records), len(paths) + 1)
+        self.assertEqual(errors.pop(crash), ["BrokenProcessPool: a worker process terminated abruptly."])
+        self.assertEqual(errors, {x : [] for x in paths})
+
+
+    def test_command_line(self):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            mainpkg.main(["scan", os.path.join(PDFS_FOLDER, "000[0-2].pdf"), "--workers", "1"])
+        records = sorted((json.loads(x) for x in out.getvalue().splitlines()), key = lambda x: x["path"])
+        self.assertEqual([x["version"] for x in records], ["PDF-1.4", "PDF-1.5", "PDF-1.4"])
+        self.assertIn("files: 3, with errors: 0", err.getvalue())
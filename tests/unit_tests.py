@@ -1,4 +1,10 @@
+import io
+import mmap
+import tempfile
 import unittest
+import unittest.mock
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from .context import *
 from binascii import unhexlify
 
@@ -132,6 +138,10 @@ class LexerUnitTest(unittest.TestCase):
         item = next(lex)
         self.assertIsInstance(item, lexpkg.PDFHexString)
         self.assertEqual(unhexlify(b"4E6F762073686D6F7A206B6120706F702E"), unhexlify(item.value))
+        self.assertEqual(unhexlify(b"4E6F762073686D6F7A206B6120706F702E"), item.decoded)
+        self.assertIs(item.decoded, item.decoded)
+        lex = lexpkg.Lexer(b"<4E 6f\r\n7 > <901FA> <>")
+        self.assertEqual([(x.value, x.decoded) for x in lex], [(b"4E6f7", b"No\x70"), (b"901FA", b"\x90\x1f\xa0"), (b"", b"")])
  
 
 
@@ -150,11 +160,51 @@ class LexerUnitTest(unittest.TestCase):
             b"endobj", b"obj", b">>", b"trailer", b"xref", b"startxref",
             lexpkg.OPEN_SQUARE_BRACKET, lexpkg.CLOSE_SQUARE_BRACKET]
         
-        lex = lexpkg.Lexer(istream)     
+        lex = lexpkg.Lexer(istream)
         ll = list(lex)
         self.assertEqual([x if (isinstance(x, bool) or x is None) else x.value for x in ll], checkVals)
 
 
+    def test_interned_names_and_operators(self):
+        a, b, c, d, e = list(lexpkg.Lexer(b"/Type#20A BT /Type#20A ET BT"))
+        self.assertEqual((a, b, c), ("Type A", lexpkg.PDFOperator("BT"), "Type A"))
+        self.assertIs(a, c)
+        self.assertIs(b, e)
+        # each Lexer has its own tables, shared with its cursors
+        lex = lexpkg.Lexer(bytearray(b"BT"))
+        operator = next(lex)
+        self.assertEqual(operator, b)
+        self.assertIsNot(operator, b)
+        self.assertIs(next(lex.cursor()), operator)
+        with self.assertRaises(parpkg.PDFLexicalError):
+            next(lexpkg.Lexer(b"/Type#2"))
+
+
+    def test_operators_sharing_first_byte_with_keywords(self):
+        istream = b"s sc scn SCN f* fx ET EMC o x n T* true false"
+        checkVals = ["s", "sc", "scn", "SCN", "f*", "fx", "ET", "EMC", "o", "x", "n", "T*", True, False]
+        lex = lexpkg.Lexer(istream)
+        ll = list(lex)
+        self.assertEqual([x if isinstance(x, bool) else x.value for x in ll], checkVals)
+        self.assertTrue(all(isinstance(x, lexpkg.PDFOperator) for x in ll[:-2]))
+        with self.assertRaises(parpkg.PDFLexicalError):
+            list(lexpkg.Lexer(b"1 > 2"))
+
+
+
+    def test_move_at_position_and_back(self):
+        lex = lexpkg.Lexer(b"1 2 3 % comment\r(four) /Five")
+        self.assertEqual(next(lex), 1)
+        self.assertEqual(next(lex), 2)
+        lex.undo_next(1)
+        # lexemes put back with undo_next must not leak into the new position
+        self.assertEqual(lex.move_at_position(16), parpkg.PDFLiteralString(b"four"))
+        self.assertEqual(next(lex), "Five")
+        lex.move_back()
+        self.assertEqual(lex.current_lexeme, 1)
+        self.assertEqual(list(lex), [2, 3, parpkg.PDFLiteralString(b"four"), "Five"])
+
+
 
 class SeekableTestCase(unittest.TestCase):
 
@@ -284,6 +334,23 @@ endobj
             712, parpkg.PDFOperator("Td"), parpkg.PDFLiteralString(b"A stream with an indirect length"), parpkg.PDFOperator("Tj"), parpkg.PDFOperator("ET")]
         self.assertEqual(parsed, expected)
 
+
+    def test_parse_deeply_nested_objects(self):
+        depth = 100000
+        source = b"[" * depth + b"1 0 R" + b"]" * depth + b" << /A " * depth + b"null" + b" >>" * depth
+        par = parpkg.SequentialParser(source)
+        obj = next(par)
+        for _ in range(depth):
+            self.assertEqual(len(obj), 1)
+            obj = obj[0]
+        self.assertEqual(obj, parpkg.PDFReference(1, 0))
+        obj = next(par)
+        for _ in range(depth):
+            obj = obj["A"]
+        self.assertIsNone(obj)
+        with self.assertRaises(StopIteration):
+            next(par)
+
 class ParserTestCase(unittest.TestCase):
 
 
@@ -312,6 +379,366 @@ startxref
 
 
 
+    def test_parser_sources(self):
+        path = os.path.join(PDFS_FOLDER, "0000.pdf")
+        with parpkg.Parser(path) as parser:
+            info = parser.parse_reference(parser.trailer["Info"])
+            contents = parser.parse_reference(parpkg.PDFReference(24, 0)).stream()
+            self.assertIsInstance(contents, bytes)
+        with open(path, "rb") as fp, mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            parser = parpkg.Parser(mm)
+            self.assertEqual(parser.parse_reference(parser.trailer["Info"]), info)
+            parser.close()
+            # the mapping belongs to the caller, it is still usable
+            self.assertEqual(mm[:4], b"%PDF")
+        with open(path, "rb") as fp:
+            data = fp.read()
+        with tempfile.SpooledTemporaryFile(max_size=len(data) + 1) as fp:
+            fp.write(data)
+            parser = parpkg.Parser(fp)
+            self.assertEqual(parser.parse_reference(parser.trailer["Info"]), info)
+            self.assertEqual(parser.parse_reference(parpkg.PDFReference(24, 0)).stream(), contents)
+        # files that cannot be mapped are read until the parser is closed
+        class UnmappableFile(mmap.mmap):
+            def __new__(cls, *args, **kwargs):
+                raise OSError("mapping not supported")
+
+        with unittest.mock.patch.object(lexpkg.mmap, "mmap", UnmappableFile):
+            parser = parpkg.Parser(path)
+            self.assertEqual(parser.parse_reference(parpkg.PDFReference(24, 0)).stream(), contents)
+            fp = parser._basic_parser._lexer.source
+            parser.close()
+            self.assertTrue(fp.closed)
+        with tempfile.TemporaryDirectory() as folder:
+            empty_path = os.path.join(folder, "empty.pdf")
+            open(empty_path, "wb").close()
+            with self.assertRaises(parpkg.PDFSyntaxError):
+                parpkg.Parser(empty_path)
+
+
+
+    def test_decode_stream_views(self):
+        # streams of mapped sources reach the decoders as views over the source
+        data = make_pdf([b"<< /Type /Catalog >>", b"<< /Length 7 /Filter /RunLengthDecode >>\nstream\n"
+            b"\x02abc\xffz\x80\nendstream"], b"/Root 1 0 R")
+        with tempfile.NamedTemporaryFile(suffix = ".pdf", delete = False) as fp:
+            fp.write(data)
+        try:
+            for source in (data, fp.name):
+                with parpkg.Parser(source) as parser:
+                    self.assertEqual(parser.parse_reference(parpkg.PDFReference(2, 0)).stream(), b"abczz")
+        finally:
+            os.remove(fp.name)
+
+
+    def test_corrupt_stream_of_mapped_file(self):
+        # the view over the mapping given to the decoders must not keep it from being closed
+        data = make_pdf([b"<< /Type /Catalog >>", b"<< /Length 7 /Filter /FlateDecode >>\nstream\n"
+            b"corrupt\nendstream"], b"/Root 1 0 R")
+        with tempfile.NamedTemporaryFile(suffix = ".pdf", delete = False) as fp:
+            fp.write(data)
+        try:
+            with self.assertRaises(parpkg.PDFSyntaxError):
+                with parpkg.Parser(fp.name) as parser:
+                    parser.parse_reference(parpkg.PDFReference(2, 0)).stream()
+            parser = parpkg.Parser(fp.name)
+            stream = parser.parse_reference(parpkg.PDFReference(2, 0))
+            for read in (stream.stream, lambda: list(stream.iter_chunks(4))):
+                try:
+                    read()
+                except parpkg.PDFSyntaxError as e:
+                    error = e
+            parser.close()
+            self.assertIsInstance(error, parpkg.PDFSyntaxError)
+        finally:
+            os.remove(fp.name)
+
+
+    def test_stream_chunks(self):
+        content = b"".join(b"%d 0 0 1 0 0 cm\n" % i for i in range(100000))
+        compressed = zlib.compress(content)
+        # rows of 7 bytes, each one filtered with the 'Up' PNG predictor
+        rows = [bytes((i + j) % 256 for j in range(7)) for i in range(1000)]
+        filtered = b"".join(b"\x02" + bytes((x - y) % 256 for x, y in zip(row, previous))
+            for row, previous in zip(rows, [bytes(7)] + rows))
+        data = make_pdf([
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(compressed) + compressed + b"\nendstream",
+            b"<< /Length 11 >>\nstream\nhello world\nendstream",
+            b"<< /Length %d /Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 7 >> >>\nstream\n" %
+                len(zlib.compress(filtered)) + zlib.compress(filtered) + b"\nendstream",
+            b"<< /Length 7 /Filter /ASCIIHexDecode >>\nstream\n414243>\nendstream"])
+        for source in (data, io.BytesIO(data)):
+            parser = parpkg.Parser(source)
+            stream = parser.parse_reference(parpkg.PDFReference(1, 0))
+            chunks = list(stream.iter_chunks(1000))
+            self.assertTrue(all(0 < len(x) <= 1000 for x in chunks))
+            self.assertEqual(b"".join(chunks), content)
+            with stream.open(100) as fp:
+                self.assertEqual(fp.read(5), content[:5])
+                self.assertEqual(fp.readline(), content[5:content.index(b"\n") + 1])
+                self.assertEqual(fp.read(), content[content.index(b"\n") + 1:])
+            self.assertEqual(stream.stream(max_bytes = 10), content[:10])
+            self.assertEqual(stream.stream(max_bytes = 100000), content[:100000])
+            self.assertEqual(stream.stream(max_bytes = 0), b"")
+            stream = parser.parse_reference(parpkg.PDFReference(2, 0))
+            self.assertEqual(list(stream.iter_chunks(4)), [b"hell", b"o wo", b"rld"])
+            self.assertEqual(stream.stream(max_bytes = 100), b"hello world")
+            stream = parser.parse_reference(parpkg.PDFReference(3, 0))
+            self.assertEqual(b"".join(stream.iter_chunks(10)), b"".join(rows))
+            stream = parser.parse_reference(parpkg.PDFReference(4, 0))
+            self.assertEqual(list(stream.iter_chunks(2)), [b"AB", b"C"])
+            self.assertEqual(stream.stream(max_bytes = 1), b"A")
+        # streams built by hand are split after being read
+        stream = parpkg.PDFStream({}, lambda : b"abcde")
+        self.assertEqual(list(stream.iter_chunks(2)), [b"ab", b"cd", b"e"])
+
+
+    def test_lexemes_across_window_boundaries(self):
+        data = b"%" + b"x" * 100 + b"\n42 (" + b"a\\053" * 20 + b") <" + b"41 " * 40 + \
+            b"> /N#41me" + b" " * 100 + b"true null stream\r\nabc"
+        read_streams = lambda lex : [bytes(x.value(3)) if isinstance(x, parpkg.PDFStreamReader) else x for x in lex]
+        expected = read_streams(lexpkg.Lexer(data))
+        blockSize = lexpkg._BLOCK_SIZE
+        try:
+            for lexpkg._BLOCK_SIZE in (8, 16, 100):
+                self.assertEqual(read_streams(lexpkg.Lexer(io.BytesIO(data))), expected)
+        finally:
+            lexpkg._BLOCK_SIZE = blockSize
+
+
+
+    def test_startxref_search(self):
+        with open(os.path.join(PDFS_FOLDER, "0000.pdf"), "rb") as fp:
+            data = fp.read() + b"\x00" * 100000
+        for source in (data, io.BytesIO(data)):
+            parser = parpkg.Parser(source)
+            self.assertIn("Root", parser.trailer)
+            with self.assertRaises(parpkg.PDFSyntaxError):
+                parpkg.Parser(source, startxref_search_limit = 0)
+
+
+    def test_compressed_objects(self):
+        with parpkg.Parser(os.path.join(PDFS_FOLDER, "0009.pdf")) as parser:
+            entries = [x for x in parser.xreftable if isinstance(x, parpkg.XrefCompressedEntry)]
+            objects = [parser.parse_reference(x) for x in entries]
+            self.assertTrue(all(x is not None for x in objects))
+            # entries with a wrong index are found by searching the object stream
+            shuffled = [x._replace(index = (x.index + 1) % len(entries)) for x in entries]
+            self.assertEqual([parser.parse_reference(x) for x in shuffled], objects)
+            with self.assertRaises(parpkg.PDFSyntaxError):
+                parser.parse_reference(entries[0]._replace(object_number = 10**6))
+
+
+    def test_thread_safe_parser(self):
+        def resolve(parser, entries):
+            objects = []
+            for x in entries:
+                obj = parser.parse_reference(x)
+                objects.append(obj.stream() if isinstance(obj, parpkg.PDFStream) else obj)
+            return objects
+
+        # the cursors of a file-like source start from its beginning, wherever the reads of the
+        # other cursors have left the file, which is inside stream data for larger files
+        for name in ("0003.pdf", "0007.pdf"):
+            path = os.path.join(PDFS_FOLDER, name)
+            with parpkg.Parser(path) as parser:
+                entries = list(parser.xreftable)
+                expected = resolve(parser, entries)
+            with open(path, "rb") as fp:
+                sources = [path, io.BytesIO(fp.read())]
+            for source in sources:
+                parser = parpkg.Parser(source, thread_safe = True, object_cache = cachepkg.Cache(max_entries = 8))
+                self.assertEqual(resolve(parser, entries), expected)
+                self.assertEqual(parser._basic_parser._lexer.cursor().tell(), 0)
+                with ThreadPoolExecutor(max_workers = 4) as executor:
+                    futures = [executor.submit(resolve, parser, entries[i::3] + entries) for i in range(8)]
+                    for i, future in enumerate(futures):
+                        self.assertEqual(future.result(), expected[i::3] + expected)
+                parser.close()
+
+
+    def test_compact_xref_table(self):
+        for name in sorted(os.listdir(PDFS_FOLDER)):
+            with parpkg.Parser(os.path.join(PDFS_FOLDER, name)) as parser:
+                entries = list(parser.xreftable)
+                keys = [(x.object_number, getattr(x, "generation_number", 0)) for x in entries]
+                expected = [parser.xreftable[x] for x in keys]
+            with parpkg.Parser(os.path.join(PDFS_FOLDER, name), compact_xref = True) as parser:
+                self.assertIsInstance(parser.xreftable, parpkg.CompactXRefTable)
+                self.assertEqual(sorted(parser.xreftable), sorted(entries))
+                self.assertEqual([parser.xreftable[x] for x in keys], expected)
+
+
+    def test_xref_table_records(self):
+        records = [b"0000000000 65535 f", b"0000000009 00000 n", b"0000000074 00002 n", b"0000000001 00003 f"]
+        expected = [parpkg.XrefInUseEntry(9, 1, 0), parpkg.XrefInUseEntry(74, 2, 2),
+            parpkg.XrefInUseEntry(120, 7, 0)]
+        for eol in (b" \n", b" \r", b"\r\n", b"\n", b" \r\n"):
+            sample = b"xref\n0 4 \r\n" + b"".join(x + eol for x in records) + \
+                b"7 1\n0000000120 00000 n" + eol + b"trailer\n<< /Size 8 >>\nstartxref\n0\n%%EOF"
+            for compact in (False, True):
+                parser = parpkg.Parser(sample, compact_xref = compact)
+                self.assertEqual(sorted(parser.xreftable), expected)
+                self.assertIsNone(parser.xreftable[3, 2])
+                self.assertEqual(parser.trailer["Size"], 8)
+        # the records of each subsection are skipped without saving the position of the lexer
+        sample = b"xref\n" + b"".join(b"%d 1\n0000000009 00000 n \n" % i for i in range(1, 1001)) + \
+            b"trailer\n<< /Size 1001 >>\nstartxref\n0\n%%EOF"
+        parser = parpkg.Parser(sample)
+        self.assertEqual(len(list(parser.xreftable)), 1000)
+        self.assertLessEqual(len(parser._basic_parser._lexer._Lexer__movesHistory), 1)
+        self.assertIsNone(parpkg._parse_xref_records(b"000000000a 00000 n \n", 1))
+        self.assertIsNone(parpkg._parse_xref_records(b"0000000009 00000 x \n", 1))
+        self.assertIsNone(parpkg._parse_xref_records(b"0000000009 00000 n  ", 1))
+        kinds, offsets, generations = parpkg._parse_xref_records(b"".join(x + b"\r\n" for x in records), 4)
+        self.assertEqual((list(kinds), list(offsets), list(generations)),
+            ([parpkg._FREE, parpkg._IN_USE, parpkg._IN_USE, parpkg._FREE], [0, 9, 74, 1], [65534, 0, 2, 2]))
+
+
+    def test_xref_stream_fields(self):
+        def build(w, index, rows):
+            data = b"".join(b"".join(x.to_bytes(n, "big") for x, n in zip(row, w) if n > 0) for row in rows)
+            return b"%%PDF-1.5\n1 0 obj\n<< /Type /XRef /Size 20 /W [%d %d %d] /Index [%s] /Length %d >>\n" \
+                b"stream\n" % (*w, b" ".join(b"%d" % x for x in index), len(data)) + data + \
+                b"\nendstream\nendobj\nstartxref\n9\n%%EOF\n"
+
+        rows = [(0, 0, 65535), (1, 300, 0), (2, 7, 3), (0, 0, 2), (1, 70000, 1), (2, 7, 0), (5, 0, 0)]
+        expected = [parpkg.XrefInUseEntry(300, 1, 0), parpkg.XrefCompressedEntry(2, 7, 3),
+            parpkg.XrefInUseEntry(70000, 9, 1), parpkg.XrefCompressedEntry(10, 7, 0),
+            parpkg.XrefCompressedEntry(11, 0, 0)]
+        for w in ([1, 3, 2], [2, 4, 3], [1, 9, 2]):
+            for compact in (False, True):
+                parser = parpkg.Parser(build(w, [0, 4, 9, 3], rows), compact_xref = compact)
+                self.assertEqual(sorted(parser.xreftable, key = lambda x : x.object_number), expected)
+                self.assertIsNone(parser.xreftable[3, 2])
+                self.assertEqual(parser.xreftable[9, 1], expected[2])
+                # contiguous subsections
+                parser = parpkg.Parser(build(w, [5, 3, 8, 4], rows), compact_xref = compact)
+                self.assertEqual(parser.xreftable[5, 65535], None)
+                self.assertEqual(parser.xreftable[6, 0], parpkg.XrefInUseEntry(300, 6, 0))
+                self.assertEqual(parser.xreftable[9, 1], parpkg.XrefInUseEntry(70000, 9, 1))
+        # a missing type means objects in use, a missing third field means generation 0
+        parser = parpkg.Parser(build([0, 2, 0], [0, 3], [(0, 0, 0), (0, 10, 0), (0, 20, 0)]))
+        self.assertEqual(list(parser.xreftable), [parpkg.XrefInUseEntry(10, 1, 0), parpkg.XrefInUseEntry(20, 2, 0)])
+        # rows missing at the end of the stream are ignored
+        parser = parpkg.Parser(build([1, 2, 2], [0, 10], rows[:3]), compact_xref = True)
+        self.assertEqual(list(parser.xreftable), expected[:2])
+
+
+    def test_incremental_updates(self):
+        data = make_pdf([b"<< /Type /Catalog >>", b"(two)", b"(three)", b"(four)"], b"/Root 1 0 R")
+        first_xref = data.rindex(b"xref\n0 5")
+        offsets = [len(data), len(data) + 27]
+        # the update frees object 2, moves object 3 and replaces object 4 with a new generation
+        data += b"3 0 obj\n(new three)\nendobj\n4 1 obj\n(new four)\nendobj\n"
+        xref = len(data)
+        data += b"xref\n2 3\n0000000000 00001 f \n%010d 00000 n \n%010d 00001 n \n" % tuple(offsets) + \
+            b"trailer\n<< /Size 5 /Prev %d >>\nstartxref\n%d\n%%%%EOF\n" % (first_xref, xref)
+        for compact in (False, True):
+            parser = parpkg.Parser(data, compact_xref = compact)
+            self.assertEqual(sorted(parser.xreftable), [parpkg.XrefInUseEntry(9, 1, 0),
+                parpkg.XrefInUseEntry(offsets[0], 3, 0), parpkg.XrefInUseEntry(offsets[1], 4, 1)])
+            self.assertIsNone(parser.xreftable[2, 0])
+            self.assertEqual(parser.parse_reference(parser.xreftable[3, 0]).value, b"new three")
+            self.assertEqual(parser.parse_reference(parser.xreftable[4, 1]).value, b"new four")
+            self.assertEqual(parser.parse_reference(parser.xreftable[4, 0]).value, b"four")
+            for key in ((5, 0), (1, 1), (2, 1)):
+                with self.assertRaises(KeyError):
+                    parser.xreftable[key]
+            # the previous revision is still available
+            previous = parser.xreftable.previous
+            self.assertEqual([x.object_number for x in sorted(previous)], [1, 2, 3, 4])
+            self.assertEqual(parser.parse_reference(previous[3, 0]).value, b"three")
+            with self.assertRaises(KeyError):
+                previous[4, 1]
+
+
+    def test_recover_damaged_xref(self):
+        data = make_pdf([b"<< /Type /Catalog /Pages 2 0 R >>", b"(two)", b"(three)"], b"/Root 1 0 R")
+        # the definitions found last win
+        damaged = data[:data.rindex(b"startxref")] + b"startxref\n12\n%%EOF\n2 0 obj\n(new two)\nendobj\n"
+        with self.assertRaises(parpkg.PDFSyntaxError):
+            parpkg.Parser(damaged)
+        for compact in (False, True):
+            parser = parpkg.Parser(damaged, compact_xref = compact, recover = True)
+            self.assertEqual(parser.xref_kind, "reconstructed")
+            self.assertEqual(parser.trailer["Root"], parpkg.PDFReference(1, 0))
+            self.assertEqual(parser.parse_reference(parpkg.PDFReference(2, 0)).value, b"new two")
+            self.assertEqual(parser.parse_reference(parpkg.PDFReference(3, 0)).value, b"three")
+        # the candidates are parsed without saving the position of the lexer
+        parser = parpkg.Parser(damaged + b"trailer\n<< /Size 4 >>\n" * 100, recover = True)
+        self.assertLessEqual(len(parser._basic_parser._lexer._Lexer__movesHistory), 1)
+        # the compressed objects are found through the cross-reference streams
+        with open(os.path.join(PDFS_FOLDER, "0009.pdf"), "rb") as fp:
+            data = fp.read()
+        def read_objects(parser):
+            objects = {x.object_number : parser.parse_reference(x) for x in parser.xreftable}
+            return {n : (x.dictionary, x.stream()) if isinstance(x, parpkg.PDFStream) else x for n, x in objects.items()}
+
+        with parpkg.Parser(data) as parser:
+            trailer = parser.trailer
+            expected = read_objects(parser)
+        damaged = data[:data.rindex(b"startxref")] + b"startxref\n12\n%%EOF\n"
+        for compact in (False, True):
+            parser = parpkg.Parser(damaged, compact_xref = compact, recover = True)
+            self.assertEqual(parser.trailer["Root"], trailer["Root"])
+            self.assertEqual(read_objects(parser), expected)
+
+
+    def test_linearized_xref_table(self):
+        class CountingBytesIO(io.BytesIO):
+            read_bytes = 0
+            def readinto(self, b):
+                n = super().readinto(b)
+                self.read_bytes += n
+                return n
+
+        with open(os.path.join(PDFS_FOLDER, "0004.pdf"), "rb") as fp:
+            data = fp.read()
+        for compact in (False, True):
+            # the linearization is ignored when the file has been updated
+            expected = parpkg.Parser(data + b"\n", compact_xref = compact)
+            self.assertIsNone(expected.linearization)
+            source = CountingBytesIO(data)
+            parser = parpkg.Parser(source, compact_xref = compact)
+            self.assertEqual(parser.linearization["L"], len(data))
+            # the objects of the first page are found reading only the head of the file
+            page = parser.parse_reference(parpkg.PDFReference(parser.linearization["O"], 0))
+            self.assertEqual(parser.parse_reference(page["Contents"]).stream(),
+                expected.parse_reference(page["Contents"]).stream())
+            self.assertLess(source.read_bytes, len(data) // 4)
+            # the other sections are loaded when they are needed
+            self.assertEqual(parser.parse_reference(parser.trailer["Root"])["Pages"],
+                expected.parse_reference(expected.trailer["Root"])["Pages"])
+            self.assertEqual(sorted(parser.xreftable), sorted(expected.xreftable))
+            self.assertEqual((parser.trailer, parser.xref_kind), (expected.trailer, expected.xref_kind))
+            self.assertIsNotNone(parser.xreftable.previous)
+            # iterating the table loads the other sections as well
+            parser = parpkg.Parser(data, compact_xref = compact)
+            self.assertEqual(len(list(parser.xreftable)), len(list(expected.xreftable)))
+
+
+    def test_load_object_stream(self):
+        path = os.path.join(PDFS_FOLDER, "0009.pdf")
+        with parpkg.Parser(path) as parser:
+            entries = [x for x in parser.xreftable if isinstance(x, parpkg.XrefCompressedEntry)]
+            expected = {(x.object_number, 0) : parser.parse_reference(x) for x in entries}
+            objstm_numbers = {x.objstm_number for x in entries}
+            objects = dict()
+            for objstm_number in objstm_numbers:
+                objects.update(parser.load_object_stream(parpkg.PDFReference(objstm_number, 0)))
+            self.assertEqual(objects, expected)
+            self.assertEqual(parser.load_object_stream(entries[0]), 
+                parser.load_object_stream(parpkg.PDFReference(entries[0].objstm_number, 0)))
+            with self.assertRaises(ValueError):
+                parser.load_object_stream(entries[0].objstm_number)
+        with parpkg.Parser(path, prefetch_object_streams = True) as parser:
+            self.assertEqual({(x.object_number, 0) : parser.parse_reference(x) for x in entries}, expected)
+            with self.assertRaises(parpkg.PDFSyntaxError):
+                parser.parse_reference(entries[0]._replace(object_number = 10**6))
+
+
+
 class DocumentTestCase(unittest.TestCase):
 
     def test_document_catalog(self):